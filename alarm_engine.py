@@ -0,0 +1,343 @@
+import operator
+import re
+import tkinter as tk
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+
+from perf import timed
+
+# İfade alarmlarında kullanılabilen adlar -> IndicatorState değer anahtarları
+EXPR_FIELDS = {
+    'CLOSE': 'Close', 'PRICE': 'Close', 'FIYAT': 'Close',
+    'VOLUME': 'Volume', 'HACIM': 'Volume', 'VOL_AVG': 'Volume_SMA_20',
+    'RSI': 'RSI', 'STOCH': 'Stoch_%K',
+    'MACD': 'MACD', 'SIGNAL': 'MACD_signal',
+    'EMA20': 'EMA_20', 'SMA50': 'SMA_50', 'EMA200': 'EMA_200',
+    'BB_UPPER': 'BB_upper', 'BB_MIDDLE': 'BB_middle', 'BB_LOWER': 'BB_lower',
+    'OBV': 'OBV',
+}
+
+_COMPARISONS = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+_TOKEN = re.compile(r'\s*(\d+(?:\.\d+)?|[A-Z_][A-Z0-9_]*|\^[<>]|<=|>=|[<>^&|*])')
+
+
+def _tokenize(expression):
+    tokens, pos = [], 0
+    expression = expression.strip().upper()
+    while pos < len(expression):
+        match = _TOKEN.match(expression, pos)
+        if not match:
+            raise ValueError(f"Anlaşılamayan ifade: {expression[pos:]!r}")
+        tokens.append(match.group(1))
+        pos = match.end()
+    return tokens
+
+
+def compile_expression(expression):
+    """Kısa alarm ifadesini ``evaluate(values, previous) -> bool`` fonksiyonuna derler.
+
+    Karşılaştırmalar ``<``, ``<=``, ``>``, ``>=``; kesişimler ``^>`` (yukarı keser,
+    ``^`` ile aynı) ve ``^<`` (aşağı keser). Terimler sayı, ``EXPR_FIELDS``
+    adları veya ``1.5*VOL_AVG`` gibi çarpımlardır; koşullar ``&`` (ve) ile,
+    gruplar ``|`` (veya) ile birleştirilir. Örnekler::
+
+        RSI<30
+        MACD^SIGNAL
+        EMA20^<SMA50
+        CLOSE>BB_UPPER & VOLUME>1.5*VOL_AVG
+    """
+    tokens = _tokenize(expression)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        if pos >= len(tokens):
+            raise ValueError(f"İfade eksik: {expression!r}")
+        pos += 1
+        return tokens[pos - 1]
+
+    def factor():
+        token = take()
+        if token[0].isdigit():
+            number = float(token)
+            return lambda values: number
+        if token not in EXPR_FIELDS:
+            raise ValueError(f"Bilinmeyen gösterge: {token} (geçerli: {', '.join(EXPR_FIELDS)})")
+        key = EXPR_FIELDS[token]
+        return lambda values: values[key]
+
+    def term():
+        left = factor()
+        if peek() == '*':
+            take()
+            right = factor()
+            return lambda values: left(values) * right(values)
+        return left
+
+    def comparison():
+        left = term()
+        op = take()
+        right = term()
+        if op in _COMPARISONS:
+            compare = _COMPARISONS[op]
+            return lambda values, previous: compare(left(values), right(values))
+        if op in ('^', '^>'):
+            return lambda values, previous: (bool(previous) and left(previous) <= right(previous)
+                                             and left(values) > right(values))
+        if op == '^<':
+            return lambda values, previous: (bool(previous) and left(previous) >= right(previous)
+                                             and left(values) < right(values))
+        raise ValueError(f"Beklenmeyen işleç: {op}")
+
+    def clause():
+        parts = [comparison()]
+        while peek() == '&':
+            take()
+            parts.append(comparison())
+        return lambda values, previous: all(part(values, previous) for part in parts)
+
+    groups = [clause()]
+    while peek() == '|':
+        take()
+        groups.append(clause())
+    if peek() is not None:
+        raise ValueError(f"Beklenmeyen ifade parçası: {peek()}")
+    return lambda values, previous: any(group(values, previous) for group in groups)
+
+
+class AlarmIndex:
+    """Aktif alarmları sembol başına sıralı eşik listelerinde tutar.
+
+    ABOVE alarmları için tetiklenenler fiyata eşit veya altındaki eşikler,
+    BELOW alarmları için eşit veya üstündekilerdir; ikisi de ``bisect`` ile
+    O(log n) sürede bulunur.
+    """
+
+    def __init__(self):
+        self.above = {}
+        self.below = {}
+        self._alarms = {}
+
+    def __len__(self):
+        return len(self._alarms)
+
+    def add(self, alarm_id, symbol, target_price, condition):
+        """Alarmı ilgili sembolün eşik listesine ekler"""
+        lists = self.above if condition == "ABOVE" else self.below
+        entry = (float(target_price), alarm_id)
+        insort(lists.setdefault(symbol, []), entry)
+        self._alarms[alarm_id] = (symbol, condition, entry)
+
+    def remove(self, alarm_id):
+        """Alarmı indeksten çıkarır"""
+        symbol, condition, entry = self._alarms.pop(alarm_id)
+        lists = self.above if condition == "ABOVE" else self.below
+        thresholds = lists[symbol]
+        del thresholds[bisect_left(thresholds, entry)]
+        if not thresholds:
+            del lists[symbol]
+
+    def symbols(self):
+        """Alarmı olan semboller"""
+        return sorted(self.above.keys() | self.below.keys())
+
+    def triggered(self, symbol, price):
+        """Fiyatın tetiklediği alarmları (alarm_id, target_price, condition) olarak döndürür"""
+        hits = []
+        above = self.above.get(symbol)
+        if above:
+            i = bisect_right(above, (price, float('inf')))
+            hits.extend((alarm_id, target, "ABOVE") for target, alarm_id in above[:i])
+        below = self.below.get(symbol)
+        if below:
+            i = bisect_left(below, (price, float('-inf')))
+            hits.extend((alarm_id, target, "BELOW") for target, alarm_id in below[i:])
+        return hits
+
+
+class AlarmEngine:
+    """Uygulama açık olduğu sürece alarmları fiyat servisi üzerinden kontrol eder.
+
+    Fiyat servisine tek bir abone olarak bağlanır; her güncellemede yalnızca
+    fiyatı değişen alarmlı semboller indekse sorulur, yani maliyet alarm
+    sayısıyla değil sembol sayısıyla büyür. Tetiklenen alarmlar pasif yapılır
+    ve ``notify`` callback'ine mesaj olarak iletilir.
+
+    ``EXPR`` koşullu alarmlar bir kez derlenir ve ``indicators`` (canlı
+    ``IndicatorFeed``) üzerinden sembol başına tek gösterge durumuyla
+    değerlendirilir; alarm başına ayrı ``teknik_analiz`` çalışmaz.
+    """
+
+    def __init__(self, portfolio, quotes, notify=print, indicators=None):
+        self.portfolio = portfolio
+        self.quotes = quotes
+        self.notify = notify
+        self.indicators = indicators
+        self.index = AlarmIndex()
+        self.expressions = {}
+        self.listeners = []
+        self._last_prices = {}
+        self.load()
+        self.quotes.subscribe("alarms", self.symbols, self.check)
+
+    def load(self):
+        """Aktif alarmları veritabanından indekse yükler"""
+        self.index = AlarmIndex()
+        self.expressions = {}
+        for alarm in self.portfolio.get_alarms():
+            alarm_id, symbol, target_price, condition = alarm[:4]
+            if condition == "EXPR":
+                try:
+                    self._add_expression(alarm_id, symbol, alarm[6])
+                except ValueError as e:
+                    print(f"Alarm ifadesi derlenemedi ({symbol}): {e}")
+            else:
+                self.index.add(alarm_id, symbol, target_price, condition)
+        self._last_prices.clear()
+
+    def _add_expression(self, alarm_id, symbol, expression):
+        evaluate = compile_expression(expression)
+        self.expressions.setdefault(symbol, {})[alarm_id] = (expression, evaluate)
+
+    def symbols(self):
+        """Fiyat veya ifade alarmı olan semboller"""
+        return sorted(set(self.index.symbols()) | self.expressions.keys())
+
+    def expression_symbols(self):
+        """Gösterge durumu gereken (ifade alarmı olan) semboller"""
+        return sorted(self.expressions)
+
+    def add_alarm(self, symbol, target_price, condition, expression=None):
+        """Alarmı kaydeder ve indekse ekler; EXPR için ifade önce derlenir"""
+        symbol = symbol.upper()
+        if condition == "EXPR":
+            compile_expression(expression)  # Geçersizse kaydetmeden ValueError
+            alarm_id = self.portfolio.add_alarm(symbol, 0.0, condition, expression)
+            self._add_expression(alarm_id, symbol, expression)
+        else:
+            alarm_id = self.portfolio.add_alarm(symbol, target_price, condition)
+            self.index.add(alarm_id, symbol, target_price, condition)
+        self._last_prices.pop(symbol, None)
+        self._changed()
+        # Sembolün fiyatı zaten biliniyorsa hemen kontrol et
+        self.check(self.quotes.snapshot)
+        return alarm_id
+
+    def recheck(self, symbols=None):
+        """Fiyatı değişmemiş olsa da sembolleri yeniden kontrol eder (ör. göstergeler hazır olunca)"""
+        for symbol in symbols if symbols is not None else list(self._last_prices):
+            self._last_prices.pop(symbol, None)
+        return self.check(self.quotes.snapshot)
+
+    def _changed(self):
+        for listener in list(self.listeners):
+            try:
+                listener()
+            except Exception as e:
+                print(f"Alarm dinleyicisi hatası: {e}")
+
+    @timed('alarms.check')
+    def check(self, snapshot):
+        """Yeni fiyatları alarm eşikleriyle ve ifadelerle karşılaştırır"""
+        fired = []
+        for symbol in self.symbols():
+            quote = snapshot.get(symbol)
+            if quote is None or self._last_prices.get(symbol) == quote['price']:
+                continue
+            price = self._last_prices[symbol] = quote['price']
+            for alarm_id, target_price, condition in self.index.triggered(symbol, price):
+                fired.append((alarm_id, symbol, price,
+                              f"{symbol} için {condition} {target_price:.2f} TL hedefine ulaşıldı!"))
+            fired.extend(self._check_expressions(symbol, price))
+
+        if not fired:
+            return fired
+        with self.portfolio.batch():
+            for alarm_id, symbol, *_ in fired:
+                self.portfolio.deactivate_alarm(alarm_id)
+                if alarm_id in self.expressions.get(symbol, {}):
+                    del self.expressions[symbol][alarm_id]
+                    if not self.expressions[symbol]:
+                        del self.expressions[symbol]
+                else:
+                    self.index.remove(alarm_id)
+        for alarm_id, symbol, price, message in fired:
+            self.notify(f"{message}\nGüncel fiyat: {price:.2f} TL")
+        self._changed()
+        return fired
+
+    def _check_expressions(self, symbol, price):
+        """Sembolün ifade alarmlarını tek gösterge durumu üzerinden değerlendirir"""
+        alarms = self.expressions.get(symbol)
+        if not alarms or self.indicators is None:
+            return []
+        feed = self.indicators()
+        values = feed.get(symbol) if feed is not None else None
+        if not values:
+            return []
+        previous = feed.previous(symbol)
+        hits = []
+        for alarm_id, (expression, evaluate) in alarms.items():
+            try:
+                if evaluate(values, previous):
+                    hits.append((alarm_id, symbol, price, f"{symbol}: {expression} koşulu gerçekleşti!"))
+            except (KeyError, TypeError, ZeroDivisionError) as e:
+                print(f"Alarm ifadesi değerlendirilemedi ({symbol}: {expression}): {e}")
+        return hits
+
+
+class ToastQueue:
+    """Bildirimleri ekranın sağ altında, uygulamayı bloklamadan sırayla gösterir"""
+
+    def __init__(self, root, duration_ms=8000, max_visible=3, title="Alarm!"):
+        self.root = root
+        self.duration_ms = duration_ms
+        self.max_visible = max_visible
+        self.title = title
+        self.pending = deque()
+        self.visible = []
+
+    def __call__(self, message):
+        self.pending.append(message)
+        self._show_next()
+
+    def _show_next(self):
+        while self.pending and len(self.visible) < self.max_visible:
+            self._show(self.pending.popleft())
+
+    def _show(self, message):
+        toast = tk.Toplevel(self.root)
+        toast.overrideredirect(True)
+        toast.attributes("-topmost", True)
+        frame = tk.Frame(toast, bg="#4a6fa5", padx=12, pady=8)
+        frame.pack(fill=tk.BOTH, expand=True)
+        tk.Label(frame, text=self.title, bg="#4a6fa5", fg="white",
+                 font=("Segoe UI", 10, "bold"), anchor="w").pack(fill=tk.X)
+        tk.Label(frame, text=message, bg="#4a6fa5", fg="white",
+                 font=("Segoe UI", 10), justify=tk.LEFT, anchor="w").pack(fill=tk.X)
+
+        self.visible.append(toast)
+        self._layout()
+        for widget in (toast, *frame.winfo_children(), frame):
+            widget.bind("<Button-1>", lambda event: self._close(toast))
+        toast.after(self.duration_ms, lambda: self._close(toast))
+
+    def _layout(self):
+        """Açık bildirimleri ekranın sağ alt köşesinden yukarı doğru dizer"""
+        y = self.root.winfo_screenheight() - 60
+        for toast in self.visible:
+            toast.update_idletasks()
+            width, height = toast.winfo_reqwidth(), toast.winfo_reqheight()
+            y -= height + 10
+            toast.geometry(f"+{self.root.winfo_screenwidth() - width - 20}+{y}")
+
+    def _close(self, toast):
+        if toast not in self.visible:
+            return
+        self.visible.remove(toast)
+        toast.destroy()
+        self._layout()
+        self._show_next()
@@ -0,0 +1,192 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from indicators import teknik_analiz
+from screener import sinyal_etiketi, sinyal_puani
+
+
+def temel_gostergeler(info):
+    """Ticker.info sözlüğünden rapordaki temel göstergeleri biçimlendirir"""
+    # Market cap kontrolü
+    market_cap = info.get('marketCap')
+    market_cap_str = f"{market_cap/1000000:,.2f} M TL" if market_cap else 'N/A'
+
+    # Temettü verimi kontrolü
+    dividend_yield = info.get('dividendYield')
+    dividend_str = f"{dividend_yield*100:.2f}%" if dividend_yield else 'N/A'
+
+    # Kar marjı kontrolü
+    profit_margins = info.get('profitMargins')
+    profit_str = f"{profit_margins*100:.2f}%" if profit_margins else 'N/A'
+
+    return {
+        'Piyasa Değeri': market_cap_str,
+        'F/K': info.get('forwardPE', 'N/A'),
+        'FD/FAVÖK': info.get('enterpriseToEbitda', 'N/A'),
+        'Temettu Verimi': dividend_str,
+        'Son Çeyrek Kâr': profit_str,
+        '52 Hafta En Yüksek': info.get('fiftyTwoWeekHigh', 'N/A'),
+        '52 Hafta En Düşük': info.get('fiftyTwoWeekLow', 'N/A'),
+    }
+
+
+def temel_analiz(hisse_kodu, info_cache):
+    """Hissenin temel göstergelerini döndürür, alınamazsa None"""
+    try:
+        return temel_gostergeler(info_cache.get(hisse_kodu))
+    except Exception as e:
+        print(f"Temel analiz hatası: {e}")
+        return None
+
+
+def analiz_verisi(hisse_kodu, periyot, ohlcv, info_cache):
+    """Fiyat geçmişini ve temel verileri eşzamanlı çeker; (ham_df, df, temel) döndürür.
+
+    Veri 10 iş gününden azsa df ve temel None döner. Temel veriler ayrı bir
+    iş parçacığında çekilir; çağıranın havuzu kullanılmadığı için havuz
+    doluyken kilitlenme olmaz.
+    """
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        temel_future = pool.submit(temel_analiz, hisse_kodu, info_cache)
+        ham_df = ohlcv.history(hisse_kodu, periyot)
+        if ham_df.empty or len(ham_df) < 10:
+            temel_future.cancel()
+            return ham_df, None, None
+        return ham_df, teknik_analiz(ham_df), temel_future.result()
+
+
+def analiz_raporu(hisse_kodu, periyot, df, temel, ai_analyzer):
+    """Göstergeleri hesaplanmış veriden metin analiz raporunu oluşturur"""
+    son_fiyat = df['Close'].iloc[-1]
+    onceki_fiyat = df['Close'].iloc[-2] if len(df) > 1 else son_fiyat
+    daily_change = son_fiyat - onceki_fiyat
+    percent_change = (son_fiyat/onceki_fiyat-1)*100
+
+    son = df.iloc[-1]
+
+    # Analiz raporu oluştur
+    analiz = f"""
+📈 {hisse_kodu.upper()}.IS ANALİZ RAPORU - {datetime.now().strftime('%d.%m.%Y %H:%M')}
+{'='*80}
+
+🔹 FİYAT VE HACİM BİLGİLERİ ({periyot}):
+   • Son Fiyat: {son_fiyat:.2f} TL
+   • Günlük Değişim: {daily_change:+.2f} TL ({percent_change:+.2f}%)
+   • Ortalama Fiyat: {df['Close'].mean():.2f} TL
+   • Ortalama Hacim: {df['Volume'].mean()/1000000:.2f} M
+   • Son Hacim: {df['Volume'].iloc[-1]/1000000:.2f} M
+   • En Yüksek Fiyat: {df['Close'].max():.2f} TL
+   • En Düşük Fiyat: {df['Close'].min():.2f} TL
+   • En Yüksek Hacim: {df['Volume'].max()/1000000:.2f} M
+   • Volatilite: {(df['Close'].max() - df['Close'].min())/df['Close'].mean()*100:.2f}%
+
+📊 TEKNİK GÖSTERGELER:
+   • RSI (14): {son['RSI']:.2f} {"(Aşırı Alım ⚠)" if son['RSI'] > 70 else "(Aşırı Satım ⚠)" if son['RSI'] < 30 else ""}
+   • MACD: {son['MACD']:.2f} {"(Yukarı)" if son['MACD'] > son['MACD_signal'] else "(Aşağı)"}
+   • MACD Sinyal: {son['MACD_signal']:.2f}
+   • EMA 20: {son['EMA_20']:.2f} {"(Üstünde ▲)" if son['Close'] > son['EMA_20'] else "(Altında ▼)"}
+   • SMA 50: {son['SMA_50']:.2f} {"(Üstünde ▲)" if son['Close'] > son['SMA_50'] else "(Altında ▼)"}
+   • EMA 200: {son['EMA_200']:.2f} {"(Üstünde ▲)" if son['Close'] > son['EMA_200'] else "(Altında ▼)"}
+   • Bollinger Band: {"(Üst Band)" if son['Close'] > son['BB_upper'] else "(Alt Band)" if son['Close'] < son['BB_lower'] else "(Orta Band)"}
+   • OBV: {son['OBV']/1000000:+.2f} M
+   • Hacim Ortalama/Şimdi: {df['Volume'].mean()/1000000:.1f}M/{son['Volume']/1000000:.1f}M
+"""
+    # Temel analiz ekle
+    if temel:
+        analiz += f"""
+💰 TEMEL GÖSTERGELER:
+   • Piyasa Değeri: {temel.get('Piyasa Değeri', 'N/A')}
+   • F/K: {temel.get('F/K', 'N/A')}
+   • FD/FAVÖK: {temel.get('FD/FAVÖK', 'N/A')}
+   • Temettu Verimi: {temel.get('Temettu Verimi', 'N/A')}
+   • Son Çeyrek Kâr: {temel.get('Son Çeyrek Kâr', 'N/A')}
+   • 52 Hafta En Yüksek: {temel.get('52 Hafta En Yüksek', 'N/A')}
+   • 52 Hafta En Düşük: {temel.get('52 Hafta En Düşük', 'N/A')}
+
+"""
+    else:
+        analiz += "\n⚠ Temel analiz verileri alınamadı\n"
+
+    # Sinyal analizi
+    analiz += "\n💡 GENEL DEĞERLENDİRME:\n"
+    # Al sinyalleri (piyasa taramasıyla aynı puanlama)
+    buy_signal = int(sinyal_puani(son, df['Volume'].mean()))
+
+    # Sinyal analizine hacim kontrolü ekleyin
+    if son['Volume'] > df['Volume'].mean() * 1.5:  # Ortalamanın 1.5 katından fazla hacim:
+        analiz += "\n   • Yüksek Hacim: Alım satım ilgisinde artış"
+
+    if buy_signal >= 4:
+        analiz += "   • GÜÇLÜ AL SİNYALİ (Çoğunlukla olumlu göstergeler)"
+    elif buy_signal >= 2:
+        analiz += "   • Orta seviye al sinyali (Bazı olumlu göstergeler)"
+    elif buy_signal == 1:
+        analiz += "   • Zayıf al sinyali (Sınırlı olumlu gösterge)"
+    else:
+        analiz += "   • Satış baskısı (Olumsuz göstergeler hakim)"
+
+    # AI analizini al
+    stock_data = {
+        'son_fiyat': son_fiyat,
+        'RSI': son['RSI'],
+        'MACD': son['MACD'],
+        'MACD_signal': son['MACD_signal'],
+        'EMA_20': son['EMA_20'],
+        'Volume': son['Volume']
+    }
+
+    ai_analysis = ai_analyzer.analyze_stock(stock_data, temel)
+
+    if 'error' not in ai_analysis:
+        analiz += "\n\n🤖 YAPAY ZEKA ANALİZLERİ:\n"
+        for uzman, yorum in ai_analysis.items():
+            analiz += f"\n📊 {yorum}"
+    else:
+        analiz += f"\n\n⚠️ YAPAY ZEKA ANALİZİ ALINAMADI:\n{ai_analysis['error']}"
+
+    return analiz
+
+
+def analiz_ozeti(hisse_kodu, periyot, df, temel):
+    """Raporun makine tarafından okunabilir özetini (JSON/CSV için) döndürür"""
+    son = df.iloc[-1]
+    onceki_fiyat = df['Close'].iloc[-2] if len(df) > 1 else son['Close']
+    puan = int(sinyal_puani(son, df['Volume'].mean()))
+    ozet = {
+        'hisse': hisse_kodu,
+        'periyot': periyot,
+        'tarih': str(df.index[-1]),
+        'son_fiyat': float(son['Close']),
+        'degisim_yuzde': float((son['Close'] / onceki_fiyat - 1) * 100),
+        'ortalama_hacim': float(df['Volume'].mean()),
+        'son_hacim': float(son['Volume']),
+    }
+    for sutun in ('RSI', 'Stoch_%K', 'MACD', 'MACD_signal', 'EMA_20', 'SMA_50', 'EMA_200',
+                  'BB_upper', 'BB_middle', 'BB_lower', 'OBV'):
+        ozet[sutun] = float(son[sutun])
+    ozet['puan'] = puan
+    ozet['sinyal'] = sinyal_etiketi(puan)
+    for anahtar, deger in (temel or {}).items():
+        ozet[anahtar] = deger
+    return ozet
+
+
+def portfoy_degerlemesi(portfolio, snapshot):
+    """Portföydeki pozisyonları verilen fiyat snapshot'ıyla değerler"""
+    satirlar = []
+    for symbol, quantity, cost, date, avg_cost in portfolio.get_portfolio():
+        quote = snapshot.get(symbol)
+        current_value = quote['price'] * quantity if quote else None
+        profit_loss = current_value - cost if quote else None
+        satirlar.append({
+            'hisse': symbol,
+            'adet': quantity,
+            'maliyet': cost,
+            'ortalama_maliyet': avg_cost,
+            'guncel_fiyat': quote['price'] if quote else None,
+            'guncel_deger': current_value,
+            'kar_zarar': profit_loss,
+            'kar_zarar_yuzde': (profit_loss / cost) * 100 if quote and cost else None,
+            'son_islem_tarihi': date,
+        })
+    return satirlar
@@ -0,0 +1,109 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundTask:
+    """Arka planda çalışan tek bir iş; iptal edilirse sonucu teslim edilmez"""
+
+    def __init__(self, owner, on_done, on_error):
+        self.owner = owner
+        self.on_done = on_done
+        self.on_error = on_error
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class BackgroundExecutor:
+    """Ağ isteklerini iş parçacığı havuzunda çalıştırır, sonuçları Tk ana döngüsüne iletir.
+
+    Tkinter widget'ları yalnızca ana iş parçacığından güncellenebildiği için
+    işçiler sonuçlarını bir kuyruğa bırakır; kuyruk ``root.after`` ile düzenli
+    olarak boşaltılır ve callback'ler ana iş parçacığında çağrılır. Bir pencereye
+    bağlı işler pencere kapandığında iptal edilir.
+    """
+
+    def __init__(self, root, max_workers=8, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bist-fetch")
+        self.results = queue.Queue()
+        self.tasks = {}
+        self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def submit(self, func, *args, on_done=None, on_error=None, owner=None, **kwargs):
+        """func'ı arka planda çalıştırır; on_done/on_error ana iş parçacığında çağrılır"""
+        task = BackgroundTask(owner, on_done, on_error)
+        self.tasks.setdefault(owner, set()).add(task)
+
+        def run():
+            if task.cancelled:
+                return
+            try:
+                self.results.put((task, func(*args, **kwargs), None))
+            except Exception as e:
+                self.results.put((task, None, e))
+
+        task.future = self.pool.submit(run)
+        return task
+
+    def cancel_owner(self, owner):
+        """Bir sahibe (pencere veya anahtar) ait tüm bekleyen işleri iptal eder"""
+        for task in self.tasks.pop(owner, ()):
+            task.cancel()
+
+    def bind_window(self, window):
+        """Pencere kapandığında pencereye ait işleri iptal eder"""
+        def on_destroy(event):
+            if event.widget is window:
+                self.cancel_owner(window)
+
+        window.bind("<Destroy>", on_destroy, add="+")
+
+    def in_flight(self):
+        """Henüz sonucu teslim edilmemiş iş sayısı"""
+        return sum(len(tasks) for tasks in self.tasks.values())
+
+    def _poll(self):
+        while True:
+            try:
+                task, result, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            owner_tasks = self.tasks.get(task.owner)
+            if owner_tasks is not None:
+                owner_tasks.discard(task)
+                if not owner_tasks:
+                    del self.tasks[task.owner]
+            if task.cancelled:
+                continue
+
+            try:
+                if error is not None:
+                    if task.on_error:
+                        task.on_error(error)
+                    else:
+                        print(f"Arka plan işi hatası: {error}")
+                elif task.on_done:
+                    task.on_done(result)
+            except Exception as e:
+                print(f"Arka plan sonucu işlenemedi: {e}")
+
+        self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def shutdown(self):
+        """Havuzu kapatır, bekleyen işleri iptal eder"""
+        if self._poll_id is not None:
+            try:
+                self.root.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+        for owner in list(self.tasks):
+            self.cancel_owner(owner)
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,572 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from indicators import INDICATOR_COLUMNS, build_panels, panel_indicators, teknik_analiz
+from table_model import format_timestamp
+
+
+def ornek_ohlcv(n_symbols, n_bars, seed=42):
+    """Rastgele yürüyüşle sembol başına tekrarlanabilir OHLCV verisi üretir"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end='2026-01-02', periods=n_bars, tz='Europe/Istanbul', name='Date')
+    frames = {}
+    for i in range(n_symbols):
+        close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+        spread = close * rng.uniform(0.001, 0.03, n_bars)
+        frames[f"S{i:03d}"] = pd.DataFrame({
+            'Open': close + rng.normal(0, 0.5, n_bars) * spread,
+            'High': close + spread,
+            'Low': close - spread,
+            'Close': close,
+            'Volume': rng.integers(10_000, 5_000_000, n_bars).astype(float),
+        }, index=index)
+    return frames
+
+
+def bench_indicators(n_symbols=500, n_bars=504):
+    """Sembol başına teknik_analiz döngüsünü panel motoruyla karşılaştırır"""
+    frames = ornek_ohlcv(n_symbols, n_bars)
+
+    start = time.perf_counter()
+    tek_tek = {symbol: teknik_analiz(df) for symbol, df in frames.items()}
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    close, high, low, volume = build_panels(frames)
+    panel = panel_indicators(close, high, low, volume)
+    panel_time = time.perf_counter() - start
+
+    max_diff = 0.0
+    for name in INDICATOR_COLUMNS:
+        expected = pd.concat({s: df[name] for s, df in tek_tek.items()}, axis=1)
+        diff = (panel[name] - expected).abs() / expected.abs().clip(lower=1.0)
+        max_diff = max(max_diff, float(np.nanmax(diff.to_numpy())))
+        if not (panel[name].isna() == expected.isna()).all().all():
+            raise AssertionError(f"{name}: boş değer konumları farklı")
+
+    return {
+        'symbols': n_symbols,
+        'bars': n_bars,
+        'loop_s': loop_time,
+        'panel_s': panel_time,
+        'speedup': loop_time / panel_time,
+        'max_rel_diff': max_diff,
+    }
+
+
+def ornek_islemler(n_rows, n_symbols=500, seed=42):
+    """Aracı kurum dökümüne benzer rastgele (symbol, operation, price, quantity, date) satırları üretir"""
+    rng = np.random.default_rng(seed)
+    symbols = rng.integers(0, n_symbols, n_rows)
+    operations = np.where(rng.random(n_rows) < 0.6, 'BUY', 'SELL')
+    prices = np.round(rng.uniform(1, 500, n_rows), 2)
+    quantities = rng.integers(1, 1000, n_rows)
+    seconds = np.sort(rng.integers(0, 5 * 365 * 86400, n_rows))
+    dates = (pd.Timestamp('2021-01-01') + pd.to_timedelta(seconds, unit='s')).strftime('%Y-%m-%d %H:%M:%S')
+    return [(f"S{s:03d}", op, float(p), int(q), d)
+            for s, op, p, q, d in zip(symbols, operations, prices, quantities, dates)]
+
+
+def bench_portfolio(n_rows=1_000_000, n_single=2_000, n_queries=200):
+    """Portfolio için toplu ekleme ve indeksli sorgu hızını ölçer"""
+    import tempfile
+
+    from portfolio import Portfolio
+
+    rows = ornek_islemler(n_rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Karşılaştırma: her satırda commit eden eski yol
+        tek = Portfolio(os.path.join(tmp, 'tek.db'))
+        start = time.perf_counter()
+        for row in rows[:n_single]:
+            tek.add_transaction(*row)
+        single_rate = n_single / (time.perf_counter() - start)
+        tek.close()
+
+        portfolio = Portfolio(os.path.join(tmp, 'bench.db'))
+        start = time.perf_counter()
+        portfolio.add_transactions(rows)
+        bulk_time = time.perf_counter() - start
+
+        symbols = sorted({row[0] for row in rows})[:n_queries]
+        start = time.perf_counter()
+        fetched = sum(len(portfolio.get_transactions(symbol)) for symbol in symbols)
+        query_time = (time.perf_counter() - start) / len(symbols)
+
+        portfolio.create_alarm_table()
+        with portfolio.batch():
+            for i in range(10_000):
+                portfolio.add_alarm(f"S{i % 500:03d}", 100.0, 'ABOVE')
+                if i % 10:
+                    portfolio.deactivate_alarm(i + 1)
+        start = time.perf_counter()
+        for _ in range(n_queries):
+            active = portfolio.get_alarms()
+        alarm_time = (time.perf_counter() - start) / n_queries
+
+        start = time.perf_counter()
+        portfolio.get_portfolio()
+        portfolio.get_portfolio_summary()
+        portfolio_time = time.perf_counter() - start
+
+        # Karşılaştırma: tüm işlem geçmişi üzerinden GROUP BY
+        start = time.perf_counter()
+        portfolio._ledger_positions()
+        ledger_time = time.perf_counter() - start
+        portfolio.close()
+
+    return {
+        'rows': n_rows,
+        'single_insert_rows_per_s': single_rate,
+        'bulk_insert_s': bulk_time,
+        'bulk_insert_rows_per_s': n_rows / bulk_time,
+        'transactions_query_ms': query_time * 1000,
+        'rows_per_query': fetched / len(symbols),
+        'active_alarms_query_ms': alarm_time * 1000,
+        'active_alarms': len(active),
+        'portfolio_view_ms': portfolio_time * 1000,
+        'ledger_aggregate_ms': ledger_time * 1000,
+    }
+
+
+# Pencere açılmadan yüklenmemesi gereken ağır modüller
+AGIR_MODULLER = ('pandas', 'yfinance', 'ta', 'matplotlib', 'mplfinance', 'bs4')
+
+_STARTUP_SCRIPT = """
+import json, os, sys, time
+baslangic = time.perf_counter()
+import borsa
+sonuc = {'import_s': time.perf_counter() - baslangic}
+if os.environ.get('DISPLAY') or sys.platform in ('win32', 'darwin'):
+    import tkinter as tk
+    root = tk.Tk()
+    app = borsa.BistAnalizUygulamasi(root)
+    root.update()
+    sonuc['first_window_s'] = time.perf_counter() - baslangic
+    root.destroy()
+sonuc['heavy_modules'] = sorted(m for m in sys.modules if m.split('.')[0] in %r)
+print(json.dumps(sonuc))
+"""
+
+
+def bench_startup():
+    """borsa.py için import ve ilk pencere süresini temiz bir süreçte ölçer"""
+    cikti = subprocess.run([sys.executable, '-c', _STARTUP_SCRIPT % (AGIR_MODULLER,)],
+                           cwd=os.path.dirname(os.path.abspath(__file__)),
+                           capture_output=True, text=True, check=True).stdout
+    return json.loads(cikti.strip().splitlines()[-1])
+
+
+# --- Çevrimdışı ölçüm takımı -------------------------------------------------
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_fixtures')
+# Temel çizgi depoya konmaz: süreler makineye ve ölçülen veriye özgüdür. Ölçüm
+# yapılacak makinede (varsa ``record`` ile kaydedilen fikstürlerle) bir kez
+# ``suite --save-baseline`` çalıştırılır; sonraki ``suite`` çağrıları onunla karşılaştırılır.
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+
+def record_fixtures(symbols, fixture_dir=FIXTURE_DIR, period='max'):
+    """Sembollerin OHLCV geçmişini bir kez indirip CSV fikstür olarak kaydeder.
+
+    Tüm geçmiş kaydedilir; 10 yıl (≈2500 bar) takımın en uzun ölçüm boyutuna yetmez.
+    """
+    from data_providers import record_session
+
+    return record_session(symbols, fixture_dir, period, info=False)
+
+
+def load_fixtures(n_symbols, n_bars, fixture_dir=FIXTURE_DIR, min_bars=0):
+    """Kayıtlı fikstürleri okur; yoksa veya yetmezse tekrarlanabilir sentetik veriyle tamamlar.
+
+    Fikstürlerin en fazla son ``n_bars`` barı kullanılır; ``min_bars``tan kısa
+    kayıtlar atlanır. Daha kısa kayıtlar olduğu gibi döner, ölçüm boyutları
+    ``run_suite``ta ilk serinin uzunluğuyla sınırlanır.
+    """
+    frames = {}
+    if os.path.isdir(fixture_dir):
+        for name in sorted(os.listdir(fixture_dir)):
+            if not name.endswith('.csv') or len(frames) >= n_symbols:
+                continue
+            df = pd.read_csv(os.path.join(fixture_dir, name), index_col=0)
+            df.index = pd.to_datetime(df.index, utc=True).tz_convert('Europe/Istanbul')
+            if len(df) >= min_bars:
+                frames[name[:-4].upper()] = df.iloc[-n_bars:]
+    if len(frames) < n_symbols:
+        synthetic = ornek_ohlcv(n_symbols - len(frames), n_bars)
+        frames.update(synthetic)
+    return frames
+
+
+def veri_imzasi(frames):
+    """Ölçülen OHLCV verisinin özeti; temel çizgi yalnızca aynı veriyle alınmış sonuçlarla karşılaştırılır"""
+    import hashlib
+
+    digest = hashlib.sha1()
+    for symbol, df in sorted(frames.items()):
+        digest.update(symbol.encode())
+        digest.update(np.ascontiguousarray(df[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy(float)).tobytes())
+    return {'symbols': len(frames), 'bars': max(len(df) for df in frames.values()), 'sha1': digest.hexdigest()}
+
+
+class FixtureQuotes:
+    """Fikstürlerden fiyat üreten yerel kaynak; ``QuoteService(download=...)`` için.
+
+    Her çağrıda sembol başına son barın kapanışı küçük bir adımla oynatılır,
+    böylece ardışık yenilemeler gerçek akıştaki gibi değişen fiyat görür.
+    """
+
+    def __init__(self, frames, seed=7):
+        self.frames = frames
+        self.rng = np.random.default_rng(seed)
+        self._tails = {}
+
+    def __call__(self, symbols, period="5d"):
+        result = {}
+        for symbol in symbols:
+            tail = self._tails.get(symbol)
+            if tail is None:
+                df = self.frames.get(symbol)
+                if df is None:
+                    continue
+                tail = self._tails[symbol] = (df.iloc[-5:].copy(), float(df['Close'].iloc[-1]))
+            # Kopya yerine yerinde değiştirilir; ölçülen süre kaynağın değil servisin olsun
+            frame, close = tail
+            frame.iloc[-1, frame.columns.get_loc('Close')] = close * (1 + self.rng.normal(0, 0.002))
+            result[symbol] = frame
+        return result
+
+
+class _KayitTree:
+    """Ekransız ölçüm için Treeview yerine geçen, çağrıları sayan en küçük nesne"""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.items = {}
+        self.calls = 0
+
+    def __getitem__(self, key):
+        return self.columns
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def configure(self, **kwargs):
+        pass
+
+    def insert(self, parent, index, iid, values):
+        self.calls += 1
+        self.items[iid] = list(values)
+
+    def item(self, iid, values):
+        self.calls += 1
+        self.items[iid] = list(values)
+
+    def set(self, iid, column, value):
+        self.calls += 1
+        self.items[iid][self.columns.index(column)] = value
+
+    def delete(self, *iids):
+        self.calls += 1
+        for iid in iids:
+            self.items.pop(iid, None)
+
+    def move(self, iid, parent, index):
+        self.calls += 1
+
+    def get_children(self):
+        return tuple(self.items)
+
+    def selection(self):
+        return ()
+
+    def selection_set(self, items):
+        pass
+
+
+def _olc(func, repeat=5):
+    """func'ı ``repeat`` kez çalıştırıp medyan süreyi milisaniye olarak döndürür"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+
+def suite_teknik_analiz(frames, lengths):
+    df = next(iter(frames.values()))
+    return {f'teknik_analiz.{n}_bars_ms': _olc(lambda: teknik_analiz(df.iloc[-n:])) for n in lengths}
+
+
+def suite_portfolio(ledger_sizes):
+    import tempfile
+
+    from portfolio import Portfolio
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in ledger_sizes:
+            portfolio = Portfolio(os.path.join(tmp, f'ledger_{n}.db'))
+            portfolio.add_transactions(ornek_islemler(n))
+            results[f'get_portfolio.{n}_rows_ms'] = _olc(portfolio.get_portfolio, repeat=20)
+            portfolio.close()
+    return results
+
+
+def suite_alarms(frames, alarm_counts):
+    """N alarmla fiyat güncellemesi başına AlarmEngine.check süresi (hiçbiri tetiklenmeden)"""
+    import tempfile
+
+    from alarm_engine import AlarmEngine
+    from portfolio import Portfolio
+    from quote_service import QuoteService
+
+    symbols = sorted(frames)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in alarm_counts:
+            portfolio = Portfolio(os.path.join(tmp, f'alarms_{n}.db'))
+            portfolio.create_alarm_table()
+            with portfolio.batch():
+                for i in range(n):
+                    # Eşikler fiyattan uzakta: ölçüm tetiklenmeyen (yaygın) yolu kapsar
+                    portfolio.add_alarm(symbols[i % len(symbols)], 1e9 if i % 2 else 0.0,
+                                        'ABOVE' if i % 2 else 'BELOW')
+            quotes = QuoteService(download=FixtureQuotes(frames))
+            engine = AlarmEngine(portfolio, quotes, notify=lambda message: None)
+            snapshots = [quotes.fetch(symbols) for _ in range(5)]
+            it = iter(snapshots * 4)
+            results[f'alarm_check.{n}_alarms_ms'] = _olc(lambda: engine.check(next(it)), repeat=20)
+            portfolio.close()
+    return results
+
+
+def _izleme_satiri(symbol, current_price, change, change_percent, volume, rsi, added_at):
+    """İzleme listesi penceresindeki satır biçimi"""
+    return (
+        symbol,
+        f"{current_price:.2f} TL",
+        f"{change:+.2f} TL ({change_percent:+.2f}%)",
+        f"{volume/1000000:.1f}M",
+        f"{rsi:.1f}" if rsi == rsi else "-",
+        format_timestamp(added_at)
+    )
+
+
+def suite_watchlist(frames, symbol_counts):
+    """N sembollük izleme listesinin yenilemesi: fiyatları yerel kaynaktan çekme, biçimleme ve tablo farkı"""
+    from quote_service import QuoteService
+    from table_model import TableModel
+
+    results = {}
+    columns = ('Hisse', 'Güncel Fiyat', 'Değişim', 'Hacim', 'RSI (14)', 'Eklenme Tarihi')
+    for n in symbol_counts:
+        symbols = sorted(frames)[:n]
+        quotes = QuoteService(download=FixtureQuotes(frames))
+        tree = _KayitTree(columns)
+        table = TableModel(tree)
+
+        def refresh():
+            snapshot = quotes.fetch(symbols)
+            rows = []
+            for symbol in symbols:
+                quote = snapshot[symbol]
+                raw = (symbol, quote['price'], quote['change'], quote['change_percent'], quote['volume'],
+                       float('nan'), '2026-01-02 10:00:00')
+                rows.append((symbol, table.format(symbol, raw, _izleme_satiri)))
+            table.update(rows)
+
+        refresh()
+        tree.calls = 0
+        results[f'watchlist_refresh.{n}_symbols_ms'] = _olc(refresh)
+        results[f'watchlist_refresh.{n}_symbols_tree_calls'] = tree.calls / 5
+    return results
+
+
+def suite_render(frames, lengths):
+    """grafik_goster ve mum_grafigi_goster figürlerinin kurulum, yenileme ve canlı tik süreleri (Agg)"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+    from chart_manager import CandleChart, Chart, TechnicalChart
+
+    df = next(iter(frames.values()))
+    results = {}
+    for n in lengths:
+        data = df.iloc[-n:]
+        analiz = teknik_analiz(data)
+
+        def build_technical():
+            chart = Chart(None, figsize=(14, 10), style='ggplot')
+            chart.view = TechnicalChart(chart)
+            chart.view.set_data(analiz, 'Ölçüm')
+            chart.canvas.draw()
+            return chart
+
+        def build_candles():
+            chart = Chart(None, figsize=(11, 8.5))
+            chart.view = CandleChart(chart)
+            chart.view.set_data(data, 'Ölçüm')
+            chart.canvas.draw()
+            return chart
+
+        results[f'grafik_goster.{n}_bars_build_ms'] = _olc(build_technical, repeat=3)
+        chart = build_technical()
+        results[f'grafik_goster.{n}_bars_refresh_ms'] = _olc(
+            lambda: (chart.view.set_data(analiz, 'Ölçüm'), chart.canvas.draw()), repeat=3)
+
+        results[f'mum_grafigi.{n}_bars_build_ms'] = _olc(build_candles, repeat=3)
+        chart = build_candles()
+        quote = {'price': float(data['Close'].iloc[-1]), 'open': float(data['Open'].iloc[-1]),
+                 'high': float(data['High'].iloc[-1]), 'low': float(data['Low'].iloc[-1]),
+                 'volume': float(data['Volume'].iloc[-1]), 'date': data.index[-1]}
+        results[f'mum_grafigi.{n}_bars_live_tick_ms'] = _olc(lambda: chart.view.apply_quote(quote), repeat=20)
+    return results
+
+
+SUITE_SIZES = {
+    'full': {'bars': (252, 1260, 5040), 'ledger': (1_000, 100_000, 1_000_000), 'alarms': (1_000, 10_000, 100_000),
+             'watchlist': (50, 200, 500), 'render': (252, 1260, 5040)},
+    'quick': {'bars': (252, 1260), 'ledger': (1_000, 50_000), 'alarms': (1_000, 10_000),
+              'watchlist': (50, 200), 'render': (252,)},
+}
+
+
+def run_suite(quick=False, fixture_dir=FIXTURE_DIR):
+    """Tüm sıcak yolları çevrimdışı ölçer; ``{metrik: değer}`` ve ortam bilgisini döndürür"""
+    import platform
+
+    sizes = dict(SUITE_SIZES['quick' if quick else 'full'])
+    lengths = sizes['bars'] + sizes['render']
+    frames = load_fixtures(max(sizes['watchlist']), max(lengths), fixture_dir, min_bars=min(lengths))
+    # Bar ölçümleri ilk seriyle yapılır; kayıt kısaysa boyutlar kayıt uzunluğuna indirilir
+    n_max = len(next(iter(frames.values())))
+    for key in ('bars', 'render'):
+        sizes[key] = tuple(sorted({min(n, n_max) for n in sizes[key]}))
+    metrics = {}
+    metrics.update(suite_teknik_analiz(frames, sizes['bars']))
+    metrics.update(suite_portfolio(sizes['ledger']))
+    metrics.update(suite_alarms(frames, sizes['alarms']))
+    metrics.update(suite_watchlist(frames, sizes['watchlist']))
+    metrics.update(suite_render(frames, sizes['render']))
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'quick': quick,
+        'data': veri_imzasi(frames),
+        'metrics': metrics,
+    }
+
+
+def compare_baseline(results, baseline, tolerance=0.25):
+    """Her metriği temel çizgiyle karşılaştırır; ``tolerance`` oranından fazla yavaşlayanları döndürür.
+
+    Tüm metrikler düşük olanın iyi olduğu değerlerdir (süre, Treeview çağrısı).
+    """
+    regressions = []
+    for name, value in sorted(results['metrics'].items()):
+        old = baseline.get('metrics', {}).get(name)
+        if old is None:
+            continue
+        if value > old * (1 + tolerance) and value - old > 0.05:
+            regressions.append((name, old, value))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BIST analiz performans ölçümleri")
+    parser.add_argument('bench', nargs='?', choices=['indicators', 'startup', 'portfolio', 'suite', 'record'],
+                        default='indicators')
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--bars', type=int, default=504, help="2 yıl ≈ 504 işlem günü")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Portföy ölçümü için işlem sayısı")
+    parser.add_argument('--startup-budget', type=float, default=1.0,
+                        help="İlk pencere (yoksa import) için izin verilen süre, saniye")
+    parser.add_argument('--quick', action='store_true', help="suite: küçük boyutlarla hızlı tur")
+    parser.add_argument('--fixtures', default=FIXTURE_DIR, help="suite/record: OHLCV fikstür klasörü")
+    parser.add_argument('--json', help="suite: sonuçların yazılacağı JSON dosyası ('-' ise stdout)")
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help="suite: karşılaştırılacak temel çizgi; süreler makineye özgüdür, "
+                             "ölçüm yapılan makinede --save-baseline ile yeniden oluşturun")
+    parser.add_argument('--save-baseline', action='store_true', help="suite: sonuçları temel çizgi olarak kaydet")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="suite: gerileme sayılmadan önce izin verilen yavaşlama oranı")
+    parser.add_argument('record_symbols', nargs='*', help="record: kaydedilecek BIST sembolleri")
+    args = parser.parse_args()
+
+    if args.bench == 'record':
+        record_fixtures([s.upper() for s in args.record_symbols] or ['THYAO', 'GARAN', 'ASELS', 'EREGL', 'BIMAS'],
+                        args.fixtures)
+        sys.exit(0)
+
+    if args.bench == 'suite':
+        sonuc = run_suite(args.quick, args.fixtures)
+        if args.json == '-':
+            print(json.dumps(sonuc, indent=2))
+        else:
+            for name, value in sonuc['metrics'].items():
+                print(f"  {name:<45} {value:10.2f}")
+            if args.json:
+                with open(args.json, 'w', encoding='utf-8') as f:
+                    json.dump(sonuc, f, indent=2)
+        if args.save_baseline:
+            with open(args.baseline, 'w', encoding='utf-8') as f:
+                json.dump(sonuc, f, indent=2)
+            print(f"Temel çizgi kaydedildi: {args.baseline}", file=sys.stderr)
+            sys.exit(0)
+        if not os.path.exists(args.baseline):
+            print("Temel çizgi yok; karşılaştırma atlandı (bu makinede --save-baseline ile oluşturun)",
+                  file=sys.stderr)
+            sys.exit(0)
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if (baseline.get('quick'), baseline.get('data')) != (sonuc['quick'], sonuc['data']):
+            # Farklı boyut veya veriyle (sentetik / kayıtlı fikstür) alınan süreler karşılaştırılamaz
+            print("Temel çizgi farklı veri veya boyutlarla (--quick) alınmış; karşılaştırma yapılmadı. "
+                  "Bu veriyle --save-baseline ile yenileyin", file=sys.stderr)
+            sys.exit(2)
+        if (baseline.get('python'), baseline.get('machine')) != (sonuc['python'], sonuc['machine']):
+            print(f"Uyarı: temel çizgi başka bir ortamda alınmış ({baseline.get('machine')}, "
+                  f"Python {baseline.get('python')}); süreler karşılaştırılabilir olmayabilir, "
+                  f"--save-baseline ile yenileyin", file=sys.stderr)
+        gerilemeler = compare_baseline(sonuc, baseline, args.tolerance)
+        for name, old, new in gerilemeler:
+            print(f"GERİLEME {name}: {old:.2f} -> {new:.2f}", file=sys.stderr)
+        sys.exit(1 if gerilemeler else 0)
+
+    if args.bench == 'startup':
+        sonuc = bench_startup()
+        sure = sonuc.get('first_window_s', sonuc['import_s'])
+        print(f"Başlangıç: import {sonuc['import_s']:.3f} s", end='')
+        if 'first_window_s' in sonuc:
+            print(f", ilk pencere {sonuc['first_window_s']:.3f} s", end='')
+        print(f" (bütçe {args.startup_budget:.2f} s)")
+        if sonuc['heavy_modules']:
+            print(f"  Pencereden önce yüklenen ağır modüller: {', '.join(sonuc['heavy_modules'])}")
+        sys.exit(0 if sure <= args.startup_budget and not sonuc['heavy_modules'] else 1)
+
+    if args.bench == 'portfolio':
+        sonuc = bench_portfolio(args.rows)
+        print(f"Portföy: {sonuc['rows']:,} işlem")
+        print(f"  Satır başına commit:  {sonuc['single_insert_rows_per_s']:,.0f} satır/s")
+        print(f"  Toplu ekleme:         {sonuc['bulk_insert_rows_per_s']:,.0f} satır/s ({sonuc['bulk_insert_s']:.2f} s)")
+        print(f"  get_transactions:     {sonuc['transactions_query_ms']:.2f} ms ({sonuc['rows_per_query']:.0f} satır)")
+        print(f"  get_alarms:           {sonuc['active_alarms_query_ms']:.2f} ms ({sonuc['active_alarms']} aktif)")
+        print(f"  get_portfolio+özet:   {sonuc['portfolio_view_ms']:.2f} ms "
+              f"(geçmişten toplama {sonuc['ledger_aggregate_ms']:.0f} ms)")
+        sys.exit(0)
+
+    sonuc = bench_indicators(args.symbols, args.bars)
+    print(f"Göstergeler: {sonuc['symbols']} sembol × {sonuc['bars']} bar")
+    print(f"  Sembol başına döngü: {sonuc['loop_s']:.3f} s")
+    print(f"  Panel motoru:        {sonuc['panel_s']:.3f} s")
+    print(f"  Hızlanma:            {sonuc['speedup']:.1f}x")
+    print(f"  En büyük göreli fark: {sonuc['max_rel_diff']:.2e}")
@@ -1,15 +1,13 @@
+import importlib
+import os
+import sqlite3
+import threading
+import time
 import tkinter as tk
-from tkinter import messagebox, ttk
-import yfinance as yf
-import pandas as pd
-import ta
+from tkinter import filedialog, messagebox, ttk
+from contextlib import closing
 from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import mplfinance as mpf
-import numpy as np
-import requests
-from bs4 import BeautifulSoup
+from functools import cached_property
 
 
 # Stil sabitleri
@@ -19,61 +17,183 @@ LABEL_COLOR = "black"
 BUTTON_COLOR = "#4a6fa5"
 FONT = ("Segoe UI", 10)
 
-# Varsayılan hisse listesi
-DEFAULT_HISSELER = [
-    'THYAO', 'AKBNK', 'GARAN', 'ISCTR', 'KOZAA', 'SASA', 'ASELS', 'TCELL', 'PETKM', 'TUPRS',
-    'KCHOL', 'ARCLK', 'BIMAS', 'EREGL', 'FROTO', 'HALKB', 'KRDMD', 'SAHOL', 'SISE', 'TKFEN',
-    'TOASO', 'VAKBN', 'YKBNK', 'AKSA', 'ALARK', 'ANACM', 'ASUZU', 'BERA', 'BRISA', 'DOHOL'
-]
+# Ağır modüller (pandas, yfinance, ta, matplotlib) ilk kullanımda yüklenir;
+# pencere çizildikten sonra bunlar arka planda önceden yüklenir.
+PRELOAD_MODULES = (
+    'numpy', 'pandas', 'yfinance', 'ta',
+    'ohlcv_cache', 'info_cache', 'indicators', 'screener', 'analysis_core', 'ai_analysis',
+)
 
+from alarm_engine import AlarmEngine, ToastQueue
+from chart_manager import CandleChart, ChartManager, TechnicalChart
 from portfolio import Portfolio
+from statement_import import import_statement_file
+from table_model import TableModel, format_timestamp
+from symbols import DEFAULT_HISSELER, SYMBOL_LIST_TTL, get_bist_hisse_listesi, load_cached_hisse_listesi
+from quote_service import QuoteService
+from background import BackgroundExecutor
+from data_providers import ReplayProvider, YahooProvider
+from perf import perf
+
+
+def preload_modules():
+    """Ağır modülleri arka planda yükler; ilk analizdeki beklemeyi kısaltır"""
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"Modül önceden yüklenemedi ({name}): {e}")
+
 
 class BistAnalizUygulamasi:
-    def __init__(self, root):
+    def __init__(self, root, provider=None):
         self.root = root
         self.root.title("BIST Analiz Uygulaması")
         self.root.geometry("1100x800")
         self.root.configure(bg=BG_COLOR)
         self.root.minsize(1000, 700)
-        self.portfolio = Portfolio()
+        # Tüm piyasa verisi bu sağlayıcıdan gelir (canlı Yahoo veya kayıttan tekrar oynatma)
+        self.provider = provider or YahooProvider()
+        self.portfolio = self.open_portfolio()
         self.portfolio.create_alarm_table()
         self.portfolio.create_watchlist_table()
-        from ai_analysis import AIAnalyzer
-        self.ai_analyzer = AIAnalyzer()
-
-        self.hisse_listesi = self.get_bist_hisse_listesi()
-        if not self.hisse_listesi:
-            messagebox.showwarning("Uyarı", "BIST hisse listesi alınamadı, varsayılan liste kullanılıyor")
-            self.hisse_listesi = DEFAULT_HISSELER
+        self.quotes = QuoteService(download=self.provider.download)
+        self.executor = BackgroundExecutor(self.root)
+        # Pencere başına tek matplotlib figürü; yenilemeler mevcut figürü günceller
+        self.charts = ChartManager()
+        # Göstergeler her fiyat güncellemesinde pencerelerden önce güncellenir
+        self.quotes.subscribe("indicators", lambda: [], self.apply_indicators)
+        # Alarmlar pencere açık olmasa da uygulama boyunca kontrol edilir
+        self.alarms = AlarmEngine(self.portfolio, self.quotes, notify=ToastQueue(self.root),
+                                  indicators=lambda: self.__dict__.get('indicator_feed'))
+        self.request_quotes("alarms", self.alarms.symbols())
+        if self.alarms.expression_symbols():
+            # İfade alarmlarının gösterge durumları pencere çizildikten sonra hazırlanır
+            self.root.after(1000, lambda: self.seed_indicators(
+                "alarms", self.alarms.expression_symbols(), lambda _: self.alarms.recheck()))
+
+        # Arayüz önbellekteki (yoksa varsayılan) listeyle hemen kurulur,
+        # güncel liste arka planda gelince combobox güncellenir
+        if self.provider.cacheable:
+            cached, self.hisse_listesi_zamani = load_cached_hisse_listesi()
+        else:
+            cached, self.hisse_listesi_zamani = self.provider.symbol_list(), time.time()
+        self.hisse_listesi = cached or DEFAULT_HISSELER
 
         self.setup_ui()
         self.setup_styles()
 
+        # Tüm açık pencerelerin fiyatlarını tek seferde güncelle
+        self.root.after(self.provider.interval(60000), self.quote_tick)
+
+        self.root.after(0, self.refresh_hisse_listesi)
+
+        # Pencere çizildikten sonra ağır modülleri arka planda yükle
+        self.root.after(200, lambda: threading.Thread(target=preload_modules, daemon=True).start())
+
+    def open_portfolio(self, db_path='portfolio.db'):
+        """Canlı veride gerçek portföyü, tekrar oynatmada kayıt klasöründeki kopyasını açar.
+
+        Kopya ilk oynatmada gerçek portföyden alınır; oynatma sırasında eklenen
+        işlem, alarm ve izleme kayıtları gerçek veritabanına yazılmaz.
+        """
+        if self.provider.cacheable:
+            return Portfolio(db_path)
+        replay_path = os.path.join(self.provider.path, 'portfolio.db')
+        if not os.path.exists(replay_path) and os.path.exists(db_path):
+            # backup WAL'daki henüz aktarılmamış yazmaları da kopyalar
+            with closing(sqlite3.connect(db_path)) as kaynak, closing(sqlite3.connect(replay_path)) as hedef:
+                kaynak.backup(hedef)
+        return Portfolio(replay_path)
+
+    @cached_property
+    def ohlcv(self):
+        if not self.provider.cacheable:
+            return self.provider
+        from ohlcv_cache import OHLCVCache
+        return OHLCVCache(source=self.provider)
+
+    @cached_property
+    def info_cache(self):
+        from info_cache import InfoCache
+        if not self.provider.cacheable:
+            return InfoCache(path=None, source=self.provider)
+        return InfoCache(source=self.provider)
+
+    @cached_property
+    def indicator_feed(self):
+        from indicators import IndicatorFeed
+        return IndicatorFeed(self.ohlcv.history)
+
+    @cached_property
+    def ai_analyzer(self):
+        from ai_analysis import AIAnalyzer
+        return AIAnalyzer()
+
+    def apply_indicators(self, snapshot):
+        """Gösterge durumu oluşturulmuşsa yeni fiyatları uygular"""
+        if 'indicator_feed' in self.__dict__:
+            self.indicator_feed.apply(snapshot)
+
+    def quote_tick(self):
+        """Abone pencerelerin sembollerini arka planda tek bir toplu istekle günceller"""
+        symbols = self.quotes.requested_symbols()
+        if symbols:
+            self.executor.submit(self.quotes.fetch, symbols, on_done=self.quotes.publish,
+                                 on_error=lambda e: print(f"Fiyat güncelleme hatası: {e}"),
+                                 owner="quote_tick")
+        self.root.after(self.provider.interval(60000), self.quote_tick)  # Her dakika güncelle
+
+    def request_quotes(self, window, symbols):
+        """Snapshot'ta olmayan sembolleri arka planda çeker ve abonelere dağıtır"""
+        missing = self.quotes.missing(symbols)
+        if missing:
+            self.executor.submit(self.quotes.fetch, missing, on_done=self.quotes.publish,
+                                 on_error=lambda e: print(f"Fiyat verisi alınamadı: {e}"),
+                                 owner=window)
+
+    def seed_indicators(self, window, symbols, callback):
+        """Sembollerin gösterge durumlarını arka planda geçmiş veriden oluşturur"""
+        self.executor.submit(self.indicator_feed.seed, symbols, owner=window,
+                             on_done=lambda _: callback(self.quotes.snapshot))
+
+    def subscribe_quotes(self, window, symbols_func, callback):
+        """Pencereyi fiyat servisine abone yapar, pencere kapanınca aboneliği kaldırır"""
+        self.quotes.subscribe(window, symbols_func, callback)
+        self.executor.bind_window(window)
+
+        def on_destroy(event):
+            if event.widget is window:
+                self.quotes.unsubscribe(window)
+
+        window.bind("<Destroy>", on_destroy, add="+")
+
+        # İlk görünüm mevcut snapshot ile çizilir, eksikler arka planda gelir
+        callback(self.quotes.snapshot)
+        self.request_quotes(window, symbols_func())
 
     def get_bist_hisse_listesi(self):
         """Asenax API üzerinden BIST hisse listesini çeker, başarısız olursa varsayılan listeyi döndürür."""
-        try:
-            url = "https://api.asenax.com/bist/list/"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-
-            # JSON verisini al
-            data = response.json()
-
-            # 'data' içindeki 'kod' alanlarını al ve listeye ekle
-            if data["code"] == "0":
-                hisseler = [item["kod"] for item in data["data"] if "kod" in item]
-                if hisseler:
-                    return hisseler
-                else:
-                    print("Asenax API boş liste döndürdü.")
-            else:
-                print(f"Asenax API başarısız yanıt döndürdü: {data['code']}")
-        except Exception as e:
-            print(f"Asenax API'den hisse listesi alınırken hata: {e}")
-
-        print("Varsayılan listeye geçiliyor.")
-        return DEFAULT_HISSELER
+        return get_bist_hisse_listesi()
+
+    def refresh_hisse_listesi(self):
+        """Önbellekteki liste eskiyse güncel listeyi arka planda çeker, düzenli olarak tekrarlar"""
+        zaman = self.hisse_listesi_zamani
+        if zaman is None or time.time() - zaman > SYMBOL_LIST_TTL:
+            self.executor.submit(self.provider.symbol_list, on_done=self.set_hisse_listesi,
+                                 on_error=lambda e: print(f"Hisse listesi güncellenemedi: {e}"),
+                                 owner="hisse_listesi")
+        self.root.after(3600 * 1000, self.refresh_hisse_listesi)  # Saatte bir kontrol et
+
+    def set_hisse_listesi(self, hisseler):
+        """Yeni hisse listesini uygular ve ana combobox'ı günceller"""
+        if not hisseler:
+            return
+        self.hisse_listesi = hisseler
+        self.hisse_listesi_zamani = time.time()
+        # Kullanıcı filtre yazıyorsa değerler bir sonraki filtrelemede güncellenir
+        if not self.hisse_var.get() or self.hisse_var.get() in hisseler:
+            self.hisse_dropdown['values'] = hisseler
 
     def setup_ui(self):
         # Başlık
@@ -84,6 +204,10 @@ class BistAnalizUygulamasi:
         tk.Label(self.header, text="BIST ANALİZ UYGULAMASI", 
                 font=("Segoe UI", 18, "bold"), fg="white", bg=BUTTON_COLOR).pack(side=tk.LEFT, pady=20, padx=20)
 
+        # Performans tanılama butonu
+        self.perf_button = ttk.Button(self.header, text="Performans", command=self.show_perf_window)
+        self.perf_button.pack(side=tk.RIGHT, padx=10, pady=20)
+
         # Watchlist butonu ekle
         self.watchlist_button = ttk.Button(self.header, text="İzleme Listesi",
                                          command=self.show_watchlist_window)
@@ -132,6 +256,7 @@ class BistAnalizUygulamasi:
 
         ttk.Button(button_frame, text="Analiz Et", command=self.analiz_et).pack(side=tk.LEFT, padx=3)
         ttk.Button(button_frame, text="Derinlik", command=self.show_depth_window).pack(side=tk.LEFT, padx=3)
+        ttk.Button(button_frame, text="Piyasa Taraması", command=self.show_screener_window).pack(side=tk.LEFT, padx=3)
         ttk.Button(button_frame, text="Çizgi Grafik", command=self.grafik_goster).pack(side=tk.LEFT, padx=3)
         ttk.Button(button_frame, text="Mum Grafiği", command=self.mum_grafigi_goster).pack(side=tk.LEFT, padx=3)
         ttk.Button(button_frame, text="Temizle", command=self.temizle).pack(side=tk.LEFT, padx=3)
@@ -169,15 +294,16 @@ class BistAnalizUygulamasi:
                                   values=self.hisse_listesi, width=15)
         symbol_combo.grid(row=0, column=1, padx=5, pady=5)
 
-        tk.Label(form_frame, text="Hedef Fiyat:", bg="#ffffff").grid(row=0, column=2, padx=5, pady=5)
-        price_entry = ttk.Entry(form_frame, width=10)
+        tk.Label(form_frame, text="Hedef Fiyat / İfade:", bg="#ffffff").grid(row=0, column=2, padx=5, pady=5)
+        price_entry = ttk.Entry(form_frame, width=28)
         price_entry.grid(row=0, column=3, padx=5, pady=5)
 
         tk.Label(form_frame, text="Koşul:", bg="#ffffff").grid(row=0, column=4, padx=5, pady=5)
         condition_var = tk.StringVar(value="Üstünde")
         condition_combo = ttk.Combobox(form_frame, textvariable=condition_var,
-                                     values=["Üstünde", "Altında"], state="readonly", width=10)
+                                     values=["Üstünde", "Altında", "İfade"], state="readonly", width=10)
         condition_combo.grid(row=0, column=5, padx=5, pady=5)
+        # İfade örnekleri: RSI<30, MACD^SIGNAL, EMA20^<SMA50, CLOSE>BB_UPPER & VOLUME>1.5*VOL_AVG
 
         # Alarm listesi
         table_frame = tk.Frame(alarm_window, bg="#ffffff")
@@ -195,57 +321,51 @@ class BistAnalizUygulamasi:
 
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         alarm_tree.pack(fill=tk.BOTH, expand=True)
+        alarm_table = TableModel(alarm_tree, scrollbar)
 
         def add_alarm():
-            try:
-                symbol = symbol_var.get().strip().upper()
-                price = float(price_entry.get())
+            symbol = symbol_var.get().strip().upper()
+            if condition_var.get() == "İfade":
+                try:
+                    self.alarms.add_alarm(symbol, 0.0, "EXPR", price_entry.get())
+                except ValueError as e:
+                    messagebox.showerror("Hata", f"Geçersiz alarm ifadesi: {e}")
+                    return
+                self.seed_indicators("alarms", [symbol], lambda _: self.alarms.recheck([symbol]))
+            else:
+                try:
+                    price = float(price_entry.get())
+                except ValueError:
+                    messagebox.showerror("Hata", "Lütfen geçerli bir fiyat girin!")
+                    return
                 condition = "ABOVE" if condition_var.get() == "Üstünde" else "BELOW"
+                self.alarms.add_alarm(symbol, price, condition)
+            self.request_quotes("alarms", [symbol])
 
-                self.portfolio.add_alarm(symbol, price, condition)
-                update_alarm_list()
-
-                price_entry.delete(0, tk.END)
-                messagebox.showinfo("Başarılı", "Alarm başarıyla eklendi!")
-
-            except ValueError:
-                messagebox.showerror("Hata", "Lütfen geçerli bir fiyat girin!")
+            price_entry.delete(0, tk.END)
+            messagebox.showinfo("Başarılı", "Alarm başarıyla eklendi!")
 
         def update_alarm_list():
-            for item in alarm_tree.get_children():
-                alarm_tree.delete(item)
-
-            for alarm in self.portfolio.get_alarms():
-                alarm_tree.insert('', tk.END, values=(
-                    alarm[1],  # symbol
-                    f"{alarm[2]:.2f} TL",  # target_price
-                    "Üstünde" if alarm[3] == "ABOVE" else "Altında",  # condition
-                    "Aktif" if alarm[4] == 1 else "Pasif",  # active
-                    alarm[5]  # created_at
-                ))
-
-        def check_alarms():
-            """Alarmları kontrol eder"""
-            for alarm in self.portfolio.get_alarms():
-                try:
-                    symbol, target_price, condition = alarm[1], alarm[2], alarm[3]
-                    current_price = yf.Ticker(f"{symbol}.IS").history(period="1d")['Close'].iloc[-1]
-
-                    if (condition == "ABOVE" and current_price >= target_price) or \
-                       (condition == "BELOW" and current_price <= target_price):
-                        messagebox.showinfo("Alarm!", 
-                            f"{symbol} için {condition} {target_price:.2f} TL hedefine ulaşıldı!\n"
-                            f"Güncel fiyat: {current_price:.2f} TL")
-                        self.portfolio.deactivate_alarm(alarm[0])
-                        update_alarm_list()
-                except Exception as e:
-                    print(f"Alarm kontrolü hatası ({symbol}): {str(e)}")
-
-            alarm_window.after(60000, check_alarms)  # Her dakika kontrol et
+            conditions = {"ABOVE": "Üstünde", "BELOW": "Altında", "EXPR": "İfade"}
+            alarm_table.update([(alarm[0], (
+                alarm[1],  # symbol
+                alarm[6] if alarm[3] == "EXPR" else f"{alarm[2]:.2f} TL",  # expression / target_price
+                conditions.get(alarm[3], alarm[3]),  # condition
+                "Aktif" if alarm[4] == 1 else "Pasif",  # active
+                alarm[5]  # created_at
+            )) for alarm in self.portfolio.get_alarms()])
 
         ttk.Button(form_frame, text="Alarm Ekle", command=add_alarm).grid(row=0, column=6, padx=20, pady=5)
         update_alarm_list()
-        check_alarms()
+
+        # Alarm motoru alarm eklendiğinde veya tetiklendiğinde listeyi yeniler
+        self.alarms.listeners.append(update_alarm_list)
+
+        def on_destroy(event):
+            if event.widget is alarm_window and update_alarm_list in self.alarms.listeners:
+                self.alarms.listeners.remove(update_alarm_list)
+
+        alarm_window.bind("<Destroy>", on_destroy, add="+")
 
         tk.Label(self.header, text="BIST ANALİZ UYGULAMASI", 
                 font=("Segoe UI", 18, "bold"), fg="white", bg=BUTTON_COLOR).pack(side=tk.LEFT, pady=20, padx=20)
@@ -365,6 +485,7 @@ class BistAnalizUygulamasi:
 
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         portfolio_tree.pack(fill=tk.BOTH, expand=True)
+        portfolio_table = TableModel(portfolio_tree, scrollbar)
 
         def add_transaction():
             try:
@@ -384,30 +505,34 @@ class BistAnalizUygulamasi:
             except ValueError as e:
                 messagebox.showerror("Hata", "Lütfen geçerli değerler girin!")
 
-        def update_portfolio_view():
-            for item in portfolio_tree.get_children():
-                portfolio_tree.delete(item)
+        def portfolio_symbols():
+            return [row[0] for row in self.portfolio.get_portfolio()]
+
+        def update_portfolio_view(snapshot=None):
+            if snapshot is None:
+                snapshot = self.quotes.snapshot
+                self.request_quotes(portfolio_window, portfolio_symbols())
 
             total_profit_loss = 0
             portfolio_data = []
+            rows = []
 
             for symbol, quantity, cost, date, avg_cost in self.portfolio.get_portfolio():
+                formatted_date = format_timestamp(date)
                 try:
-                    current_price = yf.Ticker(f"{symbol}.IS").history(period="1d")['Close'].iloc[-1]
+                    current_price = snapshot[symbol]['price']
                     current_value = current_price * quantity
                     profit_loss = current_value - cost
                     profit_percentage = (profit_loss / cost) * 100
 
-                    formatted_date = datetime.strptime(date, '%Y-%m-%d %H:%M:%S').strftime('%d.%m.%Y %H:%M')
-
-                    portfolio_tree.insert('', tk.END, values=(
+                    rows.append((symbol, (
                         symbol,
                         f"{quantity:,}",
                         f"{cost:,.2f} TL",
                         f"{current_value:,.2f} TL",
                         f"{profit_loss:+,.2f} TL (%{profit_percentage:+.2f})",
                         formatted_date
-                    ))
+                    )))
 
                     total_profit_loss += profit_loss
                     portfolio_data.append({
@@ -416,14 +541,15 @@ class BistAnalizUygulamasi:
                     })
                 except Exception as e:
                     print(f"Hata {symbol}: {str(e)}")
-                    portfolio_tree.insert('', tk.END, values=(
+                    rows.append((symbol, (
                         symbol,
                         f"{quantity:,}",
                         f"{cost:,.2f} TL",
                         "Veri Yok",
                         "Hesaplanamadı",
                         formatted_date
-                    ))
+                    )))
+            portfolio_table.update(rows)
 
             # Özet bilgileri güncelle
             update_summary(total_profit_loss)
@@ -457,42 +583,53 @@ class BistAnalizUygulamasi:
                         bg="#ffffff", fg="#1e88e5").pack(side=tk.RIGHT, padx=5)
 
         def update_pie_chart(portfolio_data):
-            # Mevcut grafiği temizle
-            for widget in graph_frame.winfo_children():
-                widget.destroy()
-
             if not portfolio_data:
+                self.charts.close(graph_frame)
                 return
 
-            # Pasta grafiği oluştur
-            fig, ax = plt.subplots(figsize=(8, 6))
-            values = [item['value'] for item in portfolio_data]
-            labels = [item['symbol'] for item in portfolio_data]
+            import matplotlib
+            import numpy as np
 
-            colors = plt.cm.Set3(np.linspace(0, 1, len(portfolio_data)))
-            wedges, texts, autotexts = ax.pie(values, labels=labels, colors=colors,
-                                            autopct='%1.1f%%', startangle=90)
+            # Figür pencere açık kaldıkça bir kez kurulur, dilimler yerinde güncellenir
+            chart = self.charts.get(graph_frame)
+            if chart is None:
+                chart = self.charts.create(graph_frame, graph_frame, figsize=(8, 6))
+                chart.figure.add_subplot().set_title("Portföy Dağılımı", pad=20)
 
-            # Grafiği düzenle
-            plt.title("Portföy Dağılımı", pad=20)
-
-            # Grafiği canvas'a yerleştir
-            canvas = FigureCanvasTkAgg(fig, master=graph_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            values = [item['value'] for item in portfolio_data]
+            labels = [item['symbol'] for item in portfolio_data]
+            colors = matplotlib.colormaps['Set3'](np.linspace(0, 1, len(portfolio_data)))
+            chart.set_pie('pasta', values, labels, colors=colors)
+            chart.redraw()
 
         # İşlem ekle butonu
         ttk.Button(form_frame, text="İşlem Ekle", command=add_transaction).grid(row=0, column=8, padx=20, pady=5)
 
-        # İlk görünümü güncelle
-        update_portfolio_view()
+        def import_statement():
+            path = filedialog.askopenfilename(
+                parent=portfolio_window, title="Aracı Kurum Dökümü Seç",
+                filetypes=[("Döküm", "*.csv *.txt *.xlsx"), ("Tüm dosyalar", "*.*")])
+            if not path:
+                return
 
-        # Otomatik güncelleme
-        def auto_update():
-            update_portfolio_view()
-            portfolio_window.after(60000, auto_update)  # Her 1 dakikada bir güncelle
+            def on_done(sonuc):
+                update_portfolio_view()
+                mesaj = (f"{sonuc['read']} satır okundu\n{sonuc['inserted']} işlem eklendi\n"
+                         f"{sonuc['duplicates']} işlem zaten kayıtlı\n{sonuc['invalid']} satır geçersiz")
+                if sonuc['errors']:
+                    mesaj += "\n\n" + "\n".join(sonuc['errors'][:10])
+                messagebox.showinfo("İçe Aktarma", mesaj, parent=portfolio_window)
+
+            # SQLite bağlantısı iş parçacığına bağlı olduğundan işçi kendi bağlantısını açar
+            self.executor.submit(import_statement_file, path, self.portfolio.db_path,
+                                 on_done=on_done, owner=portfolio_window,
+                                 on_error=lambda e: messagebox.showerror(
+                                     "Hata", f"Döküm içe aktarılamadı: {e}", parent=portfolio_window))
 
-        portfolio_window.after(60000, auto_update)
+        ttk.Button(form_frame, text="Döküm İçe Aktar", command=import_statement).grid(row=0, column=9, padx=5, pady=5)
+
+        # İlk görünüm ve otomatik güncelleme, paylaşılan fiyat servisi üzerinden
+        self.subscribe_quotes(portfolio_window, portfolio_symbols, update_portfolio_view)
 
         # Form elemanları
         tk.Label(form_frame, text="Hisse Kodu:", bg="#ffffff").grid(row=0, column=0, padx=5, pady=5)
@@ -748,46 +885,44 @@ class BistAnalizUygulamasi:
 
         portfolio_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         portfolio_tree.pack(fill=tk.BOTH, expand=True)
+        portfolio_table = TableModel(portfolio_tree, portfolio_scroll)
 
-        def update_portfolio_view():
-            for item in portfolio_tree.get_children():
-                portfolio_tree.delete(item)
+        def update_portfolio_view(snapshot=None):
+            if snapshot is None:
+                snapshot = self.quotes.snapshot
+                self.request_quotes(portfolio_window, portfolio_symbols())
 
+            rows = []
             portfolio_data = self.portfolio.get_portfolio()
             for symbol, quantity, cost, buy_date, avg_cost in portfolio_data:
+                formatted_date = format_timestamp(buy_date, '%d.%m.%Y')
                 try:
-                    current_price = yf.Ticker(f"{symbol}.IS").history(period="1d")['Close'].iloc[-1]
+                    current_price = snapshot[symbol]['price']
                     current_value = current_price * quantity
                     profit_loss = current_value - cost
                     profit_percentage = (profit_loss / cost) * 100
-                    formatted_date = datetime.strptime(buy_date, '%Y-%m-%d %H:%M:%S').strftime('%d.%m.%Y')
 
-                    portfolio_tree.insert('', tk.END, values=(
+                    rows.append((symbol, (
                         symbol,
                         quantity,
                         f"{avg_cost:,.2f} TL",
                         f"{current_value:,.2f} TL",
                         f"{profit_loss:+,.2f} TL (%{profit_percentage:+.2f})",
                         formatted_date
-                    ))
+                    )))
                 except:
-                    portfolio_tree.insert('', tk.END, values=(
+                    rows.append((symbol, (
                         symbol,
                         quantity,
                         f"{avg_cost:,.2f} TL",
                         "Veri Yok",
                         "Hesaplanamadı",
                         formatted_date
-                    ))
-
-        update_portfolio_view()
+                    )))
+            portfolio_table.update(rows)
 
         # Otomatik güncelleme
-        def auto_update():
-            update_portfolio_view()
-            portfolio_window.after(60000, auto_update)  # Her 1 dakikada bir güncelle
-
-        portfolio_window.after(60000, auto_update)
+        self.subscribe_quotes(portfolio_window, portfolio_symbols, update_portfolio_view)
         # Klavye kısayolları ve dropdown olayları
         self.hisse_dropdown.bind("<Return>", lambda event: self.analiz_et())
         self.hisse_dropdown.bind("<KeyRelease>", lambda event: self.filter_hisse_listesi())
@@ -806,6 +941,77 @@ class BistAnalizUygulamasi:
         symbol_combo.bind("<KeyRelease>", lambda event: self.filter_hisse_listesi_for_combo(symbol_combo))
         symbol_combo.bind("<Return>", lambda event: add_to_watchlist())
 
+    def show_screener_window(self):
+        """Tüm BIST hisselerini sinyal puanına göre tarayan pencereyi gösterir"""
+        screener_window = tk.Toplevel(self.root)
+        screener_window.title("Piyasa Taraması")
+        screener_window.geometry("1100x700")
+        screener_window.configure(bg="#ffffff")
+        self.executor.bind_window(screener_window)
+
+        form_frame = tk.Frame(screener_window, bg="#ffffff")
+        form_frame.pack(fill=tk.X, padx=20, pady=10)
+
+        tk.Label(form_frame, text="Periyot:", bg="#ffffff").pack(side=tk.LEFT, padx=5)
+        period_var = tk.StringVar(value="1y")
+        ttk.Combobox(form_frame, textvariable=period_var, values=["6mo", "1y", "2y"],
+                     state="readonly", width=8).pack(side=tk.LEFT, padx=5)
+
+        status_var = tk.StringVar()
+        tk.Label(form_frame, textvariable=status_var, bg="#ffffff").pack(side=tk.RIGHT, padx=5)
+
+        table_frame = tk.Frame(screener_window, bg="#ffffff")
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+
+        columns = ('Hisse', 'Fiyat', 'Değişim', 'RSI', 'MACD', 'Hacim/Ort', 'Puan', 'Sinyal')
+        screener_tree = ttk.Treeview(table_frame, columns=columns, show='headings')
+
+        for col in columns:
+            screener_tree.heading(col, text=col)
+            screener_tree.column(col, width=120)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=screener_tree.yview)
+        screener_tree.configure(yscrollcommand=scrollbar.set)
+
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        screener_tree.pack(fill=tk.BOTH, expand=True)
+
+        def show_results(tablo):
+            for item in screener_tree.get_children():
+                screener_tree.delete(item)
+
+            for symbol, row in tablo.iterrows():
+                screener_tree.insert('', tk.END, values=(
+                    symbol,
+                    f"{row['Close']:.2f} TL",
+                    f"{row['Değişim %']:+.2f}%",
+                    f"{row['RSI']:.1f}" if row['RSI'] == row['RSI'] else "-",
+                    f"{row['MACD']:.2f}" if row['MACD'] == row['MACD'] else "-",
+                    f"{row['Hacim/Ort']:.2f}",
+                    row['Puan'],
+                    row['Sinyal']
+                ))
+            status_var.set(f"{len(tablo)} hisse tarandı - {datetime.now().strftime('%H:%M:%S')}")
+
+        def start_scan():
+            from screener import piyasa_taramasi
+            status_var.set(f"{len(self.hisse_listesi)} hisse taranıyor...")
+            self.executor.cancel_owner(screener_window)
+            self.executor.submit(piyasa_taramasi, list(self.hisse_listesi), period_var.get(),
+                                 download=self.provider.download,
+                                 owner=screener_window, on_done=show_results,
+                                 on_error=lambda e: status_var.set(f"Tarama başarısız: {e}"))
+
+        def analyze_selected(event):
+            selected = screener_tree.selection()
+            if selected:
+                self.hisse_var.set(screener_tree.item(selected[0])['values'][0])
+                self.analiz_et()
+
+        screener_tree.bind("<Double-1>", analyze_selected)
+        ttk.Button(form_frame, text="Tara", command=start_scan).pack(side=tk.LEFT, padx=5)
+        start_scan()
+
     def show_watchlist_window(self):
         """İzleme listesi penceresini gösterir"""
         watchlist_window = tk.Toplevel(self.root)
@@ -828,7 +1034,7 @@ class BistAnalizUygulamasi:
         table_frame = tk.Frame(watchlist_window, bg="#ffffff")
         table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
 
-        columns = ('Hisse', 'Güncel Fiyat', 'Değişim', 'Hacim', 'Eklenme Tarihi')
+        columns = ('Hisse', 'Güncel Fiyat', 'Değişim', 'Hacim', 'RSI (14)', 'Eklenme Tarihi')
         watchlist_tree = ttk.Treeview(table_frame, columns=columns, show='headings')
 
         for col in columns:
@@ -840,12 +1046,14 @@ class BistAnalizUygulamasi:
 
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         watchlist_tree.pack(fill=tk.BOTH, expand=True)
+        watchlist_table = TableModel(watchlist_tree, scrollbar)
 
         def add_to_watchlist():
             symbol = symbol_var.get().strip().upper()
             if symbol:
                 if self.portfolio.add_to_watchlist(symbol):
                     update_watchlist()
+                    self.seed_indicators(watchlist_window, [symbol], update_watchlist)
                     messagebox.showinfo("Başarılı", f"{symbol} izleme listesine eklendi!")
                 else:
                     messagebox.showwarning("Uyarı", f"{symbol} zaten izleme listesinde!")
@@ -859,56 +1067,142 @@ class BistAnalizUygulamasi:
                 update_watchlist()
                 messagebox.showinfo("Başarılı", f"{symbol} izleme listesinden çıkarıldı!")
 
-        def update_watchlist():
-            for item in watchlist_tree.get_children():
-                watchlist_tree.delete(item)
+        def watchlist_symbols():
+            return [symbol for symbol, _ in self.portfolio.get_watchlist()]
+
+        def watchlist_row(symbol, current_price, change, change_percent, volume, rsi, added_at):
+            if current_price is None:
+                return (symbol, "Veri Yok", "Veri Yok", "Veri Yok", "-", format_timestamp(added_at))
+            return (
+                symbol,
+                f"{current_price:.2f} TL",
+                f"{change:+.2f} TL ({change_percent:+.2f}%)",
+                f"{volume/1000000:.1f}M",
+                f"{rsi:.1f}" if rsi == rsi else "-",
+                format_timestamp(added_at)
+            )
+
+        def update_watchlist(snapshot=None):
+            if snapshot is None:
+                snapshot = self.quotes.snapshot
+                self.request_quotes(watchlist_window, watchlist_symbols())
 
+            rows = []
             for symbol, added_at in self.portfolio.get_watchlist():
                 try:
-                    ticker = yf.Ticker(f"{symbol}.IS")
-                    hist = ticker.history(period="5d")
-                    if not hist.empty:
-                        current_price = hist['Close'].iloc[-1]
-                        prev_price = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-                        change = current_price - prev_price
-                        change_percent = (change / prev_price) * 100 if prev_price != 0 else 0
-                        volume = hist['Volume'].iloc[-1]
-
-                        watchlist_tree.insert('', tk.END, values=(
-                            symbol,
-                            f"{current_price:.2f} TL",
-                            f"{change:+.2f} TL ({change_percent:+.2f}%)",
-                            f"{volume/1000000:.1f}M",
-                            datetime.strptime(added_at, '%Y-%m-%d %H:%M:%S').strftime('%d.%m.%Y %H:%M')
-                        ))
+                    quote = snapshot.get(symbol)
+                    if quote:
+                        rsi = self.indicator_feed.get(symbol).get('RSI', float('nan'))
+                        raw = (symbol, quote['price'], quote['change'], quote['change_percent'], quote['volume'],
+                               rsi, added_at)
                     else:
-                        watchlist_tree.insert('', tk.END, values=(
-                            symbol,
-                            "Veri Yok",
-                            "Veri Yok",
-                            "Veri Yok",
-                            datetime.strptime(added_at, '%Y-%m-%d %H:%M:%S').strftime('%d.%m.%Y %H:%M')
-                        ))
+                        raw = (symbol, None, None, None, None, None, added_at)
+                    # Fiyatı değişmeyen satırlar yeniden biçimlenmez
+                    rows.append((symbol, watchlist_table.format(symbol, raw, watchlist_row)))
                 except Exception as e:
                     print(f"Hata ({symbol}): {str(e)}")
-                    watchlist_tree.insert('', tk.END, values=(
-                        symbol,
-                        "Veri Yok",
-                        "Veri Yok",
-                        "Veri Yok",
-                        datetime.strptime(added_at, '%Y-%m-%d %H:%M:%S').strftime('%d.%m.%Y %H:%M')
-                    ))
+                    rows.append((symbol, (symbol, "Veri Yok", "Veri Yok", "Veri Yok", "-",
+                                          format_timestamp(added_at))))
+            watchlist_table.update(rows)
 
         ttk.Button(form_frame, text="Ekle", command=add_to_watchlist).pack(side=tk.LEFT, padx=5)
         ttk.Button(form_frame, text="Çıkar", command=remove_from_watchlist).pack(side=tk.LEFT, padx=5)
 
-        update_watchlist()
+        # Her dakika paylaşılan fiyat servisinden güncelle
+        self.subscribe_quotes(watchlist_window, watchlist_symbols, update_watchlist)
+        self.seed_indicators(watchlist_window, watchlist_symbols(), update_watchlist)
+
+    def show_perf_window(self):
+        """Sıcak yolların p50/p95 sürelerini, önbellek sayaçlarını ve süren işleri gösterir"""
+        perf_window = tk.Toplevel(self.root)
+        perf_window.title("Performans Tanılama")
+        perf_window.geometry("900x600")
+        perf_window.configure(bg="#ffffff")
+
+        form_frame = tk.Frame(perf_window, bg="#ffffff")
+        form_frame.pack(fill=tk.X, padx=20, pady=10)
+
+        enabled_var = tk.BooleanVar(value=perf.enabled)
+
+        def toggle():
+            perf.enabled = enabled_var.get()
 
-        def auto_update():
-            update_watchlist()
-            watchlist_window.after(60000, auto_update)  # Her dakika güncelle
+        ttk.Checkbutton(form_frame, text="Ölçüm açık", variable=enabled_var,
+                        command=toggle).pack(side=tk.LEFT, padx=5)
 
-        watchlist_window.after(60000, auto_update)
+        def export_trace():
+            path = filedialog.asksaveasfilename(parent=perf_window, defaultextension=".json",
+                                                initialfile="bist_trace.json",
+                                                filetypes=[("Chrome iz dosyası", "*.json")])
+            if not path:
+                return
+            try:
+                n = perf.export_trace(path)
+                messagebox.showinfo("İz Dosyası", f"{n} olay yazıldı:\n{path}", parent=perf_window)
+            except OSError as e:
+                messagebox.showerror("Hata", f"İz dosyası yazılamadı:\n{e}", parent=perf_window)
+
+        ttk.Button(form_frame, text="Sıfırla", command=lambda: (perf.reset(), refresh())).pack(side=tk.LEFT, padx=5)
+        ttk.Button(form_frame, text="İz Dosyasına Aktar", command=export_trace).pack(side=tk.LEFT, padx=5)
+
+        status_var = tk.StringVar()
+        tk.Label(perf_window, textvariable=status_var, bg="#ffffff", justify=tk.LEFT,
+                 anchor="w").pack(fill=tk.X, padx=20)
+
+        table_frame = tk.Frame(perf_window, bg="#ffffff")
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+
+        columns = ('Ölçüm', 'Adet', 'p50 (ms)', 'p95 (ms)', 'En Uzun (ms)', 'Toplam (s)')
+        perf_tree = ttk.Treeview(table_frame, columns=columns, show='headings')
+
+        for col in columns:
+            perf_tree.heading(col, text=col)
+            perf_tree.column(col, width=110, anchor='e')
+        perf_tree.column('Ölçüm', width=260, anchor='w')
+
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=perf_tree.yview)
+        perf_tree.configure(yscrollcommand=scrollbar.set)
+
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        perf_tree.pack(fill=tk.BOTH, expand=True)
+        perf_table = TableModel(perf_tree, scrollbar)
+
+        def refresh():
+            perf_table.update([(name, (
+                name,
+                s['count'],
+                f"{s['p50'] * 1000:.2f}",
+                f"{s['p95'] * 1000:.2f}",
+                f"{s['max'] * 1000:.2f}",
+                f"{s['total']:.2f}",
+            )) for name, s in perf.stats().items()])
+
+            counters = dict(perf.counters)
+            satirlar = [f"Arka plan işleri: {self.executor.in_flight()}  •  "
+                        f"Uçuştaki istekler: {perf.gauges.get('fetch.in_flight', 0)}"]
+            for cache in ('ohlcv', 'info'):
+                hit, miss = counters.pop(f'cache.{cache}.hit', 0), counters.pop(f'cache.{cache}.miss', 0)
+                if hit or miss:
+                    satirlar.append(f"{cache} önbelleği: {hit} isabet / {miss} ıska (%{hit / (hit + miss) * 100:.0f})")
+            if counters:
+                satirlar.append("  •  ".join(f"{name}: {value}" for name, value in sorted(counters.items())))
+            if not perf.enabled:
+                satirlar.append("Ölçüm kapalı (BIST_PERF=1 ile başlangıçta açılabilir)")
+            status_var.set("\n".join(satirlar))
+
+        after_id = None
+
+        def tick():
+            nonlocal after_id
+            refresh()
+            after_id = perf_window.after(1000, tick)
+
+        def on_destroy(event):
+            if event.widget is perf_window and after_id is not None:
+                perf_window.after_cancel(after_id)
+
+        perf_window.bind("<Destroy>", on_destroy, add="+")
+        tick()
 
     def setup_styles(self):
         style = ttk.Style()
@@ -946,65 +1240,16 @@ class BistAnalizUygulamasi:
         self.text_output.config(state=tk.DISABLED)
 
     def teknik_analiz(self, df):
+        from indicators import teknik_analiz
         try:
-            df = df.copy()
-            # Momentum göstergeleri
-            df['RSI'] = ta.momentum.RSIIndicator(df['Close'], window=14).rsi()
-            df['Stoch_%K'] = ta.momentum.StochasticOscillator(
-                df['High'], df['Low'], df['Close'], window=14).stoch()
-
-            # Trend göstergeleri
-            macd = ta.trend.MACD(df['Close'], window_slow=26, window_fast=12, window_sign=9)
-            df['MACD'] = macd.macd()
-            df['MACD_signal'] = macd.macd_signal()
-            df['EMA_20'] = ta.trend.EMAIndicator(df['Close'], window=20).ema_indicator()
-            df['SMA_50'] = ta.trend.SMAIndicator(df['Close'], window=50).sma_indicator()
-            df['EMA_200'] = ta.trend.EMAIndicator(df['Close'], window=200).ema_indicator()
-
-            # Volatilite göstergeleri
-            bollinger = ta.volatility.BollingerBands(df['Close'], window=20, window_dev=2)
-            df['BB_upper'] = bollinger.bollinger_hband()
-            df['BB_middle'] = bollinger.bollinger_mavg()
-            df['BB_lower'] = bollinger.bollinger_lband()
-
-            # Hacim analizi
-            df['OBV'] = ta.volume.OnBalanceVolumeIndicator(df['Close'], df['Volume']).on_balance_volume()
-
-            return df
+            return teknik_analiz(df)
         except Exception as e:
             print(f"Teknik analiz hatası: {e}")
             return None
 
     def temel_analiz(self, hisse_kodu):
-        try:
-            hisse = yf.Ticker(f"{hisse_kodu}.IS")
-            info = hisse.info
-
-            # Market cap kontrolü
-            market_cap = info.get('marketCap')
-            market_cap_str = f"{market_cap/1000000:,.2f} M TL" if market_cap else 'N/A'
-
-            # Temettü verimi kontrolü
-            dividend_yield = info.get('dividendYield')
-            dividend_str = f"{dividend_yield*100:.2f}%" if dividend_yield else 'N/A'
-
-            # Kar marjı kontrolü
-            profit_margins = info.get('profitMargins')
-            profit_str = f"{profit_margins*100:.2f}%" if profit_margins else 'N/A'
-
-            return {
-                'Piyasa Değeri': market_cap_str,
-                'F/K': info.get('forwardPE', 'N/A'),
-                'FD/FAVÖK': info.get('enterpriseToEbitda', 'N/A'),
-                'Temettu Verimi': dividend_str,
-                'Son Çeyrek Kâr': profit_str,
-                '52 Hafta En Yüksek': info.get('fiftyTwoWeekHigh', 'N/A'),
-                '52 Hafta En Düşük': info.get('fiftyTwoWeekLow', 'N/A'),
-
-            }
-        except Exception as e:
-            print(f"Temel analiz hatası: {e}")
-            return None
+        from analysis_core import temel_analiz
+        return temel_analiz(hisse_kodu, self.info_cache)
 
     def grafik_goster(self):
         hisse_kodu = self.hisse_var.get().strip().upper()
@@ -1014,77 +1259,44 @@ class BistAnalizUygulamasi:
             messagebox.showwarning("Uyarı", "Lütfen bir hisse kodu seçin")
             return
 
-        try:
-            hisse = yf.Ticker(f"{hisse_kodu}.IS")
-            df = hisse.history(period=periyot)
+        ohlcv = self.ohlcv
 
+        def veri_getir():
+            df = ohlcv.history(hisse_kodu, periyot)
             if df.empty or len(df) < 5:
-                messagebox.showerror("Hata", "Yeterli veri bulunamadı")
-                return
+                return df, None
+            return df, self.teknik_analiz(df)
 
-            df = self.teknik_analiz(df)
-            if df is None:
-                messagebox.showerror("Hata", "Teknik analiz yapılamadı")
-                return
+        self.executor.submit(veri_getir,
+                             on_done=lambda sonuc: self._grafik_ciz(hisse_kodu, periyot, *sonuc),
+                             on_error=lambda e: messagebox.showerror("Hata", f"Grafik oluşturulamadı:\n{str(e)}"))
 
-            plt.style.use('ggplot')
-
-            # 4 alt grafik için height_ratios güncellendi
-            fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(14, 10), 
-                                                        gridspec_kw={'height_ratios': [2, 1], 'width_ratios': [3, 1]})
-            fig.patch.set_facecolor(BG_COLOR)
-
-            # Fiyat grafiği (ax1)
-            ax1.plot(df.index, df['Close'], label='Kapanış', color='#2e86de', linewidth=2)
-            ax1.plot(df.index, df['EMA_20'], label='EMA 20', linestyle='--', color='#ff9f43')
-            ax1.plot(df.index, df['SMA_50'], label='SMA 50', linestyle=':', color='#5f27cd')
-            ax1.plot(df.index, df['EMA_200'], label='EMA 200', linestyle='-.', color='#ff6b6b')
-            ax1.fill_between(df.index, df['BB_upper'], df['BB_lower'], color='#c8d6e5', alpha=0.3)
-            ax1.set_title(f'{hisse_kodu} Fiyat Grafiği ({periyot})', fontsize=14, pad=15)
-            ax1.set_ylabel('Fiyat (TL)', fontsize=10)
-            ax1.legend(loc='upper left', fontsize=9)
-            ax1.grid(True, linestyle='--', alpha=0.7)
-
-            # RSI grafiği (ax2)
-            ax2.plot(df.index, df['RSI'], label='RSI 14', color='#10ac84', linewidth=2)
-            ax2.axhline(70, color='#ff6b6b', linestyle='--', linewidth=1)
-            ax2.axhline(30, color='#1dd1a1', linestyle='--', linewidth=1)
-            ax2.set_title('RSI (14)', fontsize=12, pad=15)
-            ax2.set_ylabel('RSI', fontsize=10)
-            ax2.set_ylim(0, 100)
-            ax2.legend(loc='upper left', fontsize=9)
-            ax2.grid(True, linestyle='--', alpha=0.7)
-
-            # MACD grafiği (ax3)
-            ax3.plot(df.index, df['MACD'], label='MACD', color='#9c88ff', linewidth=1.5)
-            ax3.plot(df.index, df['MACD_signal'], label='Sinyal', color='#f368e0', linewidth=1.5)
-            ax3.bar(df.index, df['MACD'] - df['MACD_signal'], label='Histogram', 
-                   color=np.where(df['MACD'] > df['MACD_signal'], '#2ecc71', '#e74c3c'), alpha=0.5)
-            ax3.set_title('MACD (12,26,9)', fontsize=12, pad=15)
-            ax3.legend(loc='upper left', fontsize=9)
-            ax3.grid(True, linestyle='--', alpha=0.7)
-
-            # Hacim grafiği (ax4)
-            ax4.bar(df.index, df['Volume']/1000000, color='#3498db', alpha=0.7)
-            ax4.set_title('Hacim (Milyon)', fontsize=12, pad=15)
-            ax4.set_ylabel('Hacim (M)')
-            ax4.grid(True, linestyle='--', alpha=0.5)
-
-            plt.tight_layout()
-
-            grafik_pencere = tk.Toplevel()
-            grafik_pencere.title(f"{hisse_kodu} Teknik Grafik - {periyot}")
-            grafik_pencere.geometry("1200x900")
-
-            canvas = FigureCanvasTkAgg(fig, master=grafik_pencere)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-            def on_close():
-                plt.close(fig)
-                grafik_pencere.destroy()
-
-            grafik_pencere.protocol("WM_DELETE_WINDOW", on_close)
+    def _grafik_ciz(self, hisse_kodu, periyot, ham_df, df):
+        """Arka planda hazırlanan veriyle çizgi grafiği ana iş parçacığında çizer.
+
+        Aynı hisse için pencere açıksa yeni pencere ve figür kurulmaz, mevcut
+        grafiğin verisi değiştirilir.
+        """
+        if ham_df.empty or len(ham_df) < 5:
+            messagebox.showerror("Hata", "Yeterli veri bulunamadı")
+            return
+        if df is None:
+            messagebox.showerror("Hata", "Teknik analiz yapılamadı")
+            return
+
+        key = ('teknik', hisse_kodu)
+        try:
+            chart = self.charts.get(key)
+            if chart is None:
+                grafik_pencere = tk.Toplevel()
+                grafik_pencere.geometry("1200x900")
+                chart = self.charts.create(key, grafik_pencere, figsize=(14, 10), style='ggplot',
+                                           facecolor=BG_COLOR)
+                chart.add_toolbar()
+                chart.view = TechnicalChart(chart)
+            chart.master.title(f"{hisse_kodu} Teknik Grafik - {periyot}")
+            chart.view.set_data(df, f'{hisse_kodu} Fiyat Grafiği ({periyot})')
+            chart.master.lift()
 
         except Exception as e:
             messagebox.showerror("Hata", f"Grafik oluşturulamadı:\n{str(e)}")
@@ -1097,10 +1309,16 @@ class BistAnalizUygulamasi:
             messagebox.showwarning("Uyarı", "Lütfen bir hisse kodu seçin")
             return
 
-        try:
-            hisse = yf.Ticker(f"{hisse_kodu}.IS")
-            df = hisse.history(period=periyot)
+        ohlcv = self.ohlcv
+        self.executor.submit(lambda: ohlcv.history(hisse_kodu, periyot),
+                             on_done=lambda df: self._mum_grafigi_ciz(hisse_kodu, periyot, df),
+                             on_error=lambda e: messagebox.showerror("Hata", f"Mum grafiği oluşturulamadı:\n{str(e)}"))
 
+    def _mum_grafigi_ciz(self, hisse_kodu, periyot, df):
+        """Arka planda indirilen veriyle mum grafiğini ana iş parçacığında çizer"""
+        import pandas as pd
+
+        try:
             if df.empty or len(df) < 5:
                 messagebox.showerror("Hata", "Yeterli veri bulunamadı")
                 return
@@ -1108,50 +1326,50 @@ class BistAnalizUygulamasi:
             df.index = pd.to_datetime(df.index)
             df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
 
-            grafik_pencere = tk.Toplevel()
-            grafik_pencere.title(f"{hisse_kodu} Mum Grafiği - {periyot}")
-            grafik_pencere.geometry("1100x850")
-
-            # Renk ve stil
-            mc = mpf.make_marketcolors(
-                up='#2ecc71', down='#e74c3c',
-                wick={'up':'#2ecc71', 'down':'#e74c3c'},
-                edge={'up':'#2ecc71', 'down':'#e74c3c'},
-                volume='#3498db'
-            )
-            s = mpf.make_mpf_style(marketcolors=mc, gridstyle='--', gridcolor='#dddddd')
-
-            # Mum grafiğini çiz, fig ve axes döner
-            fig, axes = mpf.plot(df,
-                    type='candle',
-                    style=s,
-                    title=f'\n{hisse_kodu} Mum Grafiği ({periyot})',
-                    ylabel='Fiyat (TL)',
-                    volume=True,
-                    mav=(20, 50, 200),
-                    tight_layout=True,
-                    returnfig=True,
-                    warn_too_much_data=10000,
-                    update_width_config=dict(
-                        candle_linewidth=1.0,
-                        candle_width=0.8,
-                        volume_linewidth=1.0
-                    ))
-
-            canvas = FigureCanvasTkAgg(fig, master=grafik_pencere)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-            def on_close():
-                plt.close(fig)
-                grafik_pencere.destroy()
-
-            grafik_pencere.protocol("WM_DELETE_WINDOW", on_close)
+            key = ('mum', hisse_kodu)
+            chart = self.charts.get(key)
+            if chart is None:
+                grafik_pencere = tk.Toplevel()
+                grafik_pencere.geometry("1100x850")
+                chart = self.charts.create(key, grafik_pencere, figsize=(11, 8.5))
+                chart.add_toolbar()
+                chart.view = CandleChart(chart, mav=(20, 50, 200))
+                # Canlı mod kaç kez açılıp kapanırsa kapansın pencere bağları bir kez kurulur
+                self.executor.bind_window(grafik_pencere)
+                grafik_pencere.bind("<Destroy>", lambda event, w=grafik_pencere:
+                                    self.quotes.unsubscribe(w) if event.widget is w else None, add="+")
+
+                # Canlı mod: fiyat servisine abone olup son mumu yerinde günceller
+                kontrol = tk.Frame(grafik_pencere)
+                kontrol.pack(side=tk.TOP, fill=tk.X, before=chart.widget)
+                canli_var = tk.BooleanVar(value=False)
+                ttk.Checkbutton(kontrol, text="Canlı", variable=canli_var,
+                                command=lambda: self._canli_mum(chart, hisse_kodu, canli_var.get())
+                                ).pack(side=tk.LEFT, padx=10, pady=5)
+            chart.master.title(f"{hisse_kodu} Mum Grafiği - {periyot}")
+            chart.view.set_data(df, f'{hisse_kodu} Mum Grafiği ({periyot})')
+            chart.master.lift()
 
         except Exception as e:
             messagebox.showerror("Hata", f"Mum grafiği oluşturulamadı:\n{str(e)}")
 
 
+    def _canli_mum(self, chart, hisse_kodu, canli):
+        """Mum penceresini fiyat servisine abone yapar ya da aboneliği kaldırır"""
+        pencere = chart.master
+        if not canli:
+            self.quotes.unsubscribe(pencere)
+            return
+
+        def on_quotes(snapshot):
+            quote = snapshot.get(hisse_kodu)
+            if quote and chart.view is not None:
+                chart.view.apply_quote(quote)
+
+        self.quotes.subscribe(pencere, lambda: [hisse_kodu], on_quotes)
+        on_quotes(self.quotes.snapshot)
+        self.request_quotes(pencere, [hisse_kodu])
+
     def analiz_et(self):
         hisse_kodu = self.hisse_var.get().strip().upper()
         periyot = self.periyot_var.get()
@@ -1160,114 +1378,28 @@ class BistAnalizUygulamasi:
             messagebox.showwarning("Uyarı", "Lütfen bir hisse kodu seçin")
             return
 
-        try:
-            hisse = yf.Ticker(f"{hisse_kodu}.IS")
-            df = hisse.history(period=periyot)
+        from analysis_core import analiz_verisi
 
-            if df.empty or len(df) < 10:
-                messagebox.showerror("Hata", f"Yeterli veri bulunamadı (en az 10 iş günü gereklidir)\nSeçilen periyot: {periyot}")
-                return
+        # Önceki analiz henüz bitmediyse sonucu artık gösterilmez
+        self.executor.cancel_owner("analiz")
+        # Temel veriler fiyat geçmişiyle eşzamanlı olarak çekilir
+        self.executor.submit(analiz_verisi, hisse_kodu, periyot, self.ohlcv, self.info_cache,
+                             owner="analiz",
+                             on_done=lambda sonuc: self._analiz_goster(hisse_kodu, periyot, *sonuc),
+                             on_error=lambda e: messagebox.showerror("Hata", f"Analiz yapılamadı:\n{str(e)}"))
 
-            df = self.teknik_analiz(df)
-            if df is None:
-                messagebox.showerror("Hata", "Teknik analiz yapılamadı")
-                return
+    def _analiz_goster(self, hisse_kodu, periyot, ham_df, df, temel):
+        """Arka planda hazırlanan analiz verisinden raporu oluşturup gösterir"""
+        if ham_df.empty or len(ham_df) < 10:
+            messagebox.showerror("Hata", f"Yeterli veri bulunamadı (en az 10 iş günü gereklidir)\nSeçilen periyot: {periyot}")
+            return
+        if df is None:
+            messagebox.showerror("Hata", "Teknik analiz yapılamadı")
+            return
 
-            son_fiyat = df['Close'].iloc[-1]
-            onceki_fiyat = df['Close'].iloc[-2] if len(df) > 1 else son_fiyat
-            daily_change = son_fiyat - onceki_fiyat
-            percent_change = (son_fiyat/onceki_fiyat-1)*100
-
-            son = df.iloc[-1]
-            temel = self.temel_analiz(hisse_kodu)
-
-            # Analiz raporu oluştur
-            analiz = f"""
-📈 {hisse_kodu.upper()}.IS ANALİZ RAPORU - {datetime.now().strftime('%d.%m.%Y %H:%M')}
-{'='*80}
-
-🔹 FİYAT VE HACİM BİLGİLERİ ({periyot}):
-   • Son Fiyat: {son_fiyat:.2f} TL
-   • Günlük Değişim: {daily_change:+.2f} TL ({percent_change:+.2f}%)
-   • Ortalama Fiyat: {df['Close'].mean():.2f} TL
-   • Ortalama Hacim: {df['Volume'].mean()/1000000:.2f} M
-   • Son Hacim: {df['Volume'].iloc[-1]/1000000:.2f} M
-   • En Yüksek Fiyat: {df['Close'].max():.2f} TL
-   • En Düşük Fiyat: {df['Close'].min():.2f} TL
-   • En Yüksek Hacim: {df['Volume'].max()/1000000:.2f} M
-   • Volatilite: {(df['Close'].max() - df['Close'].min())/df['Close'].mean()*100:.2f}%
-
-📊 TEKNİK GÖSTERGELER:
-   • RSI (14): {son['RSI']:.2f} {"(Aşırı Alım ⚠)" if son['RSI'] > 70 else "(Aşırı Satım ⚠)" if son['RSI'] < 30 else ""}
-   • MACD: {son['MACD']:.2f} {"(Yukarı)" if son['MACD'] > son['MACD_signal'] else "(Aşağı)"}
-   • MACD Sinyal: {son['MACD_signal']:.2f}
-   • EMA 20: {son['EMA_20']:.2f} {"(Üstünde ▲)" if son['Close'] > son['EMA_20'] else "(Altında ▼)"}
-   • SMA 50: {son['SMA_50']:.2f} {"(Üstünde ▲)" if son['Close'] > son['SMA_50'] else "(Altında ▼)"}
-   • EMA 200: {son['EMA_200']:.2f} {"(Üstünde ▲)" if son['Close'] > son['EMA_200'] else "(Altında ▼)"}
-   • Bollinger Band: {"(Üst Band)" if son['Close'] > son['BB_upper'] else "(Alt Band)" if son['Close'] < son['BB_lower'] else "(Orta Band)"}
-   • OBV: {son['OBV']/1000000:+.2f} M
-   • Hacim Ortalama/Şimdi: {df['Volume'].mean()/1000000:.1f}M/{son['Volume']/1000000:.1f}M
-"""
-            # Temel analiz ekle
-            if temel:
-                analiz += f"""
-💰 TEMEL GÖSTERGELER:
-   • Piyasa Değeri: {temel.get('Piyasa Değeri', 'N/A')}
-   • F/K: {temel.get('F/K', 'N/A')}
-   • FD/FAVÖK: {temel.get('FD/FAVÖK', 'N/A')}
-   • Temettu Verimi: {temel.get('Temettu Verimi', 'N/A')}
-   • Son Çeyrek Kâr: {temel.get('Son Çeyrek Kâr', 'N/A')}
-   • 52 Hafta En Yüksek: {temel.get('52 Hafta En Yüksek', 'N/A')}
-   • 52 Hafta En Düşük: {temel.get('52 Hafta En Düşük', 'N/A')}
-
-"""
-            else:
-                analiz += "\n⚠ Temel analiz verileri alınamadı\n"
-
-            # Sinyal analizi
-            analiz += "\n💡 GENEL DEĞERLENDİRME:\n"
-            buy_signal = 0
-
-            # Al sinyalleri
-            if son['RSI'] < 35: buy_signal += 1
-            if son['MACD'] > son['MACD_signal']: buy_signal += 1
-            if son['Close'] > son['EMA_20']: buy_signal += 1
-            if son['Close'] > son['SMA_50']: buy_signal += 1
-            if son['Close'] > son['EMA_200']: buy_signal += 1
-            if son['Close'] < son['BB_lower']: buy_signal += 1
-
-            # Sinyal analizine hacim kontrolü ekleyin
-            if son['Volume'] > df['Volume'].mean() * 1.5:  # Ortalamanın 1.5 katından fazla hacim:
-                buy_signal += 1
-                analiz += "\n   • Yüksek Hacim: Alım satım ilgisinde artış"
-
-            if buy_signal >= 4:
-                analiz += "   • GÜÇLÜ AL SİNYALİ (Çoğunlukla olumlu göstergeler)"
-            elif buy_signal >= 2:
-                analiz += "   • Orta seviye al sinyali (Bazı olumlu göstergeler)"
-            elif buy_signal == 1:
-                analiz += "   • Zayıf al sinyali (Sınırlı olumlu gösterge)"
-            else:
-                analiz += "   • Satış baskısı (Olumsuz göstergeler hakim)"
-
-            # AI analizini al
-            stock_data = {
-                'son_fiyat': son_fiyat,
-                'RSI': son['RSI'],
-                'MACD': son['MACD'],
-                'MACD_signal': son['MACD_signal'],
-                'EMA_20': son['EMA_20'],
-                'Volume': son['Volume']
-            }
-
-            ai_analysis = self.ai_analyzer.analyze_stock(stock_data, temel)
-
-            if 'error' not in ai_analysis:
-                analiz += "\n\n🤖 YAPAY ZEKA ANALİZLERİ:\n"
-                for uzman, yorum in ai_analysis.items():
-                    analiz += f"\n📊 {yorum}"
-            else:
-                analiz += f"\n\n⚠️ YAPAY ZEKA ANALİZİ ALINAMADI:\n{ai_analysis['error']}"
+        try:
+            from analysis_core import analiz_raporu
+            analiz = analiz_raporu(hisse_kodu, periyot, df, temel, self.ai_analyzer)
 
             # Sonuçları göster
             self.text_output.config(state=tk.NORMAL)
@@ -1329,19 +1461,24 @@ class BistAnalizUygulamasi:
         depth_window = tk.Toplevel(self.root)
         depth_window.title(f"{hisse_kodu} Derinlik Analizi")
         depth_window.geometry("800x600")
-        
+
+        # Pencere kendi zamanlayıcısıyla yarım saniyede bir yalnızca değişen satırları günceller
         from depth_analysis import DepthAnalysisApp
-        DepthAnalysisApp(depth_window, hisse_kodu)
+        # Sağlayıcı olayları tek tüketici içindir; her pencere kendi sağlayıcısını alır ve kapanınca kapatır
+        DepthAnalysisApp(depth_window, hisse_kodu, interval_ms=500,
+                         provider=self.provider.depth(price_func=self.quotes.get_price))
 
-        def auto_update():
-            """Her 30 saniyede bir derinlik verilerini günceller"""
-            if depth_window.winfo_exists():
-                DepthAnalysisApp(depth_window, hisse_kodu)
-                depth_window.after(30000, auto_update)
-                
-        depth_window.after(30000, auto_update)
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="BIST Analiz Uygulaması")
+    parser.add_argument('--replay', metavar='KLASÖR',
+                        help="Canlı veri yerine kaydedilmiş oturumu oynat (data_providers.record_session çıktısı)")
+    parser.add_argument('--speed', type=float, default=1.0, help="Tekrar oynatma hızı (ör. 100 = 100x)")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = BistAnalizUygulamasi(root)
-    root.mainloop()
\ No newline at end of file
+    app = BistAnalizUygulamasi(root, provider=ReplayProvider(args.replay, speed=args.speed) if args.replay else None)
+    root.mainloop()
+    app.executor.shutdown()
@@ -6,7 +6,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # borsa.PRELOAD_MODULES importlib ile yüklendiği için analizde görünmez
+    hiddenimports=['ohlcv_cache', 'info_cache', 'indicators', 'screener', 'analysis_core', 'ai_analysis'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
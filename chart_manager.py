@@ -0,0 +1,595 @@
+import tkinter as tk
+from contextlib import contextmanager
+
+from perf import span, timed
+
+
+class Chart:
+    """Bir pencereye bağlı tek matplotlib figürü ve adlandırılmış çizim öğeleri.
+
+    Figür pyplot yerine doğrudan ``matplotlib.figure.Figure`` ile kurulur;
+    böylece pyplot'un küresel figür listesinde birikmez ve pencere kapanınca
+    çöp toplayıcıya bırakılır. Güncellemelerde öğeler yeniden oluşturulmaz,
+    ``set_data``/yükseklik/açı değiştirilir. Eksen sınırları değişmiyorsa
+    yalnızca ``animated`` öğeler önceden kopyalanan arka plan üzerine blit
+    edilir; değişiyorsa tek bir ``draw_idle`` yapılır.
+    """
+
+    def __init__(self, master, figsize=(8, 6), style=None, facecolor=None):
+        from matplotlib.figure import Figure
+
+        self.master = master
+        self.style = style
+        self.artists = {}
+        # Pencereye özgü çizim nesnesi (TechnicalChart, CandleChart); yenilemede yeniden kullanılır
+        self.view = None
+        self._background = None
+        with self.styled():
+            self.figure = Figure(figsize=figsize, facecolor=facecolor)
+        if master is None:
+            # Pencere yok: ekran dışı Agg canvas (ölçümler ve dışa aktarma için)
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+            self.canvas = FigureCanvasAgg(self.figure)
+            self.widget = None
+        else:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+            self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+            self.widget = self.canvas.get_tk_widget()
+            self.widget.pack(fill=tk.BOTH, expand=True)
+        # draw_idle ile ertelenen tam çizimler de ölçülsün diye örnek üzerinde sarılır
+        self.canvas.draw = timed('chart.draw')(self.canvas.draw)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add_toolbar(self):
+        """Yakınlaştırma/kaydırma araç çubuğunu canvas'ın altına ekler"""
+        from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
+
+        toolbar = NavigationToolbar2Tk(self.canvas, self.master, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(side=tk.BOTTOM, fill=tk.X, before=self.widget)
+        return toolbar
+
+    @contextmanager
+    def styled(self):
+        """Stili küresel ``plt.style.use`` yerine yalnızca bu figürün öğeleri kurulurken uygular"""
+        if self.style is None:
+            yield
+            return
+        import matplotlib.style
+        with matplotlib.style.context(self.style):
+            yield
+
+    def add(self, name, artist, animated=False):
+        """Öğeyi adıyla kaydeder; ``animated`` öğeler blit ile ayrıca çizilir"""
+        if animated:
+            for a in self._flatten(artist):
+                a.set_animated(True)
+        self.artists[name] = artist
+        return artist
+
+    def replace(self, name, artist):
+        """Boyutu değişen öğeyi (çubuk dizisi, dolgu) eskisini eksenden kaldırarak değiştirir"""
+        old = self.artists.get(name)
+        if old is not None:
+            old.remove()
+        return self.add(name, artist)
+
+    def set_line(self, name, x, y):
+        self.artists[name].set_data(x, y)
+
+    def set_bars(self, name, ax, x, heights, width=0.8, colors=None, **kwargs):
+        """Çubukları tek bir PolyCollection olarak çizer ve sonraki çağrılarda köşeleri yerinde günceller.
+
+        ``ax.bar`` her çubuk için ayrı bir Rectangle kurar; yüzlerce çubukta hem
+        kurulum hem sınır hesabı yavaşlar. ``x`` sayısal olmalıdır (tarihler
+        için ``matplotlib.dates.date2num``); ``kwargs`` ilk kurulumda
+        PolyCollection'a geçirilir.
+        """
+        import numpy as np
+
+        verts = _box_verts(np.asarray(x, dtype=float), width, 0.0,
+                           np.nan_to_num(np.asarray(heights, dtype=float)))
+
+        bars = self.artists.get(name)
+        if bars is None:
+            from matplotlib.collections import PolyCollection
+
+            with self.styled():
+                bars = PolyCollection(verts, **kwargs)
+            ax.add_collection(bars, autolim=False)
+            self.artists[name] = bars
+        else:
+            bars.set_verts(verts)
+        if colors is not None:
+            bars.set_facecolor(colors)
+        return bars
+
+    def set_pie(self, name, values, labels, colors=None, autopct='%1.1f%%', startangle=90):
+        """Pasta dilimlerini yerinde günceller; sembol listesi değişirse dilimleri yeniden kurar"""
+        import numpy as np
+
+        ax, wedges, texts, autotexts = self.artists.get(name) or (None, (), (), ())
+        if ax is None or [t.get_text() for t in texts] != list(labels):
+            ax = ax or self.figure.gca()
+            for artist in (*wedges, *texts, *autotexts):
+                artist.remove()
+            with self.styled():
+                wedges, texts, autotexts = ax.pie(values, labels=labels, colors=colors,
+                                                  autopct=autopct, startangle=startangle)
+            self.artists[name] = (ax, wedges, texts, autotexts)
+            return
+
+        values = np.asarray(values, dtype=float)
+        total = values.sum()
+        if not total:
+            return
+        # ax.pie ile aynı yerleşim: saat yönünün tersine, ``startangle``dan başlayarak
+        bounds = startangle + 360 * np.concatenate(([0], np.cumsum(values / total)))
+        for i, wedge in enumerate(wedges):
+            theta1, theta2 = bounds[i], bounds[i + 1]
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+            mid = np.deg2rad((theta1 + theta2) / 2)
+            x, y = np.cos(mid), np.sin(mid)
+            texts[i].set_position((1.1 * x, 1.1 * y))
+            texts[i].set_horizontalalignment('left' if x > 0 else 'right')
+            autotexts[i].set_position((0.6 * x, 0.6 * y))
+            autotexts[i].set_text(autopct % (values[i] / total * 100))
+
+    def redraw(self, rescale=(), blit=False):
+        """Değişiklikleri ekrana yansıtır.
+
+        ``rescale`` verilen eksenlerin sınırlarını veriye göre yeniden hesaplar
+        (tam çizim gerekir). ``blit`` True ise ve arka plan hazırsa yalnızca
+        animated öğeler yeniden çizilir.
+        """
+        for ax in rescale:
+            self.autoscale(ax)
+        if blit and not rescale and self._background is not None:
+            with span('chart.blit'):
+                self.canvas.restore_region(self._background)
+                self._draw_animated()
+                self.canvas.blit(self.figure.bbox)
+        else:
+            self.canvas.draw_idle()
+
+    def autoscale(self, ax, scalex=True):
+        """Eksen sınırlarını çizgi ve koleksiyonların güncel verisine göre yeniden hesaplar"""
+        import numpy as np
+
+        # relim koleksiyonları (çubuklar, dolgular) hesaba katmaz; sınırları ayrıca eklenir
+        ax.relim()
+        for artist in ax.collections:
+            points = artist.get_datalim(ax.transData).get_points()
+            if np.isfinite(points).all():
+                ax.update_datalim(points)
+        ax.autoscale_view(scalex=scalex)
+
+    def _on_draw(self, event):
+        # Tam çizimden sonra animated öğeler olmadan arka plan saklanır
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self.artists.values():
+            for a in self._flatten(artist):
+                if getattr(a, 'get_animated', lambda: False)() and a.axes is not None:
+                    self.figure.draw_artist(a)
+
+    @staticmethod
+    def _flatten(artist):
+        # BarContainer ve ax.pie sonuçları demet olarak tutulur
+        if isinstance(artist, (tuple, list)):
+            return [a for item in artist for a in Chart._flatten(item)]
+        return [artist]
+
+    def close(self):
+        """Figürü boşaltır ve canvas widget'ını kaldırır"""
+        self.artists.clear()
+        self.view = None
+        self._background = None
+        self.figure.clear()
+        if self.widget is not None:
+            self.widget.destroy()
+
+
+def _box_verts(x, width, bottom, top):
+    """Merkezleri ``x`` olan dikdörtgenlerin köşeleri, PolyCollection için (n, 4, 2)"""
+    import numpy as np
+
+    left, right = x - width / 2, x + width / 2
+    bottom = np.broadcast_to(bottom, np.shape(top))
+    return np.stack([np.column_stack(corner) for corner in
+                     ((left, bottom), (left, top), (right, top), (right, bottom))], axis=1)
+
+
+def _bucket_layout(x, starts, step):
+    """Birleştirilmiş kovaların merkezleri ve bar genişliği cinsinden boyları"""
+    import numpy as np
+
+    counts = np.diff(np.append(starts, len(x)))
+    return x[starts] + (counts - 1) * step / 2, counts * step
+
+
+class TechnicalChart:
+    """Fiyat ve ortalamalar, RSI, MACD ve hacimden oluşan 2×2 teknik grafik.
+
+    Tam veri saklanır, ekrana yalnızca görünür aralık eksen genişliğindeki
+    piksel sayısı kadar noktaya indirilerek çizilir: çizgiler LTTB ile,
+    Bollinger bandı kova başına en geniş zarfla, MACD histogramı ve hacim kova
+    birleştirmeyle. Yakınlaştırınca ayrıntı yeniden örneklenerek geri gelir.
+    """
+
+    LINES = (('close', 'Close'), ('ema20', 'EMA_20'), ('sma50', 'SMA_50'), ('ema200', 'EMA_200'),
+             ('rsi', 'RSI'), ('macd', 'MACD'), ('signal', 'MACD_signal'))
+    COLUMNS = ('Close', 'EMA_20', 'SMA_50', 'EMA_200', 'BB_upper', 'BB_lower', 'RSI', 'MACD', 'MACD_signal',
+               'Volume')
+
+    def __init__(self, chart):
+        from downsample import ZoomResampler
+
+        self.chart = chart
+        self.x = None
+        self.data = {}
+        with chart.styled():
+            (ax1, ax2), (ax3, ax4) = chart.figure.subplots(
+                2, 2, sharex=True, gridspec_kw={'height_ratios': [2, 1], 'width_ratios': [3, 1]})
+            # Veri sonradan set_data ile geldiğinden tarih ekseni baştan belirtilir
+            for ax in (ax1, ax2, ax3, ax4):
+                ax.xaxis_date()
+                ax.tick_params(labelbottom=True)
+
+            # Fiyat grafiği (ax1)
+            chart.add('close', ax1.plot([], [], label='Kapanış', color='#2e86de', linewidth=2)[0])
+            chart.add('ema20', ax1.plot([], [], label='EMA 20', linestyle='--', color='#ff9f43')[0])
+            chart.add('sma50', ax1.plot([], [], label='SMA 50', linestyle=':', color='#5f27cd')[0])
+            chart.add('ema200', ax1.plot([], [], label='EMA 200', linestyle='-.', color='#ff6b6b')[0])
+            ax1.set_ylabel('Fiyat (TL)', fontsize=10)
+            ax1.grid(True, linestyle='--', alpha=0.7)
+
+            # RSI grafiği (ax2)
+            chart.add('rsi', ax2.plot([], [], label='RSI 14', color='#10ac84', linewidth=2)[0])
+            ax2.axhline(70, color='#ff6b6b', linestyle='--', linewidth=1)
+            ax2.axhline(30, color='#1dd1a1', linestyle='--', linewidth=1)
+            ax2.set_title('RSI (14)', fontsize=12, pad=15)
+            ax2.set_ylabel('RSI', fontsize=10)
+            ax2.set_ylim(0, 100)
+            ax2.grid(True, linestyle='--', alpha=0.7)
+
+            # MACD grafiği (ax3)
+            chart.add('macd', ax3.plot([], [], label='MACD', color='#9c88ff', linewidth=1.5)[0])
+            chart.add('signal', ax3.plot([], [], label='Sinyal', color='#f368e0', linewidth=1.5)[0])
+            ax3.set_title('MACD (12,26,9)', fontsize=12, pad=15)
+            ax3.grid(True, linestyle='--', alpha=0.7)
+
+            # Hacim grafiği (ax4)
+            ax4.set_title('Hacim (Milyon)', fontsize=12, pad=15)
+            ax4.set_ylabel('Hacim (M)')
+            ax4.grid(True, linestyle='--', alpha=0.5)
+        self.axes = (ax1, ax2, ax3, ax4)
+        self.resampler = ZoomResampler(ax1, [], self.render, widget=chart.widget)
+
+    @timed('chart.technical.set_data')
+    def set_data(self, df, title):
+        """Yeni veriyi tüm aralık görünecek şekilde çizer"""
+        import matplotlib.dates as mdates
+
+        ax1, ax2, ax3, ax4 = self.axes
+        first = self.x is None
+        self.x = mdates.date2num(df.index)
+        self.data = {column: df[column].to_numpy(dtype=float) for column in self.COLUMNS}
+        ax1.set_title(title, fontsize=14, pad=15)
+        self.resampler.set_x(self.x)
+        self.resampler.refresh(full=True)
+        if first:
+            for ax in (ax1, ax2, ax3):
+                ax.legend(loc='upper left', fontsize=9)
+            self.chart.figure.tight_layout()
+        self.chart.redraw(rescale=self.axes)
+
+    def render(self, i0, i1, n_points):
+        import numpy as np
+
+        from downsample import bucket_extremes, bucket_starts, lttb
+
+        chart = self.chart
+        ax1, ax2, ax3, ax4 = self.axes
+        x = self.x[i0:i1]
+        data = {column: values[i0:i1] for column, values in self.data.items()}
+        for name, column in self.LINES:
+            chart.set_line(name, *lttb(x, data[column], n_points))
+
+        starts = bucket_starts(len(x), n_points)
+        step = float(np.median(np.diff(x))) if len(x) > 1 else 1.0
+        centers, spans = _bucket_layout(x, starts, step)
+        with chart.styled():
+            chart.replace('bollinger', ax1.fill_between(
+                centers, np.fmax.reduceat(data['BB_upper'], starts), np.fmin.reduceat(data['BB_lower'], starts),
+                color='#c8d6e5', alpha=0.3))
+        histogram = bucket_extremes(data['MACD'] - data['MACD_signal'], starts)
+        chart.set_bars('histogram', ax3, centers, histogram, width=0.8 * spans, label='Histogram', alpha=0.5,
+                       colors=np.where(histogram > 0, '#2ecc71', '#e74c3c'))
+        volume = np.add.reduceat(np.nan_to_num(data['Volume']), starts) / 1000000
+        chart.set_bars('volume', ax4, centers, volume, width=0.8 * spans, facecolor='#3498db', alpha=0.7)
+        # y ekseni görünür aralığa göre ölçeklenir; hacimde kova toplamı çözünürlükle değişir
+        chart.autoscale(ax1, scalex=False)
+        chart.autoscale(ax3, scalex=False)
+        ax4.set_ylim(0, float(volume.max()) * 1.05 or 1)
+
+
+class CandleChart:
+    """Fiyat ve hacim panelli mum grafiği; mplfinance yerine koleksiyonlarla çizilir.
+
+    Gövdeler tek bir PolyCollection, fitiller tek bir LineCollection olarak bir
+    kez kurulur. Görünür aralık eksen genişliğine sığacak sayıda muma
+    birleştirilir (en yüksek/en düşük korunur) ve yakınlaştırınca yeniden
+    örneklenir. x ekseni bar sırasıdır; hafta sonu ve gece boşlukları
+    görünmez, etiketler tarihlerden üretilir.
+
+    Canlı modda ``apply_quote`` son mumu günceller ya da yeni mum ekler.
+    Oluşmakta olan son mum ve ortalamaların son parçası ayrı ``animated``
+    öğelerdir; fiyat eksen sınırları içinde kaldıkça yalnızca bunlar blit
+    edilir. Veriler kapasitesi ikiye katlanarak büyüyen dizilerde tutulur,
+    ortalamalar ``RollingWindow`` ile sabit maliyetle güncellenir.
+    """
+
+    MAV_COLORS = ('#ff9f43', '#5f27cd', '#ff6b6b')
+
+    def __init__(self, chart, mav=(20, 50, 200), up='#2ecc71', down='#e74c3c', volume='#3498db'):
+        from matplotlib.collections import LineCollection, PolyCollection
+        from matplotlib.ticker import FuncFormatter
+
+        from downsample import ZoomResampler
+
+        self.chart = chart
+        self.mav = mav
+        self.up, self.down = up, down
+        self.dates = None
+        self.n = 0
+        self._live_start = None
+        with chart.styled():
+            self.ax, self.volume_ax = chart.figure.subplots(
+                2, 1, sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+            self.wicks = chart.add('wicks', LineCollection([], linewidths=1.0))
+            self.bodies = chart.add('bodies', PolyCollection([], linewidths=1.0))
+            self.volume = chart.add('volume', PolyCollection([], facecolor=volume))
+            self.live_wick = chart.add('live_wick', LineCollection([], linewidths=1.0), animated=True)
+            self.live_body = chart.add('live_body', PolyCollection([], linewidths=1.0), animated=True)
+            self.live_volume = chart.add('live_volume', PolyCollection([], facecolor=volume), animated=True)
+            for n, color in zip(mav, self.MAV_COLORS):
+                chart.add(f'mav{n}', self.ax.plot([], [], linewidth=1, color=color, label=f'MA {n}')[0])
+                chart.add(f'mav{n}_live', self.ax.plot([], [], linewidth=1, color=color)[0], animated=True)
+        for collection, ax in ((self.wicks, self.ax), (self.bodies, self.ax), (self.volume, self.volume_ax),
+                               (self.live_wick, self.ax), (self.live_body, self.ax),
+                               (self.live_volume, self.volume_ax)):
+            ax.add_collection(collection, autolim=False)
+        self.ax.set_ylabel('Fiyat (TL)')
+        self.volume_ax.set_ylabel('Hacim')
+        for ax in (self.ax, self.volume_ax):
+            ax.grid(True, linestyle='--', color='#dddddd')
+        self.ax.xaxis.set_major_formatter(FuncFormatter(self._format_x))
+        # Mum başına en az 3 piksel
+        self.resampler = ZoomResampler(self.ax, [], self.render, px_per_point=3, widget=chart.widget)
+
+    @timed('chart.candle.set_data')
+    def set_data(self, df, title):
+        """OHLCV verisini (DatetimeIndex) tüm aralık görünecek şekilde çizer"""
+        import numpy as np
+
+        from indicators import RollingWindow
+
+        first = self.dates is None
+        n = len(df)
+        self.dates = df.index
+        intraday = bool((df.index != df.index.normalize()).any())
+        self.date_format = '%d.%m %H:%M' if intraday else '%d.%m.%Y'
+
+        # Satırlar: Open, High, Low, Close, Volume ve her ortalama
+        self._buf = np.full((5 + len(self.mav), max(2 * n, 64)), np.nan)
+        self._buf[:5, :n] = df[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy(dtype=float).T
+        self._x = np.arange(self._buf.shape[1], dtype=float)
+        self.n = n
+        close = df['Close']
+        self.windows = []
+        for j, window in enumerate(self.mav):
+            self._buf[5 + j, :n] = close.rolling(window).mean().to_numpy()
+            rolling = RollingWindow(window)
+            for value in close.iloc[-window:]:
+                rolling.update(float(value))
+            self.windows.append(rolling)
+
+        self.ax.set_title(title)
+        self.resampler.set_x(self._x[:n])
+        self.resampler.refresh(full=True)
+        self.ax.set_xlim(-1, n)
+        if first:
+            self.ax.legend(loc='upper left', fontsize=9)
+            self.chart.figure.tight_layout()
+        self.chart.redraw()
+
+    def render(self, i0, i1, n_points):
+        import numpy as np
+
+        from downsample import aggregate_ohlcv, bucket_starts, lttb
+
+        x = self._x[i0:i1]
+        starts = bucket_starts(len(x), n_points)
+        centers, spans = _bucket_layout(x, starts, 1.0)
+        open_, high, low, close, volume = aggregate_ohlcv(*self._buf[:5, i0:i1], starts)
+
+        # Son bar görünüyorsa son kova canlı öğelerle ayrıca çizilir
+        live = i1 == self.n
+        self._live_start = i0 + int(starts[-1]) if live else None
+        k = len(starts) - 1 if live else len(starts)
+        end = i0 + int(starts[-1]) if live else i1
+
+        colors = np.where(close[:k] >= open_[:k], self.up, self.down)
+        self.bodies.set_verts(_box_verts(centers[:k], 0.8 * spans[:k], open_[:k], close[:k]))
+        self.bodies.set_facecolor(colors)
+        self.bodies.set_edgecolor(colors)
+        self.wicks.set_segments(np.stack([np.column_stack((centers[:k], low[:k])),
+                                          np.column_stack((centers[:k], high[:k]))], axis=1))
+        self.wicks.set_color(colors)
+        self.volume.set_verts(_box_verts(centers[:k], 0.8 * spans[:k], 0.0, volume[:k]))
+        for j, n in enumerate(self.mav):
+            self.chart.set_line(f'mav{n}', *lttb(self._x[i0:end], self._buf[5 + j, i0:end], n_points))
+        if live:
+            self._update_live()
+        else:
+            self._clear_live()
+
+        self.volume_ax.set_ylim(0, float(np.nanmax(volume)) * 1.1 or 1)
+        # Fiyat ekseni görünür mumların en düşük/en yükseğine göre ölçeklenir
+        self._fit_price(np.nanmin(low), np.nanmax(high))
+
+    @timed('chart.candle.live')
+    def apply_quote(self, quote):
+        """Canlı fiyatı uygular: aynı gün son mumu günceller, yeni günde mum ekler"""
+        import pandas as pd
+
+        if self.dates is None:
+            return
+        price = quote['price']
+        values = (quote.get('open', price), quote.get('high', price), quote.get('low', price), price,
+                  quote.get('volume', 0.0))
+        date = pd.Timestamp(quote['date'])
+        if date.date() > self.dates[-1].date():
+            self._append(date, values)
+        else:
+            self._set_last(values)
+
+    def _set_last(self, values):
+        n = self.n
+        self._buf[:5, n - 1] = values
+        for j, rolling in enumerate(self.windows):
+            rolling.update(values[3], new_bar=False)
+            self._buf[5 + j, n - 1] = rolling.mean()
+        if self._live_start is None:
+            return  # Son mum görünür aralıkta değil
+        low, high, volume = self._update_live()
+        bottom, top = self.ax.get_ylim()
+        if low < bottom or high > top or volume > self.volume_ax.get_ylim()[1]:
+            self._fit_price(min(low, bottom), max(high, top), margin=0)
+            self.volume_ax.set_ylim(0, max(volume * 1.1, self.volume_ax.get_ylim()[1]))
+            self.chart.redraw()
+        else:
+            self.chart.redraw(blit=True)
+
+    def _append(self, date, values):
+        import numpy as np
+
+        if self.n == self._buf.shape[1]:
+            grown = np.full((self._buf.shape[0], 2 * self.n), np.nan)
+            grown[:, :self.n] = self._buf
+            self._buf = grown
+            self._x = np.arange(grown.shape[1], dtype=float)
+        n = self.n
+        self._buf[:5, n] = values
+        for j, rolling in enumerate(self.windows):
+            rolling.update(values[3])
+            self._buf[5 + j, n] = rolling.mean()
+        self.n += 1
+
+        tz = self.dates.tz
+        if tz is not None:
+            date = date.tz_localize(tz) if date.tzinfo is None else date.tz_convert(tz)
+        elif date.tzinfo is not None:
+            date = date.tz_localize(None)
+        self.dates = self.dates.append(type(self.dates)([date]))
+
+        following = self._live_start is not None
+        self.resampler.set_x(self._x[:self.n])
+        if following:
+            # Son mumu izleyen görünüm bir bar kayar; xlim_changed yeniden örneklemeyi tetikler
+            xmin, xmax = self.ax.get_xlim()
+            self.ax.set_xlim(xmin + 1, xmax + 1)
+
+    def _update_live(self):
+        """Son kovayı canlı öğelere yazar; (en düşük, en yüksek, hacim) döndürür"""
+        import numpy as np
+
+        s, n = self._live_start, self.n
+        open_, close = self._buf[0, s], self._buf[3, n - 1]
+        high, low = np.nanmax(self._buf[1, s:n]), np.nanmin(self._buf[2, s:n])
+        volume = float(np.nansum(self._buf[4, s:n]))
+        center, span = np.array([(s + n - 1) / 2]), 0.8 * (n - s)
+        color = self.up if close >= open_ else self.down
+
+        self.live_body.set_verts(_box_verts(center, span, np.array([open_]), np.array([close])))
+        self.live_body.set_facecolor(color)
+        self.live_body.set_edgecolor(color)
+        self.live_wick.set_segments([[(center[0], low), (center[0], high)]])
+        self.live_wick.set_color(color)
+        self.live_volume.set_verts(_box_verts(center, span, 0.0, np.array([volume])))
+        for j, n_mav in enumerate(self.mav):
+            line = self.chart.artists[f'mav{n_mav}']
+            xs, ys = line.get_xdata(), line.get_ydata()
+            tail_x, tail_y = [n - 1], [self._buf[5 + j, n - 1]]
+            if len(xs):
+                tail_x.insert(0, xs[-1])
+                tail_y.insert(0, ys[-1])
+            self.chart.set_line(f'mav{n_mav}_live', tail_x, tail_y)
+        return low, high, volume
+
+    def _clear_live(self):
+        self.live_body.set_verts([])
+        self.live_wick.set_segments([])
+        self.live_volume.set_verts([])
+        for n in self.mav:
+            self.chart.set_line(f'mav{n}_live', [], [])
+
+    def _fit_price(self, low, high, margin=0.05):
+        pad = (high - low) * margin if high > low else 1
+        self.ax.set_ylim(low - pad, high + pad)
+
+    def _format_x(self, value, pos=None):
+        i = int(round(value))
+        if self.dates is None or not 0 <= i < len(self.dates):
+            return ''
+        return self.dates[i].strftime(self.date_format)
+
+
+class ChartManager:
+    """Anahtar başına tek grafik tutar; aynı pencere yenilendiğinde mevcut figür kullanılır.
+
+    Pencere (ya da grafiğin yerleştiği çerçeve) yok edildiğinde grafik
+    kapatılıp kayıttan silinir; ``create`` aynı anahtar için çağrılırsa eski
+    figür kapatılarak yenisi kurulur.
+    """
+
+    def __init__(self):
+        self.charts = {}
+
+    def get(self, key):
+        chart = self.charts.get(key)
+        if chart is not None and not chart.widget.winfo_exists():
+            self.close(key)
+            return None
+        return chart
+
+    def create(self, key, master, **kwargs):
+        self.close(key)
+        chart = self.charts[key] = Chart(master, **kwargs)
+
+        def on_destroy(event):
+            if event.widget is master and self.charts.get(key) is chart:
+                del self.charts[key]
+                chart.artists.clear()
+                chart.view = None
+                chart.figure.clear()
+
+        master.bind("<Destroy>", on_destroy, add="+")
+        return chart
+
+    def close(self, key):
+        chart = self.charts.pop(key, None)
+        if chart is not None and chart.widget.winfo_exists():
+            chart.close()
+        elif chart is not None:
+            chart.figure.clear()
+
+    def close_all(self):
+        for key in list(self.charts):
+            self.close(key)
@@ -0,0 +1,180 @@
+"""BIST analiz komut satırı arayüzü (tkinter/matplotlib yüklemeden çalışır).
+
+Örnekler:
+    python cli.py analyze THYAO GARAN --period 6mo --format json
+    python cli.py screen --period 1y --top 20 --format csv -o tarama.csv
+    python cli.py portfolio-valuation --db portfolio.db
+    python cli.py positions --rebuild
+    python cli.py import-statement ekstre.csv --db portfolio.db
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+
+def yaz(satirlar, bicim, cikti, metin=None):
+    """Satırları text/json/csv biçiminde dosyaya veya stdout'a yazar"""
+    if bicim == 'json':
+        icerik = json.dumps(satirlar, ensure_ascii=False, indent=2, default=str)
+    elif bicim == 'csv':
+        tampon = io.StringIO()
+        alanlar = list(dict.fromkeys(k for satir in satirlar for k in satir))
+        yazici = csv.DictWriter(tampon, fieldnames=alanlar)
+        yazici.writeheader()
+        yazici.writerows(satirlar)
+        icerik = tampon.getvalue()
+    else:
+        icerik = metin if metin is not None else '\n'.join(
+            '  '.join(f"{k}={v}" for k, v in satir.items()) for satir in satirlar)
+
+    if cikti:
+        with open(cikti, 'w', encoding='utf-8', newline='') as f:
+            f.write(icerik)
+    else:
+        sys.stdout.write(icerik.rstrip('\n') + '\n')
+
+
+def komut_analyze(args):
+    from ai_analysis import AIAnalyzer
+    from analysis_core import analiz_ozeti, analiz_raporu, analiz_verisi
+    from info_cache import InfoCache
+    from ohlcv_cache import OHLCVCache
+
+    ohlcv, info_cache, ai_analyzer = OHLCVCache(), InfoCache(), AIAnalyzer()
+    hisseler = [h.upper() for h in args.symbols]
+
+    def veri(hisse):
+        # Bir sembolün hatası diğerlerinin sonuçlarını düşürmesin
+        try:
+            return analiz_verisi(hisse, args.period, ohlcv, info_cache)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        veriler = list(pool.map(veri, hisseler))
+
+    satirlar, raporlar, hata = [], [], False
+    for hisse, sonuc in zip(hisseler, veriler):
+        if isinstance(sonuc, Exception):
+            print(f"{hisse}: {sonuc}", file=sys.stderr)
+            hata = True
+            continue
+        ham_df, df, temel = sonuc
+        if df is None:
+            print(f"{hisse}: yeterli veri bulunamadı ({args.period})", file=sys.stderr)
+            hata = True
+            continue
+        satirlar.append(analiz_ozeti(hisse, args.period, df, temel))
+        raporlar.append(analiz_raporu(hisse, args.period, df, temel, ai_analyzer))
+
+    yaz(satirlar, args.format, args.output, metin='\n'.join(raporlar))
+    return 1 if hata else 0
+
+
+def komut_screen(args):
+    from screener import piyasa_taramasi
+    from symbols import get_bist_hisse_listesi
+
+    tablo = piyasa_taramasi(args.symbols or get_bist_hisse_listesi(), period=args.period)
+    if args.top:
+        tablo = tablo.head(args.top)
+    satirlar = [{'Hisse': hisse, **satir} for hisse, satir in tablo.round(4).to_dict('index').items()]
+    yaz(satirlar, args.format, args.output, metin=tablo.to_string(float_format='{:.2f}'.format))
+    return 0
+
+
+def komut_portfolio_valuation(args):
+    from analysis_core import portfoy_degerlemesi
+    from portfolio import Portfolio
+    from quote_service import QuoteService
+
+    portfolio = Portfolio(args.db)
+    quotes = QuoteService()
+    snapshot = quotes.ensure([row[0] for row in portfolio.get_portfolio()])
+    satirlar = portfoy_degerlemesi(portfolio, snapshot)
+    yaz(satirlar, args.format, args.output)
+    return 0
+
+
+def komut_positions(args):
+    from portfolio import Portfolio
+
+    portfolio = Portfolio(args.db)
+    if args.rebuild:
+        portfolio.rebuild_positions()
+    hatalar = portfolio.verify_positions()
+    satirlar = [{'symbol': symbol,
+                 'ledger': list(beklenen) if beklenen else None,
+                 'positions': list(kayitli) if kayitli else None}
+                for symbol, beklenen, kayitli in hatalar]
+    metin = (f"{len(hatalar)} sembolde pozisyon tablosu işlem geçmişiyle uyuşmuyor "
+             "(düzeltmek için --rebuild)" if hatalar else "Pozisyon tablosu işlem geçmişiyle uyumlu")
+    yaz(satirlar, args.format, args.output, metin='\n'.join(
+        [metin] + [f"  {s['symbol']}: geçmiş={s['ledger']} tablo={s['positions']}" for s in satirlar]))
+    return 1 if hatalar else 0
+
+
+def komut_import_statement(args):
+    from statement_import import import_statement_file
+
+    sonuc = import_statement_file(args.file, args.db, chunk_size=args.chunk_size)
+    metin = '\n'.join([f"{sonuc['read']} satır okundu: {sonuc['inserted']} eklendi, "
+                       f"{sonuc['duplicates']} zaten kayıtlı, {sonuc['invalid']} geçersiz"]
+                      + [f"  {hata}" for hata in sonuc['errors']])
+    yaz([sonuc], args.format, args.output, metin=metin)
+    return 1 if sonuc['invalid'] else 0
+
+
+def parser_olustur():
+    parser = argparse.ArgumentParser(description="BIST analiz komut satırı arayüzü")
+    alt = parser.add_subparsers(dest='komut', required=True)
+
+    def ortak(p):
+        p.add_argument('--format', choices=['text', 'json', 'csv'], default='text')
+        p.add_argument('-o', '--output', help="Çıktı dosyası (varsayılan stdout)")
+
+    p = alt.add_parser('analyze', help="Bir veya daha fazla hisseyi analiz eder")
+    p.add_argument('symbols', nargs='+')
+    p.add_argument('--period', default='3mo')
+    p.add_argument('--workers', type=int, default=8)
+    ortak(p)
+    p.set_defaults(func=komut_analyze)
+
+    p = alt.add_parser('screen', help="Piyasa taraması yapar")
+    p.add_argument('symbols', nargs='*', help="Boşsa tüm BIST listesi")
+    p.add_argument('--period', default='1y')
+    p.add_argument('--top', type=int, default=0)
+    ortak(p)
+    p.set_defaults(func=komut_screen)
+
+    p = alt.add_parser('portfolio-valuation', help="Portföyü güncel fiyatlarla değerler")
+    p.add_argument('--db', default='portfolio.db')
+    ortak(p)
+    p.set_defaults(func=komut_portfolio_valuation)
+
+    p = alt.add_parser('positions', help="Pozisyon tablosunu işlem geçmişiyle doğrular")
+    p.add_argument('--db', default='portfolio.db')
+    p.add_argument('--rebuild', action='store_true', help="Doğrulamadan önce tabloyu yeniden oluşturur")
+    ortak(p)
+    p.set_defaults(func=komut_positions)
+
+    p = alt.add_parser('import-statement', help="Aracı kurum dökümünü (CSV/XLSX) portföye aktarır")
+    p.add_argument('file')
+    p.add_argument('--db', default='portfolio.db')
+    p.add_argument('--chunk-size', type=int, default=10000)
+    ortak(p)
+    p.set_defaults(func=komut_import_statement)
+
+    return parser
+
+
+def main(argv=None):
+    args = parser_olustur().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+
+from market_data import client
+from quote_service import download_batch
+from symbols import fetch_bist_hisse_listesi
+
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+class DataProvider(ABC):
+    """Piyasa verisi sağlayıcı arayüzü; arayüz kodu yalnızca bu yöntemleri kullanır.
+
+    * ``history(symbol, period=None, start=None)``: OHLCV DataFrame'i
+    * ``download(symbols, period)``: sembol -> son barlar (fiyat servisi için)
+    * ``info(symbol)``: temel veri sözlüğü (``Ticker.info`` alanları)
+    * ``symbol_list()``: BIST sembolleri, alınamazsa None
+    * ``depth(price_func)``: yeni bir ``depth_feed.DepthProvider`` (pencere başına bir tane)
+
+    ``cacheable`` False ise veri zaten yereldir; disk önbellekleri atlanır.
+    ``interval(ms)`` uygulama zamanlayıcılarının süresini sağlayıcının saatine
+    göre ölçekler.
+    """
+
+    cacheable = True
+
+    @abstractmethod
+    def history(self, symbol, period=None, start=None):
+        ...
+
+    @abstractmethod
+    def download(self, symbols, period="5d"):
+        ...
+
+    @abstractmethod
+    def info(self, symbol):
+        ...
+
+    @abstractmethod
+    def symbol_list(self):
+        ...
+
+    def depth(self, price_func=None):
+        from depth_feed import ReplayDepthProvider
+        return ReplayDepthProvider(price_func=price_func)
+
+    def interval(self, ms):
+        return ms
+
+
+class YahooProvider(DataProvider):
+    """Yahoo Finance (fiyat, geçmiş, temel veri) ve Asenax (sembol listesi) üzerinden canlı veri.
+
+    Tüm çağrılar paylaşılan ``market_data.client`` üzerinden geçer; derinlik
+    servisi olmadığından derinlik son fiyat etrafında üretilir.
+    """
+
+    def __init__(self, client=client):
+        self.client = client
+
+    def history(self, symbol, period=None, start=None):
+        return self.client.history(symbol.upper(), period, start)
+
+    def download(self, symbols, period="5d"):
+        return download_batch(symbols, period)
+
+    def info(self, symbol):
+        return self.client.info(symbol.upper())
+
+    def symbol_list(self):
+        return fetch_bist_hisse_listesi()
+
+
+class ReplayProvider(DataProvider):
+    """Kaydedilmiş bir oturumu (``record_session`` çıktısı) istenen hızda tekrar oynatır.
+
+    Klasörde sembol başına ``SEMBOL.csv`` (OHLCV), isteğe bağlı ``info.json``,
+    ``symbols.json`` ve ``depth.jsonl`` bulunur. Oynatma saati ``start``tan
+    (verilmezse ``warmup``. bardan) başlar ve gerçek zamanın ``speed`` katı
+    hızla ilerler. Saatten önceki barlar geçmiş olarak görünür; oluşmakta olan
+    bar açılıştan kapanışa dip ve tepeden geçerek doğrusal ilerler, böylece
+    fiyat servisi her yoklamada değişen fiyat görür. Kayıt bitince son
+    kapanışta kalınır.
+    """
+
+    cacheable = False
+
+    def __init__(self, path, speed=1.0, start=None, warmup=200):
+        import numpy as np
+        import pandas as pd
+
+        self.path = path
+        self.speed = speed
+        self.frames = {}
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.csv'):
+                df = pd.read_csv(os.path.join(path, name), index_col=0)
+                # Saat karşılaştırmaları nanosaniye üzerinden yapılır
+                df.index = pd.to_datetime(df.index, utc=True).tz_convert('Europe/Istanbul').as_unit('ns')
+                df.index.name = 'Date'
+                self.frames[name[:-4].upper()] = df[list(FIELDS)].astype(float).sort_index()
+        if not self.frames:
+            raise ValueError(f"Tekrar oynatılacak kayıt bulunamadı: {path}")
+        self._ts = {symbol: df.index.asi8 for symbol, df in self.frames.items()}
+
+        bars = np.unique(np.concatenate(list(self._ts.values())))
+        # Bar süresi: ardışık bar zamanları arasındaki en sık (medyan) fark
+        self.bar_ns = int(np.median(np.diff(bars))) if len(bars) > 1 else 86400 * 10**9
+        self.start = pd.Timestamp(start, tz='Europe/Istanbul') if start else \
+            pd.Timestamp(int(bars[min(warmup, len(bars) - 1)]), tz='UTC').tz_convert('Europe/Istanbul')
+        self._wall = time.monotonic()
+        self._info = self._read_json('info.json') or {}
+        self._symbols = self._read_json('symbols.json')
+
+    def _read_json(self, name):
+        path = os.path.join(self.path, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def now(self):
+        """Oynatma saati"""
+        import pandas as pd
+
+        return self.start + pd.Timedelta(seconds=(time.monotonic() - self._wall) * self.speed)
+
+    def interval(self, ms):
+        return max(int(ms / self.speed), 50)
+
+    def _frame(self, symbol, now, tail=None):
+        """Saate kadar oluşmuş barlar; son bar kısmi"""
+        import numpy as np
+
+        df = self.frames.get(symbol.upper())
+        if df is None:
+            return None
+        ts = self._ts[symbol.upper()]
+        i = int(np.searchsorted(ts, now.value, 'right'))
+        if i == 0:
+            return df.iloc[:0]
+        df = df.iloc[i - tail if tail and i > tail else 0:i].copy()
+        progress = min((now.value - ts[i - 1]) / self.bar_ns, 1.0)
+        if progress < 1.0:
+            o, h, l, c, v = df.iloc[-1].to_numpy()
+            path = (o, l, h, c) if c >= o else (o, h, l, c)
+            price = float(np.interp(progress, (0, 1 / 3, 2 / 3, 1), path))
+            passed = [p for p, at in zip(path, (0, 1 / 3, 2 / 3, 1)) if at <= progress] + [price]
+            df.iloc[-1] = (o, max(passed), min(passed), price, v * progress)
+        return df
+
+    def _period_frame(self, symbol, period, now):
+        """Saate kadar oluşmuş barların ``period`` kadarı; gün periyotları bar sayısıdır"""
+        from ohlcv_cache import period_days, period_start
+
+        begin = period_start(period, now)
+        if begin is None:
+            return self._frame(symbol, now, tail=period_days(period))
+        df = self._frame(symbol, now)
+        return None if df is None else df[df.index >= begin]
+
+    def history(self, symbol, period=None, start=None):
+        import pandas as pd
+
+        now = self.now()
+        if period and start is None:
+            df = self._period_frame(symbol, period, now)
+        else:
+            df = self._frame(symbol, now)
+            if df is not None and start is not None:
+                df = df[df.index >= pd.Timestamp(start, tz=df.index.tz)]
+        return pd.DataFrame(columns=list(FIELDS)) if df is None else df
+
+    def download(self, symbols, period="5d"):
+        now = self.now()
+        frames = {}
+        for symbol in symbols:
+            df = self._period_frame(symbol, period, now)
+            if df is not None and not df.empty:
+                frames[symbol.upper()] = df
+        return frames
+
+    def info(self, symbol):
+        return self._info.get(symbol.upper(), {})
+
+    def symbol_list(self):
+        return self._symbols or sorted(self.frames)
+
+    def depth(self, price_func=None):
+        from depth_feed import ReplayDepthProvider
+
+        path = os.path.join(self.path, 'depth.jsonl')
+        return ReplayDepthProvider(path=path if os.path.exists(path) else None, price_func=price_func)
+
+
+def record_session(symbols, path, period='1y', interval='1d', provider=None, info=True):
+    """Sembollerin geçmişini (ve temel verilerini) ``ReplayProvider`` klasörüne kaydeder"""
+    provider = provider or YahooProvider()
+    os.makedirs(path, exist_ok=True)
+    infos, recorded = {}, []
+    for symbol in symbols:
+        symbol = symbol.upper()
+        if isinstance(provider, YahooProvider):
+            df = provider.client.history(symbol, period, interval=interval)
+        else:
+            df = provider.history(symbol, period)
+        if df.empty:
+            print(f"{symbol}: veri yok, atlandı")
+            continue
+        df[list(FIELDS)].to_csv(os.path.join(path, f"{symbol}.csv"))
+        recorded.append(symbol)
+        print(f"{symbol}: {len(df)} bar kaydedildi")
+        if info:
+            try:
+                infos[symbol] = provider.info(symbol)
+            except Exception as e:
+                print(f"{symbol}: temel veri kaydedilemedi: {e}")
+    if infos:
+        with open(os.path.join(path, 'info.json'), 'w', encoding='utf-8') as f:
+            json.dump(infos, f, ensure_ascii=False, default=str)
+    return recorded
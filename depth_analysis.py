@@ -1,73 +1,167 @@
 import tkinter as tk
 from tkinter import ttk
 
+from depth_feed import ASK, BID, OrderBook, ReplayDepthProvider
+from statement_import import parse_number
+
+COLUMNS = ('Fiyat', 'Lot', 'Toplam')
+
+
 class DepthAnalysisApp:
-    def __init__(self, parent, symbol):
+    """Derinlik penceresi; widget'lar bir kez kurulur, her güncellemede yalnızca değişen satırlar yazılır.
+
+    Makas, dengesizlik ve girilen lot için ortalama dolum fiyatı defterin NumPy
+    dizilerinden her güncellemede hesaplanır; derinlik grafiği aynı çizgilerin
+    verisi değiştirilerek yeniden çizilir.
+    """
+
+    def __init__(self, parent, symbol, provider=None, interval_ms=500, levels=10):
         self.window = parent
         self.symbol = symbol
+        self.provider = provider or ReplayDepthProvider()
+        self.interval_ms = interval_ms
+        self.levels = levels
+        self.book = OrderBook(symbol)
+        self._rows = {}
+        self._after_id = None
 
         # Başlık
         ttk.Label(self.window, text=f"{self.symbol} Derinlik Verisi", font=("Arial", 16)).pack(pady=10)
+        self.spread_var = tk.StringVar()
+        ttk.Label(self.window, textvariable=self.spread_var).pack()
+
+        # Metrikler: dengesizlik ve belirli lot için ortalama dolum fiyatı
+        metrics_frame = ttk.Frame(self.window)
+        metrics_frame.pack(fill=tk.X, padx=10)
+        self.imbalance_var = tk.StringVar()
+        ttk.Label(metrics_frame, textvariable=self.imbalance_var).pack(side=tk.LEFT, padx=5)
+        ttk.Label(metrics_frame, text="Lot:").pack(side=tk.LEFT, padx=(20, 2))
+        self.lot_var = tk.StringVar(value="100000")
+        ttk.Entry(metrics_frame, textvariable=self.lot_var, width=12).pack(side=tk.LEFT)
+        self.vwap_var = tk.StringVar()
+        ttk.Label(metrics_frame, textvariable=self.vwap_var).pack(side=tk.LEFT, padx=5)
 
         # Ana konteyner
         self.container = ttk.Frame(self.window)
         self.container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         self.setup_tables()
-        self.update_depth_data()
+        self.setup_chart()
 
         ttk.Button(self.window, text="Verileri Güncelle", command=self.update_depth_data).pack(pady=5)
 
-    def setup_tables(self):
-        if hasattr(self, 'buy_frame'):
-            self.buy_frame.destroy()
-        if hasattr(self, 'sell_frame'):
-            self.sell_frame.destroy()
+        self.window.bind("<Destroy>", self._on_destroy, add="+")
+        self._schedule()
 
+    def setup_tables(self):
         self.buy_frame = ttk.LabelFrame(self.container, text="Alış Emirleri")
         self.buy_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-
-        self.buy_tree = ttk.Treeview(self.buy_frame, columns=('Fiyat', 'Lot', 'Toplam'), show='headings')
-        for col in ('Fiyat', 'Lot', 'Toplam'):
-            self.buy_tree.heading(col, text=col)
-            self.buy_tree.column(col, anchor='center')
-        self.buy_tree.pack(fill=tk.BOTH, expand=True)
+        self.buy_tree = self._create_tree(self.buy_frame)
 
         self.sell_frame = ttk.LabelFrame(self.container, text="Satış Emirleri")
         self.sell_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.sell_tree = self._create_tree(self.sell_frame)
+
+    def setup_chart(self):
+        """Kümülatif derinlik grafiğini bir kez kurar; güncellemelerde yalnızca veriler değişir"""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
 
-        self.sell_tree = ttk.Treeview(self.sell_frame, columns=('Fiyat', 'Lot', 'Toplam'), show='headings')
-        for col in ('Fiyat', 'Lot', 'Toplam'):
-            self.sell_tree.heading(col, text=col)
-            self.sell_tree.column(col, anchor='center')
-        self.sell_tree.pack(fill=tk.BOTH, expand=True)
+        figure = Figure(figsize=(8, 2.5), dpi=100)
+        self.chart_ax = figure.add_subplot(111)
+        self.bid_line, = self.chart_ax.step([], [], where='pre', color='#2e7d32', label='Alış')
+        self.ask_line, = self.chart_ax.step([], [], where='post', color='#c62828', label='Satış')
+        self.chart_ax.set_ylabel('Kümülatif Lot')
+        self.chart_ax.legend(loc='upper center', ncol=2, fontsize=8)
+        figure.tight_layout()
+        self.chart_canvas = FigureCanvasTkAgg(figure, master=self.window)
+        self.chart_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10)
+
+    @staticmethod
+    def _create_tree(frame):
+        tree = ttk.Treeview(frame, columns=COLUMNS, show='headings')
+        for col in COLUMNS:
+            tree.heading(col, text=col)
+            tree.column(col, anchor='center')
+        tree.pack(fill=tk.BOTH, expand=True)
+        return tree
+
+    def _schedule(self):
+        self.update_depth_data()
+        self._after_id = self.window.after(self.interval_ms, self._schedule)
+
+    def _on_destroy(self, event):
+        if event.widget is not self.window:
+            return
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+            self._after_id = None
+        self.provider.close()
 
     def update_depth_data(self):
-        # Mevcut verileri temizle
-        for item in self.buy_tree.get_children():
-            self.buy_tree.delete(item)
-        for item in self.sell_tree.get_children():
-            self.sell_tree.delete(item)
-
-        # Örnek veriler (burayı Asenax API ile değiştirebilirsin)
-        buy_orders = [
-            (319.75, '1,715,105', '548,404,823.75'),
-            (319.43, '857,552', '273,928,049.75'),
-            (319.11, '571,701', '182,435,791.96'),
-            (318.79, '428,776', '136,698,226.62'),
-            (318.47, '343,021', '109,242,240.89')
-        ]
-
-        sell_orders = [
-            (319.75, '1,715,105', '548,404,823.75'),
-            (320.07, '857,552', '274,476,454.25'),
-            (320.39, '571,701', '183,166,997.54'),
-            (320.71, '428,776', '137,512,429.38'),
-            (321.03, '343,021', '110,119,688.61')
-        ]
-
-        for order in buy_orders:
-            self.buy_tree.insert('', 'end', values=order)
-
-        for order in sell_orders:
-            self.sell_tree.insert('', 'end', values=order)
+        """Sağlayıcıdan yeni olayları alır, deftere uygular ve tabloları eşitler"""
+        try:
+            events = self.provider.poll(self.symbol)
+        except Exception as e:
+            print(f"Derinlik verisi alınamadı ({self.symbol}): {e}")
+            return
+        for event in events:
+            if not self.book.apply(event):
+                # Sıra boşluğu: bir sonraki poll'da snapshot istenir
+                self.provider.resync(self.symbol)
+                break
+        if self.book.stale:
+            return
+
+        self._sync_tree(self.buy_tree, self.book.levels(BID, self.levels))
+        self._sync_tree(self.sell_tree, self.book.levels(ASK, self.levels))
+        self.update_metrics()
+        self.update_chart()
+
+    def update_metrics(self):
+        spread, mid = self.book.spread()
+        if spread is None:
+            return
+        self.spread_var.set(f"Alış {self.book.best(BID):.2f} / Satış {self.book.best(ASK):.2f}  •  "
+                            f"Makas {spread:.2f} (%{spread / mid * 100:.2f})")
+        self.imbalance_var.set(f"Dengesizlik (ilk {self.levels}): {self.book.imbalance(self.levels):+.1%}")
+
+        try:
+            # '1.000' binlik ayırıcıyla 1000 lot; '1.5' gibi küsuratlı değerler reddedilir
+            lots = parse_number(self.lot_var.get(), integer=True)
+            if lots <= 0:
+                raise ValueError("lot sıfırdan büyük olmalı")
+        except ValueError as e:
+            self.vwap_var.set(f"Geçersiz lot: {e}")
+            return
+        buy, buy_filled = self.book.vwap_for_size(ASK, lots)
+        sell, sell_filled = self.book.vwap_for_size(BID, lots)
+        parts = []
+        if buy is not None:
+            parts.append(f"Alış ort. {buy:.2f}" + ("" if buy_filled >= lots else f" ({buy_filled:,.0f} lot)"))
+        if sell is not None:
+            parts.append(f"Satış ort. {sell:.2f}" + ("" if sell_filled >= lots else f" ({sell_filled:,.0f} lot)"))
+        self.vwap_var.set("  •  ".join(parts))
+
+    def update_chart(self):
+        bid_prices, bid_cum = self.book.cumulative(BID, self.levels)
+        ask_prices, ask_cum = self.book.cumulative(ASK, self.levels)
+        self.bid_line.set_data(bid_prices[::-1], bid_cum[::-1])
+        self.ask_line.set_data(ask_prices, ask_cum)
+        self.chart_ax.relim()
+        self.chart_ax.autoscale_view()
+        self.chart_canvas.draw_idle()
+
+    def _sync_tree(self, tree, levels):
+        """Satır konumuna göre sabit iid'lerle yalnızca değişen satırları günceller"""
+        old_rows = self._rows.get(tree, [])
+        new_rows = [(f"{price:.2f}", f"{qty:,.0f}", f"{price * qty:,.2f}") for price, qty in levels]
+
+        for i, row in enumerate(new_rows):
+            if i >= len(old_rows):
+                tree.insert('', 'end', iid=f"L{i}", values=row)
+            elif old_rows[i] != row:
+                tree.item(f"L{i}", values=row)
+        for i in range(len(new_rows), len(old_rows)):
+            tree.delete(f"L{i}")
+        self._rows[tree] = new_rows
@@ -0,0 +1,256 @@
+import json
+import random
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+BID, ASK = 'bid', 'ask'
+
+
+def tick_size(price):
+    """BIST pay piyasası fiyat adımı"""
+    for limit, step in ((20, 0.01), (50, 0.02), (100, 0.05), (250, 0.1), (500, 0.25), (1000, 0.5)):
+        if price < limit:
+            return step
+    return 1.0
+
+
+class OrderBook:
+    """Fiyat seviyelerini NumPy dizilerinde tutan ve delta uygulayan kalıcı emir defteri.
+
+    Her taraf artan sıralı ``price`` ve ona hizalı ``size`` dizileriyle tutulur;
+    bir delta ``searchsorted`` ile bulunan tek seviyeyi günceller (lot 0 ise
+    seviyeyi siler). Dengesizlik, kümülatif derinlik ve belirli lot için
+    ortalama dolum fiyatı bu diziler üzerinde vektörel hesaplanır. Sıra
+    numarasında boşluk olursa defter ``stale`` işaretlenir ve sağlayıcıdan yeni
+    bir snapshot beklenir.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.price = {BID: np.empty(0), ASK: np.empty(0)}
+        self.size = {BID: np.empty(0), ASK: np.empty(0)}
+        self.seq = None
+        self.stale = True
+
+    def apply_snapshot(self, bids, asks, seq=None):
+        """Defteri tamamen yeni seviyelerle değiştirir"""
+        for side, rows in ((BID, bids), (ASK, asks)):
+            levels = np.array([(price, qty) for price, qty in rows if qty > 0], dtype='f8').reshape(-1, 2)
+            order = np.argsort(levels[:, 0], kind='stable')
+            self.price[side] = levels[order, 0].copy()
+            self.size[side] = levels[order, 1].copy()
+        self.seq = seq
+        self.stale = False
+
+    def apply_delta(self, side, price, qty, seq=None):
+        """Tek bir seviyeyi günceller; sıra boşluğu varsa False döndürür"""
+        if self.stale:
+            return False
+        if seq is not None and self.seq is not None and seq != self.seq + 1:
+            self.stale = True
+            return False
+        self.seq = seq
+        prices, sizes = self.price[side], self.size[side]
+        i = int(np.searchsorted(prices, price))
+        exists = i < len(prices) and prices[i] == price
+        if qty > 0:
+            if exists:
+                sizes[i] = qty
+            else:
+                self.price[side] = np.insert(prices, i, price)
+                self.size[side] = np.insert(sizes, i, qty)
+        elif exists:
+            self.price[side] = np.delete(prices, i)
+            self.size[side] = np.delete(sizes, i)
+        return True
+
+    def apply(self, event):
+        """Sağlayıcı olayını (snapshot veya delta sözlüğü) uygular"""
+        if event['type'] == 'snapshot':
+            self.apply_snapshot(event['bids'], event['asks'], event.get('seq'))
+            return True
+        return self.apply_delta(event['side'], event['price'], event['qty'], event.get('seq'))
+
+    def depth(self, side):
+        return len(self.price[side])
+
+    def top(self, side, n=10):
+        """En iyi n seviyeyi (fiyatlar, lotlar) dizileri olarak döndürür; alışta yüksekten, satışta düşükten"""
+        if side == BID:
+            return self.price[BID][::-1][:n], self.size[BID][::-1][:n]
+        return self.price[ASK][:n], self.size[ASK][:n]
+
+    def levels(self, side, n=10):
+        """En iyi n seviyeyi (fiyat, lot) demetleri olarak döndürür"""
+        return list(zip(*(a.tolist() for a in self.top(side, n))))
+
+    def best(self, side):
+        prices = self.price[side]
+        if not len(prices):
+            return None
+        return float(prices[-1] if side == BID else prices[0])
+
+    def spread(self):
+        """(makas, orta fiyat) döndürür; taraflardan biri boşsa (None, None)"""
+        bid, ask = self.best(BID), self.best(ASK)
+        if bid is None or ask is None:
+            return None, None
+        return ask - bid, (ask + bid) / 2
+
+    def imbalance(self, n=10):
+        """İlk n seviyede (alış - satış) / (alış + satış) lot dengesizliği, -1..1"""
+        bid = self.top(BID, n)[1].sum()
+        ask = self.top(ASK, n)[1].sum()
+        total = bid + ask
+        return float((bid - ask) / total) if total else 0.0
+
+    def cumulative(self, side, n=10):
+        """En iyi fiyattan başlayarak (fiyatlar, kümülatif lotlar) döndürür"""
+        prices, sizes = self.top(side, n)
+        return prices, np.cumsum(sizes)
+
+    def vwap_for_size(self, side, lots):
+        """``side`` tarafındaki emirlere ``lots`` lotluk piyasa emri gönderilirse ortalama dolum fiyatı.
+
+        Alış emri satış tarafına (ASK), satış emri alış tarafına (BID) gider.
+        (ortalama fiyat, dolan lot) döndürür; derinlik yetmezse dolan lot eksik kalır.
+        """
+        prices, sizes = self.top(side, self.depth(side))
+        before = np.cumsum(sizes) - sizes
+        fills = np.clip(lots - before, 0, sizes)
+        filled = float(fills.sum())
+        if not filled:
+            return None, 0.0
+        return float(fills @ prices / filled), filled
+
+
+class DepthProvider(ABC):
+    """Derinlik verisi sağlayıcı arayüzü.
+
+    ``poll(symbol)`` son çağrıdan beri gelen olayları döndürür. Olaylar
+    ``{'type': 'snapshot', 'bids': [...], 'asks': [...], 'seq': n}`` veya
+    ``{'type': 'delta', 'side': 'bid'|'ask', 'price': p, 'qty': q, 'seq': n}``
+    biçimindedir; ``resync(symbol)`` bir sonraki poll'da snapshot ister.
+    Olaylar tek bir tüketici içindir: her derinlik penceresi kendi sağlayıcısını
+    kullanır ve kapanırken ``close()`` çağırır.
+    """
+
+    @abstractmethod
+    def poll(self, symbol):
+        ...
+
+    def resync(self, symbol):
+        pass
+
+    def close(self):
+        """Sağlayıcının açık kaynaklarını (dosya, bağlantı) bırakır"""
+
+
+class ReplayDepthProvider(DepthProvider):
+    """Gerçek derinlik servisi yokken kullanılan yerel sağlayıcı.
+
+    ``path`` verilirse JSON satırlarından (her satır bir olay ve ``symbol``
+    alanı) kaydedilmiş bir akışı her poll'da ``events_per_poll`` olay ilerleterek
+    tekrar oynatır. Verilmezse ``price_func`` ile alınan son fiyat etrafında
+    tutarlı, rastgele bir defter üretip yalnızca değişen seviyeleri gönderir.
+    """
+
+    def __init__(self, path=None, price_func=None, levels=10, events_per_poll=8, seed=None):
+        self.path = path
+        self.price_func = price_func
+        self.levels = levels
+        self.events_per_poll = events_per_poll
+        self.rng = random.Random(seed)
+        self.books = {}
+        self._needs_snapshot = set()
+        self._files = {}
+
+    def resync(self, symbol):
+        self._needs_snapshot.add(symbol)
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def poll(self, symbol):
+        if self.path:
+            return self._replay(symbol)
+        return self._simulate(symbol)
+
+    def _replay(self, symbol):
+        """Kayıttaki sembol olaylarını sırayla döndürür, dosya bitince başa sarar"""
+        f = self._files.get(symbol)
+        if f is None:
+            f = self._files[symbol] = open(self.path, encoding='utf-8')
+        events = []
+        wrapped = False
+        while len(events) < self.events_per_poll:
+            line = f.readline()
+            if not line:
+                if wrapped:
+                    break
+                f.seek(0)
+                wrapped = True
+                continue
+            event = json.loads(line)
+            if event.get('symbol', symbol) != symbol:
+                continue
+            # Yeniden eşitleme istenmişse ilk snapshot'a kadar deltalar atlanır
+            if symbol in self._needs_snapshot and event['type'] != 'snapshot':
+                continue
+            self._needs_snapshot.discard(symbol)
+            events.append(event)
+        return events
+
+    def _simulate(self, symbol):
+        book = self.books.get(symbol)
+        if book is None or symbol in self._needs_snapshot:
+            if book is None:
+                price = (self.price_func(symbol) if self.price_func else None) or 100.0
+                book = self.books[symbol] = self._new_book(symbol, price)
+            self._needs_snapshot.discard(symbol)
+            return [{'type': 'snapshot', 'bids': book.levels(BID, self.levels),
+                     'asks': book.levels(ASK, self.levels), 'seq': book.seq}]
+
+        events = []
+
+        def emit(side, price, qty):
+            book.apply_delta(side, price, qty, book.seq + 1)
+            events.append({'type': 'delta', 'side': side, 'price': price, 'qty': qty, 'seq': book.seq})
+
+        for _ in range(self.events_per_poll):
+            side = self.rng.choice((BID, ASK))
+            if self.rng.random() < 0.1 and book.depth(side) > 1:
+                # En iyi seviye tükendi, fiyat kayar; boşalan fiyata karşı taraf emir girer
+                best = book.best(side)
+                emit(side, best, 0)
+                emit(ASK if side == BID else BID, best, self._lot())
+            else:
+                prices = book.top(side, self.levels)[0]
+                emit(side, float(prices[self.rng.randrange(len(prices))]), self._lot())
+
+            # Derinlik ``levels`` seviyede kalsın
+            for s in (BID, ASK):
+                while book.depth(s) > self.levels:
+                    worst = float(book.price[s][0] if s == BID else book.price[s][-1])
+                    emit(s, worst, 0)
+                while book.depth(s) < self.levels:
+                    edge = float(book.price[s][0] if s == BID else book.price[s][-1])
+                    step = tick_size(edge)
+                    emit(s, round(edge - step if s == BID else edge + step, 2), self._lot())
+        return events
+
+    def _lot(self):
+        return float(int(self.rng.lognormvariate(11, 1.2)))
+
+    def _new_book(self, symbol, price):
+        step = tick_size(price)
+        mid = round(round(price / step) * step, 2)
+        book = OrderBook(symbol)
+        book.apply_snapshot(
+            [(round(mid - i * step, 2), self._lot()) for i in range(1, self.levels + 1)],
+            [(round(mid + i * step, 2), self._lot()) for i in range(0, self.levels)],
+            seq=0)
+        return book
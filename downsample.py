@@ -0,0 +1,124 @@
+import numpy as np
+
+
+def bucket_starts(n, n_out):
+    """``n`` ardışık barı en fazla ``n_out`` kovaya bölen başlangıç indeksleri"""
+    if n <= n_out:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n, n_out + 1).astype(np.int64)[:-1])
+
+
+def aggregate_ohlcv(open_, high, low, close, volume, starts):
+    """Kovalardaki barları tek muma birleştirir: ilk açılış, en yüksek, en düşük, son kapanış, toplam hacim.
+
+    En yüksek/en düşük değerler korunduğundan birleştirilmiş grafikte
+    görünür tepe ve dipler kaybolmaz.
+    """
+    n = len(close)
+    if len(starts) == n:
+        return open_, high, low, close, volume
+    ends = np.append(starts[1:], n) - 1
+    return (open_[starts],
+            np.fmax.reduceat(high, starts),
+            np.fmin.reduceat(low, starts),
+            close[ends],
+            np.add.reduceat(np.nan_to_num(volume), starts))
+
+
+def bucket_extremes(y, starts):
+    """Her kovada mutlak değeri en büyük değeri döndürür (MACD histogramı gibi sıfır etrafında salınan seriler için)"""
+    if len(starts) == len(y):
+        return y
+    high = np.fmax.reduceat(y, starts)
+    low = np.fmin.reduceat(y, starts)
+    return np.where(np.abs(low) > np.abs(high), low, high)
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets ile çizgiyi ``n_out`` noktaya indirir.
+
+    İlk ve son nokta korunur; her kovadan bir önceki seçilen nokta ile
+    sonraki kovanın ortalamasıyla en büyük üçgeni oluşturan nokta seçilir,
+    böylece tepe ve dipler düz örneklemeye göre çok daha iyi korunur.
+    Göstergelerin başındaki boş (NaN) değerler atlanır.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_lo, next_hi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        next_x = x[next_lo:max(next_hi, next_lo + 1)].mean()
+        next_y = y[next_lo:max(next_hi, next_lo + 1)].mean()
+        area = np.abs((x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a]))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
+
+class ZoomResampler:
+    """Eksenin görünür x aralığı değişince veriyi eksenin piksel genişliğine göre yeniden örnekler.
+
+    ``render(i0, i1, n_points)`` tam verinin ``[i0, i1)`` dilimini en fazla
+    ``n_points`` noktayla çizmelidir. Yakınlaştırma/kaydırma sırasında gelen
+    ``xlim_changed`` olayları ``widget.after_idle`` ile tek çizime toplanır;
+    aynı aralık ve çözünürlük için tekrar çizim yapılmaz.
+    """
+
+    def __init__(self, ax, x, render, px_per_point=1, widget=None):
+        self.ax = ax
+        self.x = np.asarray(x, dtype=float)
+        self.render = render
+        self.px_per_point = px_per_point
+        self.widget = widget
+        self._last = None
+        self._pending = False
+        ax.callbacks.connect('xlim_changed', self._on_xlim)
+
+    def points(self):
+        return max(int(self.ax.bbox.width / self.px_per_point), 10)
+
+    def visible(self):
+        """Görünür aralığı, kenarlarda birer bar taşacak şekilde indeks dilimine çevirir"""
+        xmin, xmax = self.ax.get_xlim()
+        i0 = max(int(np.searchsorted(self.x, xmin, 'left')) - 1, 0)
+        i1 = min(int(np.searchsorted(self.x, xmax, 'right')) + 1, len(self.x))
+        return i0, i1
+
+    def set_x(self, x):
+        self.x = np.asarray(x, dtype=float)
+        self._last = None
+
+    def refresh(self, full=False):
+        """Görünür (``full`` ise tüm) aralığı yeniden örnekler; değişiklik yoksa False döndürür"""
+        i0, i1 = (0, len(self.x)) if full else self.visible()
+        key = (i0, i1, self.points())
+        if key == self._last or i1 <= i0:
+            return False
+        self._last = key
+        self.render(*key)
+        return True
+
+    def _on_xlim(self, ax):
+        if self.widget is None:
+            self._apply()
+        elif not self._pending:
+            self._pending = True
+            self.widget.after_idle(self._apply)
+
+    def _apply(self):
+        self._pending = False
+        if self.widget is not None and not self.widget.winfo_exists():
+            return
+        if self.refresh():
+            self.ax.figure.canvas.draw_idle()
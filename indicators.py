@@ -0,0 +1,348 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import ta
+
+from perf import timed
+
+# Panel motorunun ürettiği göstergeler, teknik_analiz sütun adlarıyla aynı
+INDICATOR_COLUMNS = ('RSI', 'Stoch_%K', 'MACD', 'MACD_signal', 'EMA_20', 'SMA_50', 'EMA_200',
+                     'BB_upper', 'BB_middle', 'BB_lower', 'OBV')
+
+
+@timed('indicators.teknik_analiz')
+def teknik_analiz(df):
+    """Tek bir sembolün OHLCV verisine ta kütüphanesiyle göstergeleri ekler"""
+    df = df.copy()
+    # Momentum göstergeleri
+    df['RSI'] = ta.momentum.RSIIndicator(df['Close'], window=14).rsi()
+    df['Stoch_%K'] = ta.momentum.StochasticOscillator(
+        df['High'], df['Low'], df['Close'], window=14).stoch()
+
+    # Trend göstergeleri
+    macd = ta.trend.MACD(df['Close'], window_slow=26, window_fast=12, window_sign=9)
+    df['MACD'] = macd.macd()
+    df['MACD_signal'] = macd.macd_signal()
+    df['EMA_20'] = ta.trend.EMAIndicator(df['Close'], window=20).ema_indicator()
+    df['SMA_50'] = ta.trend.SMAIndicator(df['Close'], window=50).sma_indicator()
+    df['EMA_200'] = ta.trend.EMAIndicator(df['Close'], window=200).ema_indicator()
+
+    # Volatilite göstergeleri
+    bollinger = ta.volatility.BollingerBands(df['Close'], window=20, window_dev=2)
+    df['BB_upper'] = bollinger.bollinger_hband()
+    df['BB_middle'] = bollinger.bollinger_mavg()
+    df['BB_lower'] = bollinger.bollinger_lband()
+
+    # Hacim analizi
+    df['OBV'] = ta.volume.OnBalanceVolumeIndicator(df['Close'], df['Volume']).on_balance_volume()
+
+    return df
+
+
+def _ema(panel, span):
+    return panel.ewm(span=span, min_periods=span, adjust=False).mean()
+
+
+@timed('indicators.panel')
+def panel_indicators(close, high, low, volume):
+    """Geniş (zaman × sembol) paneller üzerinde tüm göstergeleri tek geçişte hesaplar.
+
+    Her gösterge zaman ekseni boyunca tüm sütunlara aynı anda uygulanan pandas
+    işlemleriyle hesaplanır ve ``teknik_analiz`` ile aynı formülleri kullanır.
+    Sonradan listelenen hisselerin baştaki boş satırları sonucu etkilemez;
+    ortadaki eksik barlar (işlem durdurma) ise pencereleri kısaltır.
+    Sonuç, gösterge adından geniş DataFrame'e bir sözlüktür.
+    """
+    # Tek bir float bloğa indirgenir; sembol başına blok taşımak her işlemi yavaşlatır
+    close, high, low, volume = (pd.DataFrame(panel.to_numpy(dtype='f8'), index=panel.index,
+                                             columns=panel.columns)
+                                for panel in (close, high, low, volume))
+    result = {}
+
+    # RSI (Wilder yumuşatması)
+    diff = close.diff()
+    up = diff.where(diff > 0, 0.0).where(close.notna())
+    down = (-diff).where(diff < 0, 0.0).where(close.notna())
+    ema_up = up.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    ema_down = down.ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    rsi = 100 - (100 / (1 + ema_up / ema_down))
+    result['RSI'] = rsi.mask(ema_down == 0, 100.0)
+
+    # Stokastik %K
+    lowest = low.rolling(14, min_periods=14).min()
+    highest = high.rolling(14, min_periods=14).max()
+    result['Stoch_%K'] = 100 * (close - lowest) / (highest - lowest)
+
+    # MACD ve trend ortalamaları
+    macd = _ema(close, 12) - _ema(close, 26)
+    result['MACD'] = macd
+    result['MACD_signal'] = _ema(macd, 9)
+    result['EMA_20'] = _ema(close, 20)
+    result['SMA_50'] = close.rolling(50, min_periods=50).mean()
+    result['EMA_200'] = _ema(close, 200)
+
+    # Bollinger bantları
+    middle = close.rolling(20, min_periods=20).mean()
+    std = close.rolling(20, min_periods=20).std(ddof=0)
+    result['BB_upper'] = middle + 2 * std
+    result['BB_middle'] = middle
+    result['BB_lower'] = middle - 2 * std
+
+    # OBV
+    result['OBV'] = volume.where(~(close < close.shift(1)), -volume).cumsum()
+
+    return result
+
+
+def build_panels(frames):
+    """Sembol -> OHLCV DataFrame sözlüğünden Close/High/Low/Volume panellerini kurar"""
+    frames = {symbol: df for symbol, df in frames.items() if df is not None and not df.empty}
+    index = next(iter(frames.values())).index
+    for df in frames.values():
+        if not df.index.equals(index):
+            index = index.union(df.index)
+    symbols = list(frames)
+    panels = []
+    for field in ('Close', 'High', 'Low', 'Volume'):
+        values = np.column_stack([frames[s][field].reindex(index).to_numpy(dtype='f8')
+                                  for s in symbols])
+        panels.append(pd.DataFrame(values, index=index, columns=symbols))
+    return tuple(panels)
+
+
+def latest_values(close, volume, indicators):
+    """Her sembolün son geçerli barındaki göstergeleri tek bir tabloda döndürür"""
+    valid = close.notna().to_numpy()
+    rows = len(close) - 1 - valid[::-1].argmax(axis=0)
+    columns = np.arange(close.shape[1])
+    table = {name: panel.to_numpy()[rows, columns]
+             for name, panel in [('Close', close), ('Volume', volume)] + list(indicators.items())}
+    table['Volume_mean'] = volume.mean().to_numpy()
+    return pd.DataFrame(table, index=close.columns)
+
+
+class StreamingEMA:
+    """Tek tek gelen değerlerle güncellenen EMA (pandas ewm adjust=False ile aynı)"""
+
+    def __init__(self, span=None, alpha=None):
+        self.alpha = alpha if alpha is not None else 2 / (span + 1)
+        self.min_periods = span if span is not None else round(1 / self.alpha)
+        self.value = None
+        self.count = 0
+        self._prev = (None, 0)
+
+    def update(self, x, new_bar=True):
+        """Yeni değer ekler veya new_bar=False ise son değeri değiştirir"""
+        if new_bar:
+            self._prev = (self.value, self.count)
+        else:
+            self.value, self.count = self._prev
+        if x == x:  # NaN değerler atlanır
+            self.value = x if self.value is None else self.value + self.alpha * (x - self.value)
+            self.count += 1
+        return self.current()
+
+    def current(self):
+        return self.value if self.count >= self.min_periods else float('nan')
+
+
+class RollingWindow:
+    """Sabit pencerede ortalama, standart sapma ve uç değerleri tutar.
+
+    Toplamlar sabit maliyetle güncellenir; kayan nokta birikimini önlemek için
+    her ``window`` güncellemede bir kez pencereden yeniden hesaplanır.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._updates = 0
+
+    def update(self, x, new_bar=True):
+        """Yeni değer ekler veya new_bar=False ise son değeri değiştirir"""
+        if new_bar or not self.values:
+            if len(self.values) == self.window:
+                old = self.values[0]
+                self.total -= old
+                self.total_sq -= old * old
+            self.values.append(x)
+        else:
+            old = self.values[-1]
+            self.values[-1] = x
+            self.total -= old
+            self.total_sq -= old * old
+        self.total += x
+        self.total_sq += x * x
+
+        self._updates += 1
+        if self._updates >= self.window:
+            self.total = sum(self.values)
+            self.total_sq = sum(v * v for v in self.values)
+            self._updates = 0
+
+    def full(self):
+        return len(self.values) == self.window
+
+    def mean(self):
+        return self.total / self.window if self.full() else float('nan')
+
+    def std(self):
+        if not self.full():
+            return float('nan')
+        mean = self.total / self.window
+        return max(self.total_sq / self.window - mean * mean, 0.0) ** 0.5
+
+    def min(self):
+        return min(self.values) if self.full() else float('nan')
+
+    def max(self):
+        return max(self.values) if self.full() else float('nan')
+
+
+class IndicatorState:
+    """teknik_analiz göstergelerini her yeni barda sabit maliyetle günceller.
+
+    ``update`` yeni bir bar ekler; ``update(..., new_bar=False)`` ise son barı
+    (gün içinde oluşmakta olan günlük bar) düzeltir, böylece canlı fiyat her
+    geldiğinde geçmiş baştan hesaplanmaz. Değerler toplu ``teknik_analiz``
+    sonucuyla aynıdır; ``previous`` bir önceki barın göstergelerini tutar.
+    """
+
+    def __init__(self):
+        self.rsi_up = StreamingEMA(alpha=1 / 14)
+        self.rsi_down = StreamingEMA(alpha=1 / 14)
+        self.ema12 = StreamingEMA(12)
+        self.ema26 = StreamingEMA(26)
+        self.signal = StreamingEMA(9)
+        self.ema20 = StreamingEMA(20)
+        self.ema200 = StreamingEMA(200)
+        self.sma50 = RollingWindow(50)
+        self.bb = RollingWindow(20)
+        self.lows = RollingWindow(14)
+        self.highs = RollingWindow(14)
+        self.volume_avg = RollingWindow(20)
+        self.prev_close = None
+        self.last_close = None
+        self.obv = 0.0
+        self.bars = 0
+        self.values = {}
+        self.previous = {}
+        self._prev_obv = 0.0
+
+    @classmethod
+    def from_history(cls, df):
+        """Geçmiş OHLCV verisiyle ısıtılmış bir durum döndürür"""
+        state = cls()
+        for row in df[['High', 'Low', 'Close', 'Volume']].itertuples(index=False):
+            state.update(row.Close, row.High, row.Low, row.Volume)
+        return state
+
+    def update(self, close, high=None, low=None, volume=0.0, new_bar=True):
+        """Bir bar ekler veya son barı günceller; gösterge sözlüğünü döndürür"""
+        high = close if high is None else high
+        low = close if low is None else low
+        if not self.bars:
+            new_bar = True
+        if new_bar:
+            self.previous = self.values
+            self.last_close, self._prev_obv = self.prev_close, self.obv
+            self.bars += 1
+        prev_close, self.obv = self.last_close, self._prev_obv
+
+        # RSI (Wilder)
+        diff = close - prev_close if prev_close is not None else 0.0
+        up = self.rsi_up.update(diff if diff > 0 else 0.0, new_bar)
+        down = self.rsi_down.update(-diff if diff < 0 else 0.0, new_bar)
+        rsi = 100.0 if down == 0 else 100 - 100 / (1 + up / down)
+
+        # Stokastik %K
+        self.lows.update(low, new_bar)
+        self.highs.update(high, new_bar)
+        lowest, highest = self.lows.min(), self.highs.max()
+        stoch = 100 * (close - lowest) / (highest - lowest) if highest != lowest else float('nan')
+
+        # MACD
+        macd = self.ema12.update(close, new_bar) - self.ema26.update(close, new_bar)
+        signal = self.signal.update(macd, new_bar)
+
+        # Ortalamalar ve Bollinger
+        self.sma50.update(close, new_bar)
+        self.bb.update(close, new_bar)
+        middle, std = self.bb.mean(), self.bb.std()
+
+        # Hacim ortalaması (hacim patlaması alarmları için)
+        self.volume_avg.update(volume, new_bar)
+
+        # OBV
+        self.obv += -volume if prev_close is not None and close < prev_close else volume
+        self.prev_close = close
+
+        self.values = {
+            'Close': close,
+            'Volume': volume,
+            'RSI': rsi,
+            'Stoch_%K': stoch,
+            'MACD': macd,
+            'MACD_signal': signal,
+            'EMA_20': self.ema20.update(close, new_bar),
+            'SMA_50': self.sma50.mean(),
+            'EMA_200': self.ema200.update(close, new_bar),
+            'BB_upper': middle + 2 * std,
+            'BB_middle': middle,
+            'BB_lower': middle - 2 * std,
+            'OBV': self.obv,
+            'Volume_SMA_20': self.volume_avg.mean(),
+        }
+        return self.values
+
+
+class IndicatorFeed:
+    """Canlı fiyatlardan sembol başına IndicatorState'leri güncel tutar.
+
+    Durumlar ``seed`` ile geçmiş veriden bir kez ısıtılır (arka planda
+    çağrılmalıdır); sonrasında her fiyat güncellemesi ``apply`` ile yalnızca
+    son barı düzeltir veya yeni gün başladıysa yeni bar ekler.
+    """
+
+    def __init__(self, history_func, period='1y'):
+        self.history_func = history_func
+        self.period = period
+        self.states = {}
+
+    @timed('indicators.seed')
+    def seed(self, symbols):
+        """Henüz durumu olmayan semboller için geçmiş veriden durum oluşturur"""
+        for symbol in {s.upper() for s in symbols} - set(self.states):
+            try:
+                df = self.history_func(symbol, self.period)
+                if not df.empty:
+                    self.states[symbol] = (IndicatorState.from_history(df), df.index[-1])
+            except Exception as e:
+                print(f"Gösterge durumu oluşturulamadı ({symbol}): {e}")
+        return self.states
+
+    @timed('indicators.apply')
+    def apply(self, snapshot):
+        """Fiyat snapshot'ındaki son barları gösterge durumlarına uygular"""
+        for symbol, (state, last_date) in list(self.states.items()):
+            quote = snapshot.get(symbol)
+            if not quote:
+                continue
+            new_bar = quote['date'] > last_date
+            state.update(quote['price'], quote.get('high'), quote.get('low'),
+                         quote.get('volume', 0.0), new_bar=new_bar)
+            if new_bar:
+                self.states[symbol] = (state, quote['date'])
+
+    def get(self, symbol):
+        """Sembolün güncel gösterge değerlerini döndürür, yoksa boş sözlük"""
+        entry = self.states.get(symbol.upper())
+        return entry[0].values if entry else {}
+
+    def previous(self, symbol):
+        """Sembolün bir önceki barının gösterge değerlerini döndürür, yoksa boş sözlük"""
+        entry = self.states.get(symbol.upper())
+        return entry[0].previous if entry else {}
@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from market_data import client
+from ohlcv_cache import CACHE_DIR
+from perf import count, span, track
+
+
+class InfoCache:
+    """``Ticker.info`` temel verilerini TTL ve LRU ile bellekte tutar.
+
+    Temel veriler (F/K, piyasa değeri, temettü verimi) en fazla günde bir
+    değiştiği için varsayılan TTL bir gündür. En az kullanılan kayıt
+    ``maxsize`` aşıldığında çıkarılır; önbellek her yeni kayıtta diske yazılır
+    ve uygulama yeniden açıldığında geri yüklenir (``path`` None ise yalnızca
+    bellekte tutulur). Eksikler ``source.info(symbol)`` ile alınır.
+    """
+
+    def __init__(self, path=os.path.join(CACHE_DIR, 'info_cache.json'), ttl=86400, maxsize=256, source=client):
+        self.path = path
+        self.source = source
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Temel veri önbelleği okunamadı: {e}")
+            return
+        now = time.time()
+        for symbol, (fetched_at, info) in entries.items():
+            if now - fetched_at <= self.ttl:
+                self._entries[symbol] = (fetched_at, info)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def save(self):
+        """Önbelleği diske yazar"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self._lock:
+            entries = dict(self._entries)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, default=str)
+        os.replace(tmp_path, self.path)
+
+    def get(self, symbol):
+        """Sembolün temel verilerini döndürür; önbellekte yoksa veya eskiyse indirir"""
+        symbol = symbol.upper()
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry and time.time() - entry[0] <= self.ttl:
+                self._entries.move_to_end(symbol)
+                self.hits += 1
+                count('cache.info.hit')
+                return entry[1]
+            self.misses += 1
+        count('cache.info.miss')
+
+        with track('fetch.in_flight'), span('fetch.info'):
+            info = self.source.info(symbol)
+
+        with self._lock:
+            self._entries[symbol] = (time.time(), info)
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        try:
+            if self.path is not None:
+                self.save()
+        except OSError as e:
+            print(f"Temel veri önbelleği kaydedilemedi: {e}")
+        return info
+
+    def invalidate(self, symbol=None):
+        """Bir sembolü veya tüm önbelleği temizler"""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(symbol.upper(), None)
+
+    def stats(self):
+        """İsabet/ıskalama sayaçlarını ve önbellek boyutunu döndürür"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+            }
@@ -0,0 +1,255 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from perf import count, span
+
+ASENAX_TIMEOUT = 10
+
+
+class MarketDataError(Exception):
+    """Piyasa verisi alınamadı ve sunulacak eski veri de yok"""
+
+
+class CircuitOpenError(MarketDataError):
+    """Kaynak art arda hata verdiği için istekler geçici olarak durduruldu"""
+
+
+# Kaynağın sağlıklı olduğu ama istenen sembolün bulunmadığı hatalar (yfinance sınıf adları)
+DATA_ERROR_NAMES = ('YFTickerMissingError', 'YFPricesMissingError', 'YFInvalidPeriodError')
+
+
+def is_data_error(error):
+    """Hata sembole özgüyse (404/400, yfinance'in eksik sembol hataları) True.
+
+    Bu hatalar tekrar denenmez ve devre kesicide hata sayılmaz; tek bir
+    kaldırılmış sembol diğer tüm isteklerin kaynağını kapatmamalıdır.
+    """
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status in (400, 404):
+        return True
+    return any(cls.__name__ in DATA_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class TokenBucket:
+    """Saniyede ``rate`` jeton üreten, en fazla ``burst`` jeton biriktiren hız sınırlayıcı.
+
+    ``acquire`` jeton yoksa bir sonraki jeton üretilene kadar bekler; tüm iş
+    parçacıkları aynı kovayı paylaştığından toplam istek hızı sınırı aşmaz.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        """Jeton alınana kadar bekler; beklenen süreyi saniye olarak döndürür"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """Art arda ``failure_threshold`` hatada devreyi açar, ``reset_timeout`` sonra tek denemeye izin verir.
+
+    Açıkken istek yapılmaz (çağıran eski veriyi sunar); yarı açık durumdaki
+    deneme başarılı olursa devre kapanır, başarısız olursa süre yeniden başlar.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        """İstek yapılabilirse True; yarı açık durumda yalnızca bir deneme geçer"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class MarketDataClient:
+    """Yahoo ve Asenax çağrılarının tek giriş noktası.
+
+    Her istek bir anahtarla (ör. ``('info', 'THYAO')``) yapılır:
+
+    * Aynı anahtarla eşzamanlı gelen istekler tek uçuştaki çağrıda birleşir,
+      bekleyenler aynı sonucu alır.
+    * Her deneme kaynağın ``TokenBucket``'ından jeton alır; 60 saniyelik
+      döngüler aynı anda tetiklense de istek hızı sınırda kalır.
+    * Hata alan deneme üstel ve rastgele dağıtılmış (full jitter) beklemeyle
+      ``retries`` kez tekrarlanır; sembole özgü hatalar (``is_data_error``)
+      tekrarlanmaz.
+    * Denemeleri tükenen her istek devre kesicide tek hata sayılır; art arda
+      ``failure_threshold`` istek başarısız olursa devre açılır. Devre açıkken
+      ve denemeler tükendiğinde anahtarın son başarılı sonucu (eski veri)
+      döndürülür, yoksa ``MarketDataError`` yükseltilir.
+    """
+
+    def __init__(self, rate=4.0, burst=8, retries=3, backoff=0.5, max_backoff=8.0,
+                 failure_threshold=5, reset_timeout=60, stale_size=512):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.buckets = {'yahoo': TokenBucket(rate, burst), 'asenax': TokenBucket(1.0, 2)}
+        self.breakers = {source: CircuitBreaker(failure_threshold, reset_timeout) for source in self.buckets}
+        self.stale_size = stale_size
+        self._stale = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def request(self, source, key, func, *args, **kwargs):
+        """``func(*args, **kwargs)`` sonucunu birleştirme, hız sınırı, tekrar ve devre kesiciyle döndürür"""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            count('market_data.coalesced')
+            return future.result()
+
+        try:
+            result = self._fetch(source, key, func, args, kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def _fetch(self, source, key, func, args, kwargs):
+        breaker = self.breakers[source]
+        # Devre mantıksal istek başına bir kez sorulur; tekrarlar aynı isteğin parçasıdır
+        if not breaker.allow():
+            count('market_data.circuit_open')
+            return self._serve_stale(key, CircuitOpenError(f"{source} geçici olarak devre dışı"))
+        error = None
+        for attempt in range(self.retries + 1):
+            with span('market_data.rate_wait'):
+                self.buckets[source].acquire()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if is_data_error(e):
+                    # Kaynak yanıt verdi; sembole özgü hata tekrarlanmaz ve kaynak sağlığını etkilemez
+                    breaker.success()
+                    count('market_data.data_error')
+                    return self._serve_stale(key, e)
+                error = e
+                if attempt < self.retries:
+                    count('market_data.retry')
+                    time.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)))
+                continue
+            breaker.success()
+            with self._lock:
+                self._stale[key] = result
+                self._stale.move_to_end(key)
+                while len(self._stale) > self.stale_size:
+                    self._stale.popitem(last=False)
+            return result
+        # Tekrarlar tükendi: istek başına tek hata sayılır
+        breaker.failure()
+        return self._serve_stale(key, error)
+
+    def _serve_stale(self, key, error):
+        with self._lock:
+            result = self._stale.get(key)
+        if result is None:
+            if isinstance(error, MarketDataError):
+                raise error
+            raise MarketDataError(str(error)) from error
+        count('market_data.stale')
+        print(f"Piyasa verisi alınamadı, son alınan veri kullanılıyor ({key[0]} {key[1]}): {error}")
+        return result
+
+    def history(self, symbol, period=None, start=None, interval='1d'):
+        """``Ticker.history`` (``period`` veya ``start`` ile) OHLCV DataFrame'i"""
+        import yfinance as yf
+
+        kwargs = {'period': period} if start is None else {'start': start}
+        return self.request('yahoo', ('history', symbol, period, start, interval),
+                            lambda: yf.Ticker(f"{symbol}.IS").history(interval=interval, **kwargs))
+
+    def info(self, symbol):
+        """``Ticker.info`` temel veri sözlüğü"""
+        import yfinance as yf
+
+        return self.request('yahoo', ('info', symbol), lambda: yf.Ticker(f"{symbol}.IS").info)
+
+    def download(self, tickers, period):
+        """``yf.download`` ile çok sembollü toplu indirme; boş yanıt hata sayılır"""
+        import yfinance as yf
+
+        def call():
+            # yf.download hız sınırında hata yükseltmek yerine boş tablo döndürür
+            data = yf.download(tickers, period=period, group_by="ticker",
+                               auto_adjust=True, threads=True, progress=False)
+            if data is None or data.empty:
+                raise MarketDataError("boş yanıt")
+            return data
+
+        return self.request('yahoo', ('download', tuple(tickers), period), call)
+
+    def get_json(self, url, timeout=ASENAX_TIMEOUT):
+        """Asenax uç noktasından JSON yanıtı"""
+        import requests
+
+        def call():
+            response = requests.get(url, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+
+        return self.request('asenax', ('json', url), call)
+
+
+# Uygulama genelinde paylaşılan istemci; hız sınırı ve devre durumu tüm pencerelerde ortaktır
+client = MarketDataClient()
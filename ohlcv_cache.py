@@ -0,0 +1,175 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from market_data import client
+from perf import count, span, track
+
+CACHE_DIR = 'cache'
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+DTYPE = np.dtype([('ts', '<i8')] + [(field, '<f8') for field in FIELDS])
+
+
+def _period_count(period, suffix):
+    count = period[:-len(suffix)]
+    if not count.isdigit() or int(count) == 0:
+        raise ValueError(f"Geçersiz periyot: {period!r} (ör. 5d, 3mo, 1y, ytd, max)")
+    return int(count)
+
+
+def period_days(period):
+    """Gün periyodunun ('5d') işlem günü sayısı; gün periyodu değilse ValueError"""
+    if not period.endswith('d'):
+        raise ValueError(f"Geçersiz periyot: {period!r} (ör. 5d, 3mo, 1y, ytd, max)")
+    return _period_count(period, 'd')
+
+
+def period_start(period, now=None):
+    """Ay/yıl/ytd/max periyotlarının başlangıç zamanını döndürür; gün periyotları için None.
+
+    Geçersiz periyotta ValueError yükseltilir.
+    """
+    now = now or pd.Timestamp.now(tz='UTC')
+    if period == 'max':
+        return pd.Timestamp(0, tz='UTC')
+    if period == 'ytd':
+        return now.normalize().replace(month=1, day=1)
+    if period.endswith('mo'):
+        return now - pd.DateOffset(months=_period_count(period, 'mo'))
+    if period.endswith('y'):
+        return now - pd.DateOffset(years=_period_count(period, 'y'))
+    period_days(period)
+    return None
+
+
+class OHLCVCache:
+    """Sembol başına OHLCV geçmişini diskte tutar ve yalnızca yeni barları indirir.
+
+    Her sembol bellek eşlemeli okunabilen yapılandırılmış bir NumPy dosyası
+    (``SEMBOL.npy``) ve indirme zamanını tutan bir ``SEMBOL.json`` olarak saklanır.
+    ``ttl`` saniyeden yeni veri doğrudan diskten okunur; daha eski veride son
+    bardan (oluşmakta olan bar dahil) itibaren yalnızca eksik kısım indirilir.
+    Eksikler ``source.history(symbol, period=..., start=...)`` ile alınır.
+    """
+
+    def __init__(self, cache_dir=os.path.join(CACHE_DIR, 'ohlcv'), ttl=300, source=client):
+        self.cache_dir = cache_dir
+        self.source = source
+        self.ttl = ttl
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _lock(self, symbol):
+        with self._locks_lock:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _paths(self, symbol):
+        base = os.path.join(self.cache_dir, symbol)
+        return base + '.npy', base + '.json'
+
+    def _load(self, symbol):
+        data_path, meta_path = self._paths(symbol)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None, None
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            data = np.load(data_path, mmap_mode='r')
+            return data, meta
+        except (OSError, ValueError) as e:
+            print(f"Önbellek okunamadı ({symbol}): {e}")
+            return None, None
+
+    def _save(self, symbol, data, meta):
+        data_path, meta_path = self._paths(symbol)
+        tmp_path = data_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, data)
+        os.replace(tmp_path, data_path)
+        with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    @staticmethod
+    def _to_array(df):
+        df = df.dropna(subset=['Close'])
+        data = np.empty(len(df), dtype=DTYPE)
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is None:
+            index = index.tz_localize('UTC')
+        data['ts'] = index.tz_convert('UTC').as_unit('ns').asi8
+        for field in FIELDS:
+            data[field] = df[field].to_numpy(dtype='f8')
+        return data
+
+    @staticmethod
+    def _to_frame(data, tz):
+        index = pd.to_datetime(np.array(data['ts']), unit='ns', utc=True).tz_convert(tz)
+        index.name = 'Date'
+        return pd.DataFrame({field: np.array(data[field]) for field in FIELDS}, index=index)
+
+    def history(self, symbol, period='3mo'):
+        """Sembolün OHLCV geçmişini döndürür; gerekirse yalnızca eksik barları indirir"""
+        symbol = symbol.upper()
+        with self._lock(symbol):
+            data, meta = self._load(symbol)
+            start = period_start(period)
+            covered = (data is not None and len(data) > 0 and
+                       (start is None or meta['covers_from'] <= start.value))
+            # Gün periyotları işlem günü sayısıdır, önbellekte yeterli bar olmalı
+            if covered and start is None and len(data) < period_days(period):
+                covered = False
+
+            if not covered:
+                # Dosya üzerine yazılmadan önce bellek eşlemesi bırakılır;
+                # Windows'ta eşlenmiş dosyanın yerine yenisi konamaz
+                data = None
+                count('cache.ohlcv.miss')
+                with track('fetch.in_flight'), span('fetch.history'):
+                    df = self.source.history(symbol, period)
+                if df.empty:
+                    return df
+                data = self._to_array(df)
+                meta = {
+                    'fetched_at': time.time(),
+                    'tz': str(df.index.tz or 'UTC'),
+                    'covers_from': start.value if start is not None else int(data['ts'][0]),
+                }
+                self._save(symbol, data, meta)
+            elif time.time() - meta['fetched_at'] > self.ttl:
+                count('cache.ohlcv.stale')
+                # Kopya alınıp eşlemeye son referans bırakılır, sonra dosya değiştirilir
+                data = np.array(data)
+                data = self._update(symbol, data, meta)
+            else:
+                count('cache.ohlcv.hit')
+
+            df = self._to_frame(data, meta['tz'])
+
+        if start is None:
+            return df.iloc[-period_days(period):]
+        return df[df.index >= start]
+
+    def _update(self, symbol, data, meta):
+        """Son bardan itibaren yeni barları indirip önbelleğe ekler"""
+        last_bar = pd.Timestamp(int(data['ts'][-1]), tz='UTC').tz_convert(meta['tz'])
+        with track('fetch.in_flight'), span('fetch.history_update'):
+            delta = self.source.history(symbol, start=last_bar.strftime('%Y-%m-%d'))
+        meta = dict(meta, fetched_at=time.time())
+        if not delta.empty:
+            new = self._to_array(delta)
+            # Oluşmakta olan son bar yeni indirilen değerle değiştirilir
+            data = np.concatenate([data[data['ts'] < new['ts'][0]], new])
+        self._save(symbol, data, meta)
+        return data
+
+    def invalidate(self, symbol):
+        """Sembolün önbelleğini siler"""
+        for path in self._paths(symbol.upper()):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import wraps
+
+# Ölçüm ortam değişkeniyle (BIST_PERF=1) veya tanılama penceresinden açılır
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    __slots__ = ('recorder', 'name', 'start')
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class PerfRecorder:
+    """Sıcak yollar için süre aralıkları (span), sayaçlar ve anlık göstergeler toplar.
+
+    ``span(name)`` bir ``with`` bloğunun süresini, ``timed(name)`` bir
+    fonksiyonun her çağrısını ölçer; ``count`` önbellek isabeti gibi olayları
+    sayar, ``track`` süren iş sayısını (ör. uçuştaki istekler) tutar. Kapalıyken
+    ``span`` paylaşılan boş bir bağlam döndürür ve diğerleri tek bir bayrak
+    kontrolüyle çıkar, böylece ölçüm noktaları kodda kalabilir.
+
+    Her ad için son ``window`` süre p50/p95 hesabı için saklanır; açıkken
+    kaydedilen aralıklar ``export_trace`` ile Chrome/Perfetto iz dosyasına yazılır.
+    """
+
+    def __init__(self, enabled=False, window=1000, max_events=50000):
+        self.enabled = enabled
+        self.window = window
+        self.samples = {}
+        self.totals = {}
+        self.counters = {}
+        self.gauges = {}
+        self.events = deque(maxlen=max_events)
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def timed(self, name=None):
+        """Fonksiyonun her çağrısını ``name`` (varsayılan modül.fonksiyon) adıyla ölçen dekoratör"""
+        def decorator(func):
+            label = name or f"{func.__module__}.{func.__qualname__}"
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(label, start, time.perf_counter())
+            return wrapper
+        return decorator
+
+    def record(self, name, start, end):
+        """Tamamlanan bir aralığı kaydeder"""
+        duration = end - start
+        with self._lock:
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+                self.totals[name] = [0, 0.0]
+            samples.append(duration)
+            total = self.totals[name]
+            total[0] += 1
+            total[1] += duration
+        self.events.append((name, start, duration, threading.get_ident()))
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def track(self, name):
+        """Blok süresince ``name`` göstergesini bir artıran bağlam (ör. uçuştaki istekler)"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Gauge(self, name)
+
+    def _adjust(self, name, delta):
+        with self._lock:
+            self.gauges[name] = self.gauges.get(name, 0) + delta
+        self.events.append((name, time.perf_counter(), None, self.gauges[name]))
+
+    def stats(self):
+        """Ad başına {count, p50, p95, max, total} (süreler saniye) döndürür"""
+        with self._lock:
+            snapshot = {name: (sorted(samples), *self.totals[name]) for name, samples in self.samples.items()}
+        result = {}
+        for name, (ordered, count, total) in sorted(snapshot.items()):
+            n = len(ordered)
+            result[name] = {
+                'count': count,
+                'p50': ordered[(n - 1) // 2],
+                'p95': ordered[min(int(n * 0.95), n - 1)],
+                'max': ordered[-1],
+                'total': total,
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self.samples.clear()
+            self.totals.clear()
+            self.counters.clear()
+            # Süren işlerin göstergeleri sıfırlanırsa çıkışta eksiye düşer
+            self.gauges = {name: value for name, value in self.gauges.items() if value}
+        self.events.clear()
+
+    def export_trace(self, path):
+        """Kaydedilen aralıkları Chrome iz biçiminde (chrome://tracing, Perfetto) yazar; olay sayısını döndürür"""
+        pid = os.getpid()
+        events = []
+        for name, start, duration, extra in list(self.events):
+            ts = (start - self._origin) * 1e6
+            if duration is None:
+                events.append({'name': name, 'ph': 'C', 'ts': ts, 'pid': pid, 'args': {'value': extra}})
+            else:
+                events.append({'name': name, 'cat': name.split('.', 1)[0], 'ph': 'X', 'ts': ts,
+                               'dur': duration * 1e6, 'pid': pid, 'tid': extra})
+        events.extend({'name': name, 'ph': 'C', 'ts': (time.perf_counter() - self._origin) * 1e6,
+                       'pid': pid, 'args': {'value': value}} for name, value in sorted(self.counters.items()))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+class _Gauge:
+    __slots__ = ('recorder', 'name')
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.recorder._adjust(self.name, 1)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder._adjust(self.name, -1)
+        return False
+
+
+perf = PerfRecorder(enabled=os.environ.get('BIST_PERF', '') not in ('', '0'))
+span = perf.span
+timed = perf.timed
+count = perf.count
+track = perf.track
@@ -1,13 +1,51 @@
 
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
 
+from perf import span, timed
+
 class Portfolio:
-    def __init__(self):
-        self.conn = sqlite3.connect('portfolio.db')
+    def __init__(self, db_path='portfolio.db'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        # WAL: okuyucular yazarları beklemez, commit başına fsync azalır
+        if db_path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._batch_depth = 0
         self.create_tables()
         self.create_watchlist_table()
-        
+
+    def _commit(self):
+        """Toplu işlem (batch) içinde değilse değişiklikleri kaydeder"""
+        if self._batch_depth == 0:
+            with span('db.commit'):
+                self.conn.commit()
+
+    @contextmanager
+    def batch(self):
+        """Bloktaki tüm yazmaları tek bir transaction'da toplar; hata olursa geri alır.
+
+        İç içe kullanılabilir, commit yalnızca en dıştaki blok bittiğinde yapılır.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.rollback()
+            raise
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            with span('db.commit'):
+                self.conn.commit()
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır"""
+        self.conn.close()
+
     def create_tables(self):
         cursor = self.conn.cursor()
         cursor.execute('''
@@ -19,7 +57,21 @@ class Portfolio:
             quantity INTEGER NOT NULL,
             date TEXT NOT NULL
         )''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_transactions_symbol_date ON transactions(symbol, date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date)')
+        # İşlem eklendikçe güncellenen sembol başına pozisyon özeti
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS positions (
+            symbol TEXT PRIMARY KEY,
+            quantity INTEGER NOT NULL,
+            cost REAL NOT NULL,
+            last_date TEXT NOT NULL
+        )''')
         self.conn.commit()
+        # Eski veritabanlarında pozisyonlar işlem geçmişinden bir kez oluşturulur
+        if (cursor.execute('SELECT 1 FROM positions LIMIT 1').fetchone() is None and
+                cursor.execute('SELECT 1 FROM transactions LIMIT 1').fetchone() is not None):
+            self.rebuild_positions()
         
     def create_watchlist_table(self):
         """İzleme listesi tablosunu oluşturur"""
@@ -32,6 +84,7 @@ class Portfolio:
         )''')
         self.conn.commit()
         
+    @timed('db.add_to_watchlist')
     def add_to_watchlist(self, symbol):
         """İzleme listesine hisse ekler"""
         cursor = self.conn.cursor()
@@ -40,23 +93,26 @@ class Portfolio:
             INSERT INTO watchlist (symbol, added_at)
             VALUES (?, ?)
             ''', (symbol.upper(), datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-            self.conn.commit()
+            self._commit()
             return True
         except sqlite3.IntegrityError:
             return False
             
+    @timed('db.remove_from_watchlist')
     def remove_from_watchlist(self, symbol):
         """İzleme listesinden hisse çıkarır"""
         cursor = self.conn.cursor()
         cursor.execute('DELETE FROM watchlist WHERE symbol=?', (symbol.upper(),))
-        self.conn.commit()
+        self._commit()
         
+    @timed('db.get_watchlist')
     def get_watchlist(self):
         """İzleme listesini getirir"""
         cursor = self.conn.cursor()
         cursor.execute('SELECT symbol, added_at FROM watchlist ORDER BY added_at DESC')
         return cursor.fetchall()
         
+    @timed('db.add_transaction')
     def add_transaction(self, symbol, operation, price, quantity, date=None):
         cursor = self.conn.cursor()
         if date is None:
@@ -65,32 +121,102 @@ class Portfolio:
         INSERT INTO transactions (symbol, operation, price, quantity, date)
         VALUES (?, ?, ?, ?, ?)
         ''', (symbol.upper(), operation, price, quantity, date))
-        self.conn.commit()
+        self._update_positions([(symbol.upper(), operation, price, quantity, date)])
+        self._commit()
+
+    def _update_positions(self, rows):
+        """Yeni işlemlerin etkisini pozisyon tablosuna ekler (sembol başına tek upsert)"""
+        deltas = {}
+        for symbol, operation, price, quantity, date in rows:
+            sign = 1 if operation == 'BUY' else -1
+            d_quantity, d_cost, last_date = deltas.get(symbol, (0, 0.0, date))
+            deltas[symbol] = (d_quantity + sign * quantity, d_cost + sign * price * quantity,
+                              max(last_date, date))
+        self.conn.executemany('''
+        INSERT INTO positions (symbol, quantity, cost, last_date)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(symbol) DO UPDATE SET
+            quantity = quantity + excluded.quantity,
+            cost = cost + excluded.cost,
+            last_date = MAX(last_date, excluded.last_date)
+        ''', [(symbol, *delta) for symbol, delta in deltas.items()])
+
+    @timed('db.add_transactions')
+    def add_transactions(self, rows):
+        """Çok sayıda işlemi tek transaction'da ``executemany`` ile ekler.
+
+        rows: (symbol, operation, price, quantity, date) demetleri; date None
+        ise şimdiki zaman kullanılır. Eklenen satır sayısını döndürür.
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        params = [(symbol.upper(), operation, price, quantity, date or now)
+                  for symbol, operation, price, quantity, date in rows]
+        with self.batch():
+            self.conn.executemany('''
+            INSERT INTO transactions (symbol, operation, price, quantity, date)
+            VALUES (?, ?, ?, ?, ?)
+            ''', params)
+            self._update_positions(params)
+        return len(params)
         
+    @timed('db.get_portfolio')
     def get_portfolio(self):
         cursor = self.conn.cursor()
         cursor.execute('''
-        WITH PortfolioSummary AS (
-            SELECT 
-                symbol,
-                SUM(CASE WHEN operation='BUY' THEN quantity ELSE -quantity END) as total_quantity,
-                SUM(CASE WHEN operation='BUY' THEN price*quantity ELSE -price*quantity END) as total_cost,
-                MAX(date) as last_transaction_date
-            FROM transactions
-            GROUP BY symbol
-            HAVING total_quantity > 0
-        )
         SELECT 
             symbol,
-            total_quantity,
-            ABS(total_cost) as total_cost,
-            last_transaction_date,
-            ABS(total_cost/total_quantity) as avg_cost
-        FROM PortfolioSummary
-        ORDER BY last_transaction_date DESC
+            quantity as total_quantity,
+            ABS(cost) as total_cost,
+            last_date as last_transaction_date,
+            ABS(cost/quantity) as avg_cost
+        FROM positions
+        WHERE quantity > 0
+        ORDER BY last_date DESC
         ''')
         return cursor.fetchall()
+
+    def _ledger_positions(self):
+        """Pozisyonları işlem geçmişinin tamamından hesaplar (doğrulama için)"""
+        cursor = self.conn.cursor()
+        cursor.execute('''
+        SELECT 
+            symbol,
+            SUM(CASE WHEN operation='BUY' THEN quantity ELSE -quantity END),
+            SUM(CASE WHEN operation='BUY' THEN price*quantity ELSE -price*quantity END),
+            MAX(date)
+        FROM transactions
+        GROUP BY symbol
+        ''')
+        return cursor.fetchall()
+
+    @timed('db.rebuild_positions')
+    def rebuild_positions(self):
+        """Pozisyon tablosunu işlem geçmişinden yeniden oluşturur"""
+        with self.batch():
+            self.conn.execute('DELETE FROM positions')
+            self.conn.executemany('''
+            INSERT INTO positions (symbol, quantity, cost, last_date)
+            VALUES (?, ?, ?, ?)
+            ''', self._ledger_positions())
+
+    def verify_positions(self, tolerance=1e-6):
+        """Pozisyon tablosunu işlem geçmişiyle karşılaştırır; uyuşmayanları döndürür.
+
+        Her uyuşmazlık (symbol, beklenen, kayıtlı) biçimindedir; beklenen veya
+        kayıtlı taraf eksikse None olur.
+        """
+        expected = {row[0]: row[1:] for row in self._ledger_positions()}
+        actual = {row[0]: row[1:] for row in
+                  self.conn.execute('SELECT symbol, quantity, cost, last_date FROM positions')}
+        mismatches = []
+        for symbol in sorted(expected.keys() | actual.keys()):
+            e, a = expected.get(symbol), actual.get(symbol)
+            if (e is None or a is None or e[0] != a[0] or e[2] != a[2] or
+                    abs(e[1] - a[1]) > tolerance * max(1.0, abs(e[1]))):
+                mismatches.append((symbol, e, a))
+        return mismatches
         
+    @timed('db.get_transactions')
     def get_transactions(self, symbol=None):
         cursor = self.conn.cursor()
         if symbol:
@@ -99,15 +225,16 @@ class Portfolio:
             cursor.execute('SELECT * FROM transactions ORDER BY date DESC')
         return cursor.fetchall()
 
+    @timed('db.get_portfolio_summary')
     def get_portfolio_summary(self):
         """Portföy özet bilgilerini döndürür"""
         cursor = self.conn.cursor()
         cursor.execute('''
         SELECT 
-            COUNT(DISTINCT symbol) as total_stocks,
-            SUM(CASE WHEN operation='BUY' THEN price*quantity ELSE -price*quantity END) as total_investment,
-            SUM(CASE WHEN operation='BUY' THEN quantity ELSE -quantity END) as total_shares
-        FROM transactions
+            COUNT(*) as total_stocks,
+            SUM(cost) as total_investment,
+            SUM(quantity) as total_shares
+        FROM positions
         ''')
         return cursor.fetchone()
 
@@ -123,17 +250,26 @@ class Portfolio:
             active INTEGER DEFAULT 1,
             created_at TEXT NOT NULL
         )''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_alarms_active ON alarms(active)')
+        # İfade alarmları (condition='EXPR') için sonradan eklenen sütun
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(alarms)')]
+        if 'expression' not in columns:
+            cursor.execute('ALTER TABLE alarms ADD COLUMN expression TEXT')
         self.conn.commit()
 
-    def add_alarm(self, symbol, target_price, condition):
-        """Yeni alarm ekler"""
+    @timed('db.add_alarm')
+    def add_alarm(self, symbol, target_price, condition, expression=None):
+        """Yeni alarm ekler, alarm id'sini döndürür; condition 'EXPR' ise expression kullanılır"""
         cursor = self.conn.cursor()
         cursor.execute('''
-        INSERT INTO alarms (symbol, target_price, condition, created_at)
-        VALUES (?, ?, ?, ?)
-        ''', (symbol.upper(), target_price, condition, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-        self.conn.commit()
+        INSERT INTO alarms (symbol, target_price, condition, created_at, expression)
+        VALUES (?, ?, ?, ?, ?)
+        ''', (symbol.upper(), target_price, condition, datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+              expression))
+        self._commit()
+        return cursor.lastrowid
 
+    @timed('db.get_alarms')
     def get_alarms(self, active_only=True):
         """Alarmları getirir"""
         cursor = self.conn.cursor()
@@ -143,8 +279,9 @@ class Portfolio:
             cursor.execute('SELECT * FROM alarms')
         return cursor.fetchall()
 
+    @timed('db.deactivate_alarm')
     def deactivate_alarm(self, alarm_id):
         """Alarmı deaktif eder"""
         cursor = self.conn.cursor()
         cursor.execute('UPDATE alarms SET active=0 WHERE id=?', (alarm_id,))
-        self.conn.commit()
+        self._commit()
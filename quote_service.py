@@ -0,0 +1,127 @@
+from datetime import datetime
+
+from market_data import MarketDataError, client
+from perf import span, timed, track
+
+
+def download_batch(symbols, period="5d", chunk_size=100):
+    """Sembolleri parçalar halinde toplu indirir; sembol -> OHLCV DataFrame döndürür"""
+    symbols = sorted({s.upper() for s in symbols})
+    frames = {}
+    for i in range(0, len(symbols), chunk_size):
+        chunk = symbols[i:i + chunk_size]
+        tickers = [f"{symbol}.IS" for symbol in chunk]
+        try:
+            data = client.download(tickers, period)
+        except MarketDataError as e:
+            print(f"Fiyat verisi alınamadı ({chunk[0]}...{chunk[-1]}): {e}")
+            continue
+        for symbol, ticker in zip(chunk, tickers):
+            try:
+                if data.columns.nlevels > 1:
+                    if ticker not in data.columns.get_level_values(0):
+                        continue
+                    hist = data[ticker]
+                else:
+                    hist = data
+                hist = hist.dropna(subset=['Close'])
+                if not hist.empty:
+                    frames[symbol] = hist
+            except Exception as e:
+                print(f"Fiyat verisi işlenemedi ({symbol}): {e}")
+    return frames
+
+
+class QuoteService:
+    """Pencerelerin fiyat isteklerini tek bir toplu indirmede birleştirir.
+
+    Her pencere izlediği sembolleri veren bir fonksiyon ve güncel fiyatlar
+    geldiğinde çağrılacak bir callback ile abone olur. Her güncellemede tüm
+    abonelerin sembolleri tekilleştirilir, tek bir toplu indirme çağrısı
+    yapılır ve aynı fiyat görüntüsü (snapshot) tüm abonelere dağıtılır.
+    """
+
+    def __init__(self, period="5d", download=download_batch):
+        self.period = period
+        # Toplu indirme fonksiyonu; testlerde ve ölçümlerde yerel kaynakla değiştirilebilir
+        self.download = download
+        self.subscribers = {}
+        self.snapshot = {}
+        self.last_update = None
+
+    def subscribe(self, key, symbols_func, callback):
+        """Bir pencereyi abone yapar; symbols_func izlenen sembolleri döndürür"""
+        self.subscribers[key] = (symbols_func, callback)
+
+    def unsubscribe(self, key):
+        """Aboneliği kaldırır"""
+        self.subscribers.pop(key, None)
+
+    def requested_symbols(self):
+        """Tüm abonelerin istediği sembolleri tekilleştirip döndürür"""
+        symbols = set()
+        for symbols_func, _ in list(self.subscribers.values()):
+            try:
+                symbols.update(s.upper() for s in symbols_func())
+            except Exception as e:
+                print(f"Sembol listesi alınamadı: {e}")
+        return sorted(symbols)
+
+    def fetch(self, symbols):
+        """Verilen semboller için tek bir toplu indirme yapar ve fiyatları döndürür"""
+        quotes = {}
+        with track('fetch.in_flight'), span('fetch.quotes'):
+            frames = self.download(symbols, self.period)
+        for symbol, hist in frames.items():
+            try:
+                current_price = float(hist['Close'].iloc[-1])
+                prev_price = float(hist['Close'].iloc[-2]) if len(hist) > 1 else current_price
+                change = current_price - prev_price
+                quotes[symbol] = {
+                    'price': current_price,
+                    'open': float(hist['Open'].iloc[-1]),
+                    'high': float(hist['High'].iloc[-1]),
+                    'low': float(hist['Low'].iloc[-1]),
+                    'prev_close': prev_price,
+                    'change': change,
+                    'change_percent': (change / prev_price) * 100 if prev_price != 0 else 0,
+                    'volume': float(hist['Volume'].iloc[-1]),
+                    'date': hist.index[-1],
+                }
+            except Exception as e:
+                print(f"Fiyat verisi işlenemedi ({symbol}): {e}")
+        return quotes
+
+    @timed('quotes.publish')
+    def publish(self, quotes):
+        """Yeni fiyatları snapshot'a ekler ve tüm abonelere dağıtır"""
+        self.snapshot.update(quotes)
+        self.last_update = datetime.now()
+        for key, (_, callback) in list(self.subscribers.items()):
+            try:
+                callback(self.snapshot)
+            except Exception as e:
+                print(f"Fiyat aboneliği güncellenemedi ({key}): {e}")
+
+    def refresh(self):
+        """Tüm abonelerin sembollerini tek seferde çeker ve dağıtır"""
+        symbols = self.requested_symbols()
+        if symbols:
+            self.publish(self.fetch(symbols))
+        return self.snapshot
+
+    def missing(self, symbols):
+        """Snapshot'ta henüz olmayan sembolleri döndürür"""
+        return sorted(s for s in {s.upper() for s in symbols} if s not in self.snapshot)
+
+    def ensure(self, symbols):
+        """Snapshot'ta olmayan sembolleri eşzamanlı olarak çeker"""
+        missing = self.missing(symbols)
+        if missing:
+            self.snapshot.update(self.fetch(missing))
+        return self.snapshot
+
+    def get_price(self, symbol):
+        """Sembolün son fiyatını döndürür, yoksa None"""
+        quote = self.snapshot.get(symbol.upper())
+        return quote['price'] if quote else None
@@ -0,0 +1,82 @@
+import argparse
+
+import pandas as pd
+
+from indicators import build_panels, latest_values, panel_indicators
+from quote_service import download_batch
+
+TABLO_SUTUNLARI = ('Close', 'Değişim %', 'RSI', 'MACD', 'MACD_signal', 'EMA_20', 'SMA_50',
+                   'EMA_200', 'BB_lower', 'Hacim/Ort', 'Puan', 'Sinyal')
+
+
+def sinyal_puani(son, ortalama_hacim):
+    """analiz_et'teki al sinyali puanını hesaplar.
+
+    ``son`` tek bir barın göstergeleri (Series/sözlük) veya her satırı bir sembol
+    olan bir tablo olabilir; tablo verilirse puanlar sembol başına döner.
+    """
+    kosullar = [
+        son['RSI'] < 35,
+        son['MACD'] > son['MACD_signal'],
+        son['Close'] > son['EMA_20'],
+        son['Close'] > son['SMA_50'],
+        son['Close'] > son['EMA_200'],
+        son['Close'] < son['BB_lower'],
+        son['Volume'] > ortalama_hacim * 1.5,  # Ortalamanın 1.5 katından fazla hacim
+    ]
+    return sum(kosul * 1 for kosul in kosullar)
+
+
+def sinyal_etiketi(puan):
+    """Sinyal puanını analiz_et'teki değerlendirme etiketine çevirir"""
+    if puan >= 4:
+        return "GÜÇLÜ AL"
+    elif puan >= 2:
+        return "Orta AL"
+    elif puan == 1:
+        return "Zayıf AL"
+    return "Satış baskısı"
+
+
+def puanla(frames):
+    """Sembol -> OHLCV sözlüğündeki tüm sembolleri tek geçişte puanlar, sıralı tablo döndürür"""
+    if not frames:
+        return pd.DataFrame(columns=TABLO_SUTUNLARI)
+
+    close, high, low, volume = build_panels(frames)
+    tablo = latest_values(close, volume, panel_indicators(close, high, low, volume))
+
+    onceki = pd.Series({symbol: df['Close'].iloc[-2] if len(df) > 1 else df['Close'].iloc[-1]
+                        for symbol, df in frames.items()})
+    tablo['Değişim %'] = (tablo['Close'] / onceki - 1) * 100
+    tablo['Hacim/Ort'] = tablo['Volume'] / tablo['Volume_mean']
+    tablo['Puan'] = sinyal_puani(tablo, tablo['Volume_mean']).astype(int)
+    tablo['Sinyal'] = tablo['Puan'].map(sinyal_etiketi)
+    tablo.index.name = 'Hisse'
+    return tablo.sort_values(['Puan', 'RSI'], ascending=[False, True])[list(TABLO_SUTUNLARI)]
+
+
+def piyasa_taramasi(symbols, period='1y', chunk_size=100, download=None):
+    """Sembolleri toplu indirip analiz_et sinyal puanına göre tarar.
+
+    ``download(symbols, period)`` verilirse (ör. bir veri sağlayıcının
+    ``download`` yöntemi) indirme onunla yapılır.
+    """
+    if download is not None:
+        return puanla(download(symbols, period))
+    return puanla(download_batch(symbols, period=period, chunk_size=chunk_size))
+
+
+if __name__ == "__main__":
+    from symbols import get_bist_hisse_listesi
+
+    parser = argparse.ArgumentParser(description="BIST piyasa taraması")
+    parser.add_argument('--period', default='1y', help="İndirme periyodu (EMA 200 için en az 1y)")
+    parser.add_argument('--top', type=int, default=30, help="Gösterilecek satır sayısı")
+    parser.add_argument('symbols', nargs='*', help="Taranacak hisseler (boşsa tüm BIST)")
+    args = parser.parse_args()
+
+    sonuc = piyasa_taramasi(args.symbols or get_bist_hisse_listesi(), period=args.period)
+    with pd.option_context('display.max_rows', None, 'display.width', 200,
+                           'display.float_format', '{:.2f}'.format):
+        print(sonuc.head(args.top))
@@ -0,0 +1,268 @@
+import csv
+import os
+from collections import Counter
+from datetime import datetime
+from itertools import chain, islice
+
+from portfolio import Portfolio
+
+# Aracı kurum dökümlerindeki sütun adları (sadeleştirilmiş) -> alan
+COLUMN_ALIASES = {
+    'symbol': ('symbol', 'sembol', 'hisse', 'hisse kodu', 'menkul', 'kod', 'enstruman'),
+    'operation': ('operation', 'islem', 'islem tipi', 'yon', 'side', 'al/sat'),
+    'price': ('price', 'fiyat', 'islem fiyati', 'gerceklesen fiyat'),
+    'quantity': ('quantity', 'adet', 'miktar', 'lot', 'gerceklesen adet'),
+    'date': ('date', 'tarih', 'islem tarihi', 'zaman'),
+}
+
+OPERATIONS = {
+    'buy': 'BUY', 'b': 'BUY', 'al': 'BUY', 'alis': 'BUY', 'a': 'BUY',
+    'sell': 'SELL', 's': 'SELL', 'sat': 'SELL', 'satis': 'SELL',
+}
+
+_TR_ASCII = str.maketrans('çğıİöşüÇĞIÖŞÜ', 'cgiiosucgiosu')
+
+DATE_FORMATS = (
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d',
+    '%d.%m.%Y %H:%M:%S', '%d.%m.%Y %H:%M', '%d.%m.%Y',
+    '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y',
+)
+
+# Hata listesinde tutulacak en fazla satır; bellek dosya boyutundan bağımsız kalır
+MAX_ERRORS = 100
+
+
+def sadelestir(text):
+    """Türkçe karakterleri ASCII'ye çevirip küçük harfe indirir ('İşlem' -> 'islem')"""
+    return str(text or '').strip().translate(_TR_ASCII).lower()
+
+
+def _number_text(value):
+    return str(value).strip().replace(' ', '').replace('TL', '')
+
+
+def decimal_hint(value, integer=False):
+    """Tek bir değerin ondalık ayırıcıyı kesin olarak gösterip göstermediğine bakar.
+
+    ',' veya '.' döndürür; '12,500' gibi tek ayırıcı ve ardından tam üç rakam
+    içeren fiyatlar iki biçimde de okunabildiğinden None döner. Adetler tam
+    sayı olduğundan (``integer``) böyle bir ayırıcı binlik ayırıcıdır.
+    """
+    if value is None or isinstance(value, (int, float)):
+        return None
+    text = _number_text(value)
+    comma, dot = text.rfind(','), text.rfind('.')
+    if comma < 0 and dot < 0:
+        return None
+    if comma >= 0 and dot >= 0:
+        return text[max(comma, dot)]
+    sep = ',' if comma >= 0 else '.'
+    other = '.' if sep == ',' else ','
+    if text.count(sep) > 1:
+        # '1.234.567': tekrar eden ayırıcı yalnızca binlik olabilir
+        return other
+    whole, fraction = text.split(sep)
+    whole = whole.lstrip('+-')
+    if len(fraction) == 3 and 1 <= len(whole) <= 3 and whole != '0':
+        return other if integer else None
+    return sep
+
+
+def detect_decimal(rows, mapping, default=','):
+    """Satırların fiyat ve adet sütunlarından dökümün ondalık ayırıcısını bulur.
+
+    Kesin bilgi veren değerlerde çoğunluk alınır; hiçbiri yoksa (veya eşitlikte)
+    aracı kurum dökümleri Türkçe olduğundan ``default`` kullanılır.
+    """
+    votes = {',': 0, '.': 0}
+    for row in rows:
+        for field, integer in (('price', False), ('quantity', True)):
+            try:
+                hint = decimal_hint(row[mapping[field]], integer)
+            except (IndexError, ValueError):
+                continue
+            if hint:
+                votes[hint] += 1
+    if votes[','] == votes['.']:
+        return default
+    return max(votes, key=votes.get)
+
+
+def parse_number(value, integer=False, decimal=None):
+    """'1.234,56', '1,234.56', '1234.56' veya sayı değerini float'a çevirir.
+
+    ``decimal`` ondalık ayırıcıdır (',' veya '.'), diğer karakter binlik ayırıcı
+    sayılır; dökümlerde dosya başına bir kez ``detect_decimal`` ile bulunur.
+    Verilmezse değerin kendisinden (``decimal_hint``) çıkarılır, belirsizse
+    ',' kabul edilir. Binlik gruplaması bozuk değerler reddedilir.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = _number_text(value)
+    decimal = decimal or decimal_hint(text, integer) or ','
+    thousands = '.' if decimal == ',' else ','
+    if text.count(decimal) > 1:
+        raise ValueError(f"birden fazla ondalık ayırıcı: {text!r}")
+    whole, _, fraction = text.partition(decimal)
+    groups = whole.lstrip('+-').split(thousands)
+    if len(groups) > 1 and (not 1 <= len(groups[0]) <= 3 or any(len(g) != 3 for g in groups[1:])):
+        raise ValueError(f"binlik ayırıcı hatalı: {text!r}")
+    number = float(whole.replace(thousands, '') + ('.' + fraction if fraction else ''))
+    if integer and number != int(number):
+        raise ValueError(f"tam sayı bekleniyordu: {text!r}")
+    return number
+
+
+def parse_date(value):
+    """Döküm tarihini veritabanı biçimine ('%Y-%m-%d %H:%M:%S') çevirir"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    text = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            continue
+    raise ValueError(f"tarih anlaşılamadı: {text!r}")
+
+
+def map_columns(header):
+    """Başlık satırındaki sütunların hangi alana karşılık geldiğini bulur"""
+    mapping = {}
+    for i, name in enumerate(header):
+        key = sadelestir(name)
+        for field, aliases in COLUMN_ALIASES.items():
+            if key in aliases and field not in mapping:
+                mapping[field] = i
+    missing = [field for field in COLUMN_ALIASES if field not in mapping]
+    if missing:
+        raise ValueError(f"Dökümde eksik sütunlar: {', '.join(missing)}")
+    return mapping
+
+
+def parse_row(row, mapping, decimal=None):
+    """Bir döküm satırını (symbol, operation, price, quantity, date) demetine çevirir"""
+    symbol = str(row[mapping['symbol']] or '').strip().upper()
+    if symbol.endswith('.IS'):
+        symbol = symbol[:-3]
+    if not symbol:
+        raise ValueError("sembol boş")
+
+    operation = OPERATIONS.get(sadelestir(row[mapping['operation']]))
+    if operation is None:
+        raise ValueError(f"işlem tipi anlaşılamadı: {row[mapping['operation']]!r}")
+
+    price = parse_number(row[mapping['price']], decimal=decimal)
+    quantity = parse_number(row[mapping['quantity']], integer=True, decimal=decimal)
+    if price <= 0 or quantity <= 0 or quantity != int(quantity):
+        raise ValueError(f"geçersiz fiyat/adet: {price} / {quantity}")
+
+    return symbol, operation, price, int(quantity), parse_date(row[mapping['date']])
+
+
+def read_rows(path):
+    """Döküm dosyasının satırlarını (başlık dahil) tek tek üretir; CSV veya XLSX"""
+    if os.path.splitext(path)[1].lower() in ('.xlsx', '.xlsm'):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ImportError("XLSX dökümleri için openpyxl kurulu olmalı (pip install openpyxl)")
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+        return
+
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=';,\t')
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(f, dialect)
+
+
+def _insert_new(portfolio, rows, last_id):
+    """Parçadaki işlemlerden içe aktarma öncesinde kayıtlı olmayan kopyaları ekler.
+
+    Aynı dökümde birebir aynı iki dolum olabileceğinden satırlar birleştirilmez:
+    parçada N kez geçen ve içe aktarma başlamadan önce (``id <= last_id``) M kez
+    kayıtlı olan her doğal anahtar için N-M satır eklenir; döküm tekrar içe
+    aktarılırsa hiçbir şey eklenmez. Sayım (symbol, date) indeksiyle yapılır,
+    bellekte yalnızca parça tutulur.
+    """
+    conn = portfolio.conn
+    new_rows = []
+    for key, n in Counter(rows).items():
+        symbol, operation, price, quantity, date = key
+        m = conn.execute('''
+        SELECT COUNT(*) FROM transactions
+        WHERE symbol = ? AND date = ? AND operation = ? AND price = ? AND quantity = ? AND id <= ?
+        ''', (symbol, date, operation, price, quantity, last_id)).fetchone()[0]
+        new_rows.extend([key] * (n - m))
+    with portfolio.batch():
+        portfolio.add_transactions(new_rows)
+    return len(new_rows)
+
+
+def import_statement(path, portfolio, chunk_size=10000, progress=None):
+    """Aracı kurum dökümünü parça parça okuyup portföye ekler.
+
+    Satırlar doğrulanır; sembol, işlem tipi, fiyat, adet ve tarihten oluşan doğal
+    anahtarı zaten kayıtlı olan işlemler (kayıtlı adet kadar) atlanır, böylece aynı
+    döküm tekrar içe aktarılabilir. Ondalık ayırıcı ilk parçanın satırlarından bir
+    kez belirlenir ve tüm dosyaya uygulanır. Her parça ayrı bir transaction'da
+    yazılır ve bellekte yalnızca bir parça tutulur; aynı zamanlı dolumlar parçalar
+    arasında bölünmez. ``progress`` verilirse her parçadan sonra sonuç sözlüğüyle
+    çağrılır.
+    """
+    result = {'read': 0, 'inserted': 0, 'duplicates': 0, 'invalid': 0, 'errors': []}
+    rows = read_rows(path)
+    header = next(rows, None)
+    if header is None:
+        return result
+    mapping = map_columns(header)
+    head = list(islice(rows, chunk_size))
+    decimal = detect_decimal(head, mapping)
+    # Yalnızca içe aktarma öncesindeki kayıtlar yinelenen sayılır
+    last_id = portfolio.conn.execute('SELECT COALESCE(MAX(id), 0) FROM transactions').fetchone()[0]
+
+    chunk = []
+
+    def flush():
+        inserted = _insert_new(portfolio, chunk, last_id)
+        result['inserted'] += inserted
+        result['duplicates'] += len(chunk) - inserted
+        chunk.clear()
+        if progress:
+            progress(result)
+
+    for line_no, row in enumerate(chain(head, rows), start=2):
+        if not any(cell not in (None, '') for cell in row):
+            continue
+        result['read'] += 1
+        try:
+            parsed = parse_row(row, mapping, decimal)
+        except (ValueError, IndexError, TypeError) as e:
+            result['invalid'] += 1
+            if len(result['errors']) < MAX_ERRORS:
+                result['errors'].append(f"Satır {line_no}: {e}")
+            continue
+        # Parça sınırı tarih değişiminde: aynı anahtarın kopyaları aynı parçada sayılır
+        if len(chunk) >= chunk_size and parsed[4] != chunk[-1][4]:
+            flush()
+        chunk.append(parsed)
+    if chunk:
+        flush()
+    return result
+
+
+def import_statement_file(path, db_path='portfolio.db', chunk_size=10000):
+    """Dökümü kendi bağlantısıyla içe aktarır; arka plan iş parçacıkları içindir"""
+    portfolio = Portfolio(db_path)
+    try:
+        return import_statement(path, portfolio, chunk_size)
+    finally:
+        portfolio.close()
@@ -0,0 +1,80 @@
+import json
+import os
+import time
+
+from market_data import client
+from perf import span, track
+
+ASENAX_LIST_URL = "https://api.asenax.com/bist/list/"
+
+# Son başarılı indirmenin kopyası; uygulama açılırken ağ beklenmeden kullanılır
+SYMBOL_LIST_PATH = os.path.join('cache', 'bist_list.json')
+SYMBOL_LIST_TTL = 86400
+
+# Varsayılan hisse listesi
+DEFAULT_HISSELER = [
+    'THYAO', 'AKBNK', 'GARAN', 'ISCTR', 'KOZAA', 'SASA', 'ASELS', 'TCELL', 'PETKM', 'TUPRS',
+    'KCHOL', 'ARCLK', 'BIMAS', 'EREGL', 'FROTO', 'HALKB', 'KRDMD', 'SAHOL', 'SISE', 'TKFEN',
+    'TOASO', 'VAKBN', 'YKBNK', 'AKSA', 'ALARK', 'ANACM', 'ASUZU', 'BERA', 'BRISA', 'DOHOL'
+]
+
+
+def load_cached_hisse_listesi(path=SYMBOL_LIST_PATH):
+    """Diskteki hisse listesini ve indirilme zamanını döndürür; yoksa (None, None)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('symbols'):
+            return cached['symbols'], cached['fetched_at']
+    except (OSError, ValueError, KeyError) as e:
+        if os.path.exists(path):
+            print(f"Hisse listesi önbelleği okunamadı: {e}")
+    return None, None
+
+
+def save_hisse_listesi(hisseler, path=SYMBOL_LIST_PATH):
+    """Hisse listesini indirilme zamanıyla birlikte diske yazar"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'fetched_at': time.time(), 'symbols': hisseler}, f)
+    os.replace(tmp_path, path)
+
+
+def fetch_bist_hisse_listesi():
+    """Asenax API'den hisse listesini çeker ve önbelleğe yazar; başarısız olursa None"""
+    try:
+        with track('fetch.in_flight'), span('fetch.symbol_list'):
+            data = client.get_json(ASENAX_LIST_URL)
+
+        # 'data' içindeki 'kod' alanlarını al ve listeye ekle
+        if data["code"] == "0":
+            hisseler = [item["kod"] for item in data["data"] if "kod" in item]
+            if hisseler:
+                try:
+                    save_hisse_listesi(hisseler)
+                except OSError as e:
+                    print(f"Hisse listesi önbelleğe yazılamadı: {e}")
+                return hisseler
+            else:
+                print("Asenax API boş liste döndürdü.")
+        else:
+            print(f"Asenax API başarısız yanıt döndürdü: {data['code']}")
+    except Exception as e:
+        print(f"Asenax API'den hisse listesi alınırken hata: {e}")
+    return None
+
+
+def get_bist_hisse_listesi():
+    """Asenax API üzerinden BIST hisse listesini çeker, başarısız olursa önbellekteki veya varsayılan listeyi döndürür."""
+    hisseler = fetch_bist_hisse_listesi()
+    if hisseler:
+        return hisseler
+
+    hisseler, _ = load_cached_hisse_listesi()
+    if hisseler:
+        print("Önbellekteki hisse listesi kullanılıyor.")
+        return hisseler
+
+    print("Varsayılan listeye geçiliyor.")
+    return DEFAULT_HISSELER
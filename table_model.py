@@ -0,0 +1,196 @@
+from datetime import datetime
+from functools import lru_cache
+
+from perf import timed
+
+DB_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+@lru_cache(maxsize=4096)
+def format_timestamp(value, fmt='%d.%m.%Y %H:%M'):
+    """Veritabanı zaman damgasını gösterim biçimine çevirir; sonuç önbelleklenir.
+
+    Çözülemeyen değer olduğu gibi (boşsa '') döndürülür, böylece hata
+    dallarında da tarih sütunu doldurulabilir.
+    """
+    try:
+        return datetime.strptime(value, DB_DATE_FORMAT).strftime(fmt)
+    except (TypeError, ValueError):
+        return value or ''
+
+
+class TableModel:
+    """Treeview satırlarını anahtara göre tutan ve yalnızca farkları yazan model.
+
+    ``update`` her yenilemede (anahtar, değerler) listesini alır. Satırlar
+    Treeview'da anahtardan türeyen sabit iid ile kalır; yeni satırlar eklenir,
+    kalkanlar silinir, değişen satırlarda yalnızca değişen hücreler yazılır ve
+    sıra yalnızca değiştiyse taşınır. Satır sayısı ``virtual_threshold``u
+    aşınca Treeview'a yalnızca görünen satırlar kadar sabit yuva konur;
+    kaydırma çubuğu ve fare tekerleği modelin tamamı üzerinde gezinir.
+    Böylece yenileme maliyeti tablo boyutuyla değil değişen satırlarla ölçeklenir.
+    """
+
+    def __init__(self, tree, scrollbar=None, virtual_threshold=500, overscan=2):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.virtual_threshold = virtual_threshold
+        self.overscan = overscan
+        self.columns = tuple(tree['columns'])
+        self.keys = []
+        self.rows = {}
+        self.virtual = False
+        self.offset = 0
+        self._shown = {}
+        self._order = []
+        self._slot_keys = []
+        self._iid_keys = {}
+        self._selected = set()
+        self._formatted = {}
+
+        if scrollbar is not None:
+            scrollbar.configure(command=self.yview)
+            tree.configure(yscrollcommand=self._on_tree_scroll)
+        tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        tree.bind('<Configure>', lambda event: self.virtual and self._render_window(), add='+')
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            tree.bind(sequence, self._on_wheel, add='+')
+
+    def format(self, key, raw, formatter):
+        """Ham değerler önceki yenilemeyle aynıysa biçimlenmiş satırı önbellekten döndürür"""
+        cached = self._formatted.get(key)
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+        values = tuple(formatter(*raw))
+        self._formatted[key] = (raw, values)
+        return values
+
+    @timed('table.update')
+    def update(self, rows):
+        """Tabloyu (anahtar, değerler) çiftlerine eşitler; sıra gösterim sırasıdır"""
+        self.keys = [key for key, _ in rows]
+        self.rows = {key: tuple(values) for key, values in rows}
+        for key in set(self._formatted) - self.rows.keys():
+            del self._formatted[key]
+
+        virtual = len(self.keys) > self.virtual_threshold
+        if virtual != self.virtual:
+            self.clear_tree()
+            self.virtual = virtual
+        if virtual:
+            self._render_window()
+        else:
+            self._sync_direct()
+
+    def clear_tree(self):
+        if self._shown:
+            self.tree.delete(*self._shown)
+        self._shown.clear()
+        self._order = []
+        self._slot_keys = []
+
+    def key_of(self, iid):
+        """Treeview iid'sinin (sanal modda yuvanın) gösterdiği satır anahtarı"""
+        if self.virtual:
+            slot = int(iid[2:])
+            return self._slot_keys[slot] if slot < len(self._slot_keys) else None
+        return self._iid_keys.get(iid)
+
+    def selected_keys(self):
+        return [key for key in self.keys if key in self._selected]
+
+    def _write(self, iid, values, index):
+        """Satırı yoksa ekler, varsa yalnızca değişen hücreleri yazar"""
+        old = self._shown.get(iid)
+        if old is None:
+            self.tree.insert('', index, iid=iid, values=values)
+        elif old != values:
+            changed = [i for i, (a, b) in enumerate(zip(old, values)) if a != b]
+            if len(old) == len(values) and len(changed) <= len(self.columns) // 2:
+                for i in changed:
+                    self.tree.set(iid, self.columns[i], values[i])
+            else:
+                self.tree.item(iid, values=values)
+        self._shown[iid] = values
+
+    def _sync_direct(self):
+        iids = [str(key) for key in self.keys]
+        self._iid_keys = dict(zip(iids, self.keys))
+        gone = self._shown.keys() - self._iid_keys.keys()
+        if gone:
+            self.tree.delete(*gone)
+            for iid in gone:
+                del self._shown[iid]
+        for index, (iid, key) in enumerate(zip(iids, self.keys)):
+            self._write(iid, self.rows[key], index)
+        if iids != self._order:
+            # Eklemeler yerine konduğundan sıra çoğunlukla tutar; tutmazsa satırlar taşınır
+            current = list(self.tree.get_children())
+            if current != iids:
+                for index, iid in enumerate(iids):
+                    self.tree.move(iid, '', index)
+            self._order = iids
+
+    def _visible_rows(self):
+        """Treeview yüksekliğine sığan satır sayısı (en az ``height`` seçeneği)"""
+        from tkinter import ttk
+
+        style = ttk.Style(self.tree)
+        row_height = int(style.lookup(self.tree.cget('style') or 'Treeview', 'rowheight') or 20)
+        fits = (self.tree.winfo_height() - row_height) // row_height
+        return max(int(fits), int(self.tree.cget('height'))) + self.overscan
+
+    def _render_window(self):
+        """Sanal modda görünen pencereyi sabit yuvalara (``_v0``, ``_v1``...) yazar"""
+        height = self._visible_rows()
+        total = len(self.keys)
+        self.offset = max(0, min(self.offset, total - height))
+        window = self.keys[self.offset:self.offset + height]
+        for slot, key in enumerate(window):
+            self._write(f"_v{slot}", self.rows[key], slot)
+        extra = [f"_v{slot}" for slot in range(len(window), len(self._slot_keys))]
+        if extra:
+            self.tree.delete(*extra)
+            for iid in extra:
+                self._shown.pop(iid, None)
+        self._slot_keys = window
+
+        selection = [f"_v{slot}" for slot, key in enumerate(window) if key in self._selected]
+        if tuple(selection) != tuple(self.tree.selection()):
+            self.tree.selection_set(selection)
+        if self.scrollbar is not None and total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(window)) / total)
+
+    def yview(self, *args):
+        """Kaydırma çubuğu komutu; sanal modda pencereyi kaydırır"""
+        if not self.virtual:
+            return self.tree.yview(*args)
+        total, page = len(self.keys), max(len(self._slot_keys) - self.overscan, 1)
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            self.offset += int(args[1]) * (page if args[2] == 'pages' else 1)
+        self._render_window()
+
+    def _on_tree_scroll(self, first, last):
+        if not self.virtual:
+            self.scrollbar.set(first, last)
+
+    def _on_wheel(self, event):
+        if not self.virtual:
+            return None
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            step = -3
+        else:
+            step = 3
+        self.yview('scroll', step, 'units')
+        return 'break'
+
+    def _on_select(self, event):
+        if not self.virtual:
+            self._selected = {self._iid_keys.get(iid) for iid in self.tree.selection()}
+            return
+        visible = set(self._slot_keys)
+        chosen = {self.key_of(iid) for iid in self.tree.selection()}
+        # Görünmeyen seçili satırlar korunur, görünenlerde Treeview seçimi esas alınır
+        self._selected = {key for key in self._selected if key not in visible} | chosen
@@ -0,0 +1,59 @@
+import pytest
+
+from market_data import MarketDataClient, MarketDataError
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = type('Response', (), {'status_code': status_code})()
+
+
+def istemci():
+    return MarketDataClient(rate=1000, burst=1000, retries=3, backoff=0, failure_threshold=2)
+
+
+def test_bad_ticker_does_not_trip_breaker():
+    client = istemci()
+    calls = []
+
+    def delisted():
+        calls.append(1)
+        raise HTTPError(404)
+
+    for symbol in ('ESKI1', 'ESKI2', 'ESKI3'):
+        with pytest.raises(MarketDataError):
+            client.request('yahoo', ('info', symbol), delisted)
+    # Sembole özgü hata tekrar edilmez ve kaynağı kapatmaz
+    assert len(calls) == 3
+    assert client.breakers['yahoo'].state == 'closed'
+    assert client.request('yahoo', ('info', 'THYAO'), lambda: {'symbol': 'THYAO'}) == {'symbol': 'THYAO'}
+
+
+def test_failure_counted_once_per_request():
+    client = istemci()
+    calls = []
+
+    def down():
+        calls.append(1)
+        raise ConnectionError("bağlantı yok")
+
+    with pytest.raises(MarketDataError):
+        client.request('yahoo', ('info', 'THYAO'), down)
+    assert len(calls) == 4
+    assert client.breakers['yahoo'].failures == 1
+    assert client.breakers['yahoo'].state == 'closed'
+
+    with pytest.raises(MarketDataError):
+        client.request('yahoo', ('info', 'GARAN'), down)
+    assert client.breakers['yahoo'].state == 'open'
+
+
+def test_stale_result_served_after_failure():
+    client = istemci()
+    assert client.request('yahoo', ('info', 'THYAO'), lambda: {'price': 1}) == {'price': 1}
+
+    def down():
+        raise ConnectionError("bağlantı yok")
+
+    assert client.request('yahoo', ('info', 'THYAO'), down) == {'price': 1}
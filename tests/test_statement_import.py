@@ -0,0 +1,82 @@
+import pytest
+
+from portfolio import Portfolio
+from statement_import import detect_decimal, import_statement, parse_number
+
+HEADER = 'İşlem Tarihi;Sembol;İşlem Tipi;Gerçekleşen Adet;Gerçekleşen Fiyat\n'
+
+
+def yaz(tmp_path, text, name='dokum.csv'):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def islemler(portfolio):
+    return portfolio.conn.execute(
+        'SELECT symbol, operation, price, quantity, date FROM transactions ORDER BY id').fetchall()
+
+
+@pytest.fixture
+def portfolio():
+    p = Portfolio(':memory:')
+    yield p
+    p.close()
+
+
+def test_three_decimal_price_in_turkish_statement(tmp_path, portfolio):
+    path = yaz(tmp_path, HEADER +
+               '02.01.2026 10:15:32;THYAO;Alış;1.000;312,500\n'
+               '02.01.2026 11:02:10;ASELS;Satış;250;3,125\n')
+    sonuc = import_statement(path, portfolio)
+    assert sonuc['invalid'] == 0, sonuc['errors']
+    assert islemler(portfolio) == [
+        ('THYAO', 'BUY', 312.5, 1000, '2026-01-02 10:15:32'),
+        ('ASELS', 'SELL', 3.125, 250, '2026-01-02 11:02:10'),
+    ]
+
+
+def test_decimal_separator_comes_from_other_rows(tmp_path, portfolio):
+    path = yaz(tmp_path, 'Date,Symbol,Side,Quantity,Price\n'
+                         '2026-01-02 10:00:00,GARAN,buy,100,"1,250"\n'
+                         '2026-01-02 10:05:00,GARAN,buy,"2,000",118.75\n')
+    sonuc = import_statement(path, portfolio)
+    assert sonuc['invalid'] == 0, sonuc['errors']
+    assert [(price, quantity) for _, _, price, quantity, _ in islemler(portfolio)] == [(1250.0, 100), (118.75, 2000)]
+
+
+def test_parse_number_with_known_separator():
+    assert parse_number('12,500', decimal=',') == 12.5
+    assert parse_number('1.250', decimal=',') == 1250
+    assert parse_number('1.234,567', decimal=',') == 1234.567
+    assert parse_number('1,234.5', decimal='.') == 1234.5
+    assert parse_number('1.000', integer=True) == 1000
+    with pytest.raises(ValueError):
+        parse_number('1.5', integer=True)
+    with pytest.raises(ValueError):
+        parse_number('12.34.5', decimal=',')
+
+
+def test_detect_decimal_defaults_to_comma():
+    mapping = {'price': 0, 'quantity': 1}
+    assert detect_decimal([('12,500', '100')], mapping) == ','
+    assert detect_decimal([('12,500', '100'), ('7.25', '10')], mapping) == '.'
+
+
+def test_repeated_fills_and_reimport(tmp_path, portfolio):
+    satir = '02.01.2026 10:15:32;THYAO;Alış;100;312,50\n'
+    path = yaz(tmp_path, HEADER + satir * 2)
+    assert import_statement(path, portfolio)['inserted'] == 2
+    assert import_statement(path, portfolio)['inserted'] == 0
+
+    path = yaz(tmp_path, HEADER + satir * 3, 'dokum2.csv')
+    assert import_statement(path, portfolio, chunk_size=1)['inserted'] == 1
+    assert len(islemler(portfolio)) == 3
+
+
+def test_chunks_do_not_split_same_time_fills(tmp_path, portfolio):
+    satirlar = ['02.01.2026 10:15:32;THYAO;Alış;100;312,50\n'] * 3 + ['02.01.2026 10:16:00;GARAN;Alış;10;118,75\n']
+    path = yaz(tmp_path, HEADER + ''.join(satirlar))
+    portfolio.add_transactions([('THYAO', 'BUY', 312.5, 100, '2026-01-02 10:15:32')])
+    assert import_statement(path, portfolio, chunk_size=1)['inserted'] == 3
+    assert len(islemler(portfolio)) == 4